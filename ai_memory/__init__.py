@@ -0,0 +1,101 @@
+"""
+AI Agent Memory Systems
+=======================
+
+Memory systems for AI agents, from simple in-memory stores to
+production-ready SQLite-backed ones.
+
+Every name below is loaded on first use: ``import ai_memory`` imports no
+submodule, ``from ai_memory import SimpleMemoryStore`` imports only
+``ai_memory.simple``, and numpy is not imported until a store first uses it.
+
+Author: AI Memory Research
+Date: 2026-02-23
+"""
+
+import importlib
+
+# Not typing.TYPE_CHECKING: importing typing would cost more than the package
+TYPE_CHECKING = False
+
+# Public name -> submodule defining it
+_EXPORTS = {
+    "MemoryRecord": "records",
+    "MemoryView": "records",
+    "ReadWriteLock": "records",
+    "AccessCounter": "records",
+    "MemoryMetrics": "metrics",
+    "SimpleMemoryStore": "simple",
+    "ConversationMemory": "conversation",
+    "PartitionedVectorIndex": "vector",
+    "VectorMemoryStore": "vector",
+    "Embedder": "embedders",
+    "HashingEmbedder": "embedders",
+    "OpenAIEmbedder": "embedders",
+    "EmbeddingQueue": "embedders",
+    "SharedConnection": "sqlite_store",
+    "ContentCodec": "sqlite_store",
+    "SQLiteStore": "sqlite_store",
+    "ChangeFeed": "sqlite_store",
+    "PersistentMemoryStore": "persistent",
+    "ExpirySweeper": "persistent",
+    "MemoryTier": "tiers",
+    "MultiTierMemorySystem": "tiers",
+    "ScoredMemoryStore": "scored",
+    "EpisodicMemory": "episodic",
+    "SemanticMemory": "semantic",
+    "ProceduralMemory": "procedural",
+    "UnifiedMemorySystem": "unified",
+    "MemoryServiceManager": "service",
+    "serve_memory": "service",
+    "start_memory_server": "service",
+    "MemoryClient": "service",
+    "ShardedMemoryStore": "sharded",
+    "reshard_memory_store": "sharded",
+    "SnapshotTable": "snapshots",
+    "SNAPSHOT_TABLES": "snapshots",
+    "SNAPSHOT_VERSION": "snapshots",
+    "export_snapshot": "snapshots",
+    "import_snapshot": "snapshots",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *__all__})
+
+
+if TYPE_CHECKING:
+    from .records import MemoryRecord, MemoryView, ReadWriteLock, AccessCounter
+    from .metrics import MemoryMetrics
+    from .simple import SimpleMemoryStore
+    from .conversation import ConversationMemory
+    from .vector import PartitionedVectorIndex, VectorMemoryStore
+    from .embedders import Embedder, HashingEmbedder, OpenAIEmbedder, EmbeddingQueue
+    from .sqlite_store import SharedConnection, ContentCodec, SQLiteStore, ChangeFeed
+    from .persistent import PersistentMemoryStore, ExpirySweeper
+    from .tiers import MemoryTier, MultiTierMemorySystem
+    from .scored import ScoredMemoryStore
+    from .episodic import EpisodicMemory
+    from .semantic import SemanticMemory
+    from .procedural import ProceduralMemory
+    from .unified import UnifiedMemorySystem
+    from .service import MemoryServiceManager, serve_memory, start_memory_server, MemoryClient
+    from .sharded import ShardedMemoryStore, reshard_memory_store
+    from .snapshots import (
+        SnapshotTable,
+        SNAPSHOT_TABLES,
+        SNAPSHOT_VERSION,
+        export_snapshot,
+        import_snapshot,
+    )
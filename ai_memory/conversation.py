@@ -0,0 +1,84 @@
+"""Conversation (chat history) memory."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+from .records import ReadWriteLock, _NoLock
+
+
+# =============================================================================
+# 2. CONVERSATION MEMORY (For Chatbots)
+# =============================================================================
+
+class ConversationMemory:
+    """
+    Memory specifically designed for conversations.
+    Maintains dialogue history with context management.
+
+    Writers build a new message list and swap it in (copy-on-write), so
+    readers never lock. ``thread_safe=True`` serializes the writers.
+    """
+
+    def __init__(self, max_messages: int = 100, max_tokens: int = 4000, thread_safe: bool = False):
+        self.max_messages = max_messages
+        self.max_tokens = max_tokens
+        self.messages: List[Dict[str, str]] = []
+        self._lock = ReadWriteLock() if thread_safe else _NoLock()
+
+    def add_user_message(self, message: str):
+        """Add a user message."""
+        self._append({"role": "user", "content": message})
+
+    def add_assistant_message(self, message: str):
+        """Add an assistant message."""
+        self._append({"role": "assistant", "content": message})
+
+    def _append(self, message: Dict[str, str]):
+        """Publish a new, trimmed message list including `message`."""
+        with self._lock.write():
+            self.messages = self._trimmed(self.messages + [message])
+
+    def _trim_if_needed(self):
+        """Trim messages if we exceed limits."""
+        with self._lock.write():
+            self.messages = self._trimmed(self.messages)
+
+    def _trimmed(self, messages: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """Return `messages` without the oldest entries that exceed the limits."""
+        # Check message count
+        start = max(0, len(messages) - self.max_messages)
+
+        # Check token count (rough estimation)
+        total_tokens = sum(self._estimate_tokens(m["content"]) for m in messages[start:])
+        while total_tokens > self.max_tokens and len(messages) - start > 2:
+            total_tokens -= self._estimate_tokens(messages[start]["content"])
+            start += 1
+
+        return messages[start:]
+
+    def _estimate_tokens(self, text: str) -> int:
+        """Rough token estimation: ~4 characters per token."""
+        return len(text) // 4
+
+    def get_context(self, include_system: bool = False) -> List[Dict[str, str]]:
+        """Get conversation context for LLM."""
+        return self.messages.copy()
+
+    def get_summary(self) -> str:
+        """Get a summary of the conversation."""
+        if not self.messages:
+            return "No conversation history."
+
+        user_msgs = [m for m in self.messages if m["role"] == "user"]
+        assistant_msgs = [m for m in self.messages if m["role"] == "assistant"]
+
+        return f"Conversation with {len(user_msgs)} user messages and {len(assistant_msgs)} assistant responses."
+
+    def export_to_dict(self) -> Dict[str, Any]:
+        """Export conversation to dictionary."""
+        return {
+            "messages": self.messages,
+            "message_count": len(self.messages),
+            "estimated_tokens": sum(self._estimate_tokens(m["content"]) for m in self.messages)
+        }
@@ -0,0 +1,178 @@
+"""Embedder interface, built-in embedders and the background embedding queue."""
+
+from __future__ import annotations
+
+import hashlib
+import queue
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, List, Optional, Tuple
+
+from .lazy import numpy as np
+
+
+# =============================================================================
+# EMBEDDERS (Pluggable, Micro-Batched Backfill)
+# =============================================================================
+
+class Embedder(ABC):
+    """Turns texts into fixed-size vectors, many per call."""
+
+    dim: int
+
+    @abstractmethod
+    def embed_batch(self, texts: List[str]) -> np.ndarray:
+        """One float32 row of length ``dim`` per text."""
+
+    def embed(self, text: str) -> np.ndarray:
+        return self.embed_batch([text])[0]
+
+
+class HashingEmbedder(Embedder):
+    """
+    Deterministic offline embedder for tests and demos: each word (and
+    word bigram) adds a signed weight to a bucket chosen by its hash, and
+    the sum is L2-normalized. Texts sharing words get similar vectors; no
+    model or network is involved.
+    """
+
+    def __init__(self, dim: int = 256):
+        self.dim = dim
+
+    def embed_batch(self, texts: List[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype='float32')
+        for row, text in enumerate(texts):
+            tokens = re.findall(r"\w+", text.lower())
+            for feature in tokens + [a + " " + b for a, b in zip(tokens, tokens[1:])]:
+                digest = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "big")
+                vectors[row, digest % self.dim] += 1.0 if digest >> 63 else -1.0
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-8)
+
+
+class OpenAIEmbedder(Embedder):
+    """Embeddings from the OpenAI API, one request per batch."""
+
+    def __init__(self, model: str = "text-embedding-3-small", dim: int = 1536, client: Any = None):
+        if client is None:
+            import openai
+            client = openai.OpenAI()
+        self.client = client
+        self.model = model
+        self.dim = dim
+
+    def embed_batch(self, texts: List[str]) -> np.ndarray:
+        response = self.client.embeddings.create(model=self.model, input=texts)
+        return np.array([item.embedding for item in response.data], dtype='float32')
+
+
+class EmbeddingQueue:
+    """
+    Embeds queued texts in the background, in micro-batches.
+
+    ``submit(key, text)`` returns at once. A worker thread collects items
+    until it has ``batch_size`` of them or ``max_latency`` seconds have
+    passed since the first, embeds them with one ``embed_batch`` call and
+    hands ``[(key, vector), ...]`` to ``apply``. Keys queued more than once
+    in a batch are embedded once. A failed batch is retried up to
+    ``max_retries`` times with exponential backoff from ``retry_delay``;
+    each failure is counted under ``errors`` and kept in ``last_error``.
+    A batch that still fails is dropped and its keys are listed in
+    ``dropped`` so the caller can queue them again.
+    """
+
+    def __init__(
+        self,
+        embedder: Embedder,
+        apply,
+        batch_size: int = 64,
+        max_latency: float = 0.05,
+        max_retries: int = 3,
+        retry_delay: float = 0.5
+    ):
+        self.embedder = embedder
+        self.apply = apply
+        self.batch_size = batch_size
+        self.max_latency = max_latency
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self._queue: "queue.Queue[Optional[Tuple[Any, str]]]" = queue.Queue()
+        self._pending = 0
+        self._idle = threading.Condition()
+        self._worker: Optional[threading.Thread] = None
+        self.stats = {"queued": 0, "embedded": 0, "batches": 0, "errors": 0, "dropped": 0}
+        self.last_error: Optional[BaseException] = None
+        self.dropped: List[Any] = []
+
+    def submit(self, key: Any, text: str):
+        with self._idle:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="embedding-backfill", daemon=True)
+                self._worker.start()
+            self._pending += 1
+            self.stats["queued"] += 1
+        self._queue.put((key, text))
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            deadline = time.monotonic() + self.max_latency
+            stopping = False
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            self._embed(batch)
+            if stopping:
+                return
+
+    def _embed(self, batch: List[Tuple[Any, str]]):
+        texts = dict(batch)
+        embedded, failed = 0, 0
+        for attempt in range(max(1, self.max_retries)):
+            if attempt:
+                time.sleep(self.retry_delay * 2 ** (attempt - 1))
+            try:
+                vectors = self.embedder.embed_batch(list(texts.values()))
+                self.apply(list(zip(texts, vectors)))
+                embedded = len(texts)
+                break
+            except Exception as e:
+                self.last_error = e
+                failed += 1
+
+        with self._idle:
+            self._pending -= len(batch)
+            self.stats["embedded"] += embedded
+            self.stats["batches"] += 1
+            self.stats["errors"] += failed
+            if not embedded:
+                self.dropped.extend(texts)
+                self.stats["dropped"] += len(texts)
+            self._idle.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until everything submitted has been applied; False on timeout."""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout)
+
+    def close(self, timeout: Optional[float] = None):
+        """Embed what is queued, then stop the worker."""
+        if self._worker is not None:
+            self._queue.put(None)
+            self._worker.join(timeout)
+            self._worker = None
@@ -0,0 +1,326 @@
+"""Episodic (event-based) memory."""
+
+from __future__ import annotations
+
+import json
+import pickle
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+from .embedders import Embedder, EmbeddingQueue
+from .lazy import numpy as np
+from .sqlite_store import SQLiteStore, SharedConnection
+
+
+# =============================================================================
+# 7. EPISODIC MEMORY (Event-based)
+# =============================================================================
+
+class EpisodicMemory(SQLiteStore):
+    """
+    Memory system for storing episodes (events, conversations, experiences).
+    Each episode has a timestamp, participants, and outcome. With
+    ``compression`` long episode content is stored compressed. With an
+    ``embedder``, episodes recorded without an embedding get one in the
+    background (see EmbeddingQueue).
+    """
+
+    CONTENT_TABLE = "episodes"
+    CHANGE_TABLE = "episodes"
+    STATS_STORE = "episodes"
+    STATS_TRIGGERS = [
+        f"""
+            CREATE TRIGGER IF NOT EXISTS episodes_stats_insert
+            AFTER INSERT ON episodes BEGIN
+                {SQLiteStore._stats_delta("episodes", "'count'", "1")}
+                {SQLiteStore._stats_delta("episodes", "'type:' || IFNULL(new.event_type, '')", "1")}
+            END
+        """,
+        f"""
+            CREATE TRIGGER IF NOT EXISTS episodes_stats_delete
+            AFTER DELETE ON episodes BEGIN
+                {SQLiteStore._stats_delta("episodes", "'count'", "-1")}
+                {SQLiteStore._stats_delta("episodes", "'type:' || IFNULL(old.event_type, '')", "-1")}
+            END
+        """,
+        f"""
+            CREATE TRIGGER IF NOT EXISTS episodes_stats_update
+            AFTER UPDATE OF event_type ON episodes BEGIN
+                {SQLiteStore._stats_delta("episodes", "'type:' || IFNULL(old.event_type, '')", "-1")}
+                {SQLiteStore._stats_delta("episodes", "'type:' || IFNULL(new.event_type, '')", "1")}
+            END
+        """
+    ]
+    STATS_RECOUNT_SQL = """
+        SELECT 'count', COUNT(*) FROM episodes
+        UNION ALL SELECT 'type:' || IFNULL(event_type, ''), COUNT(*)
+                  FROM episodes GROUP BY event_type
+    """
+
+    def __init__(
+        self,
+        db_path: str = "episodic_memory.db",
+        connection: Optional[SharedConnection] = None,
+        compression: Optional[str] = None,
+        embedder: Optional[Embedder] = None,
+        embed_batch_size: int = 64,
+        embed_max_latency: float = 0.05
+    ):
+        super().__init__(db_path, connection, compression)
+        self.embedding_queue = (
+            EmbeddingQueue(embedder, self._apply_embeddings, embed_batch_size, embed_max_latency)
+            if embedder is not None else None
+        )
+        self._init_database()
+
+    def _init_database(self):
+        """Initialize database schema."""
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS episodes (
+                    id TEXT PRIMARY KEY,
+                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    event_type TEXT,
+                    participants TEXT,
+                    content TEXT,
+                    outcome TEXT,
+                    metadata TEXT,
+                    embedding BLOB,
+                    importance REAL DEFAULT 0.5,
+                    compressed INTEGER NOT NULL DEFAULT 0,
+                    dict_id INTEGER
+                )
+            """)
+
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_episode_timestamp
+                ON episodes(timestamp DESC)
+            """)
+
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_event_type
+                ON episodes(event_type)
+            """)
+
+            self._init_stats(cursor)
+            self._init_change_log(cursor)
+            self._init_compression(cursor)
+
+            conn.commit()
+        finally:
+            conn.close()
+
+    def record_episode(
+        self,
+        event_type: str,
+        participants: List[str],
+        content: str,
+        outcome: str = None,
+        metadata: Dict[str, Any] = None,
+        embedding: np.ndarray = None,
+        importance: float = 0.5
+    ) -> str:
+        """Record a new episode."""
+        episode_id = str(uuid.uuid4())
+
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+
+            cursor.execute("""
+                INSERT INTO episodes
+                (id, event_type, participants, content, compressed, dict_id, outcome, metadata, embedding, importance)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                episode_id,
+                event_type,
+                json.dumps(participants),
+                *self._compress_content(content),
+                outcome,
+                json.dumps(metadata or {}),
+                pickle.dumps(embedding) if embedding is not None else None,
+                importance
+            ))
+
+            conn.commit()
+        finally:
+            conn.close()
+
+        if embedding is None and self.embedding_queue is not None:
+            self.embedding_queue.submit(episode_id, content)
+        return episode_id
+
+    def _apply_embeddings(self, embedded: List[Tuple[str, np.ndarray]]):
+        """Store background-computed embeddings on episodes that still lack one."""
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+
+            cursor.executemany("""
+                UPDATE episodes SET embedding = ? WHERE id = ? AND embedding IS NULL
+            """, [(pickle.dumps(vector), episode_id) for episode_id, vector in embedded])
+
+            conn.commit()
+        finally:
+            conn.close()
+
+    def backfill_embeddings(self) -> int:
+        """Queue every episode without an embedding; returns how many."""
+        if self.embedding_queue is None:
+            raise ValueError("backfill_embeddings needs a store created with an embedder")
+
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT id, {self._text_sql()} FROM episodes WHERE embedding IS NULL")
+            rows = cursor.fetchall()
+        finally:
+            conn.close()
+
+        for episode_id, content in rows:
+            self.embedding_queue.submit(episode_id, content)
+        return len(rows)
+
+    def flush_embeddings(self, timeout: Optional[float] = None) -> bool:
+        """Wait for queued embeddings to be stored; False on timeout."""
+        return self.embedding_queue.flush(timeout) if self.embedding_queue is not None else True
+
+    def get_episodes_by_type(
+        self,
+        event_type: str,
+        limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """Get episodes by event type."""
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+
+            cursor.execute(f"""
+                SELECT id, timestamp, event_type, participants, {self._text_sql()},
+                       outcome, metadata, importance
+                FROM episodes
+                WHERE event_type = ?
+                ORDER BY timestamp DESC
+                LIMIT ?
+            """, (event_type, limit))
+
+            rows = cursor.fetchall()
+        finally:
+            conn.close()
+
+        return [
+            {
+                "id": row[0],
+                "timestamp": row[1],
+                "event_type": row[2],
+                "participants": json.loads(row[3]),
+                "content": row[4],
+                "outcome": row[5],
+                "metadata": json.loads(row[6]),
+                "importance": row[7]
+            }
+            for row in rows
+        ]
+
+    def search_episodes(
+        self,
+        query: str,
+        query_embedding: Optional[np.ndarray] = None,
+        limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """Search episodes by similarity if an embedding is given, else by keyword."""
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+
+            if query_embedding is None:
+                cursor.execute(f"""
+                    SELECT id, timestamp, event_type, participants, {self._text_sql()},
+                           outcome, importance
+                    FROM episodes
+                    WHERE {self._text_sql()} LIKE ?
+                    ORDER BY importance DESC, timestamp DESC
+                    LIMIT ?
+                """, (f"%{query}%", limit))
+            else:
+                cursor.execute(f"""
+                    SELECT id, timestamp, event_type, participants, {self._text_sql()},
+                           outcome, importance, embedding
+                    FROM episodes
+                    WHERE embedding IS NOT NULL
+                """)
+
+            rows = cursor.fetchall()
+        finally:
+            conn.close()
+
+        results = []
+        for row in rows:
+            episode = {
+                "id": row[0],
+                "timestamp": row[1],
+                "event_type": row[2],
+                "participants": json.loads(row[3]),
+                "content": row[4],
+                "outcome": row[5],
+                "importance": row[6]
+            }
+            if query_embedding is not None:
+                stored_embedding = pickle.loads(row[7])
+                episode["similarity"] = float(
+                    np.dot(query_embedding, stored_embedding)
+                    / (np.linalg.norm(query_embedding) * np.linalg.norm(stored_embedding) + 1e-8)
+                )
+            results.append(episode)
+
+        if query_embedding is not None:
+            results.sort(key=lambda x: x["similarity"], reverse=True)
+        return results[:limit]
+
+    def get_stats(self, exact: bool = False) -> Dict[str, Any]:
+        """Get episode counts, in total and per event type."""
+        if exact:
+            self.verify_stats()
+
+        stats = self._read_stats()
+        return {
+            "total_episodes": int(stats.get("count", 0)),
+            "by_type": self._group_stats(stats, "type:")
+        }
+
+    def get_episodes_with_participant(
+        self,
+        participant: str,
+        limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """Get episodes involving a specific participant."""
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+
+            cursor.execute(f"""
+                SELECT id, timestamp, event_type, participants, {self._text_sql()}, outcome
+                FROM episodes
+                WHERE participants LIKE ?
+                ORDER BY timestamp DESC
+                LIMIT ?
+            """, (f'%"{participant}"%', limit))
+
+            rows = cursor.fetchall()
+        finally:
+            conn.close()
+
+        return [
+            {
+                "id": row[0],
+                "timestamp": row[1],
+                "event_type": row[2],
+                "participants": json.loads(row[3]),
+                "content": row[4],
+                "outcome": row[5]
+            }
+            for row in rows
+        ]
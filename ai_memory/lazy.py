@@ -0,0 +1,28 @@
+"""Deferred imports, so importing a module here does not import numpy or openai up front."""
+
+import importlib
+import types
+
+
+class LazyModule(types.ModuleType):
+    """
+    Stand-in for a module that imports it on first attribute access.
+
+    The real module's namespace is then copied into this one, so later
+    attribute lookups cost the same as on the module itself.
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name)
+
+    def __getattr__(self, attr: str):
+        module = importlib.import_module(self.__name__)
+        self.__dict__.update(module.__dict__)
+        return getattr(module, attr)
+
+    def __dir__(self):
+        return dir(importlib.import_module(self.__name__))
+
+
+numpy = LazyModule("numpy")
+openai = LazyModule("openai")
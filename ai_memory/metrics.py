@@ -0,0 +1,365 @@
+"""Opt-in latency, row count and SQL statement metrics for the memory stores."""
+
+from __future__ import annotations
+
+import bisect
+import inspect
+import json
+import sqlite3
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+from .sqlite_store import SQLiteStore
+
+
+# =============================================================================
+# METRICS (Opt-In Latency, Row Count and SQL Instrumentation)
+# =============================================================================
+
+class _OperationStats:
+    """Latency histogram and row counters for one (store, operation)."""
+
+    __slots__ = ("buckets", "count", "errors", "total", "rows_scanned", "rows_returned")
+
+    def __init__(self, num_buckets: int):
+        self.buckets = [0] * (num_buckets + 1)  # last one is +Inf
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.rows_scanned = 0
+        self.rows_returned = 0
+
+
+class _TimedCursor:
+    """Cursor proxy reporting statement timings and fetched rows to MemoryMetrics."""
+
+    def __init__(self, cursor: sqlite3.Cursor, metrics: "MemoryMetrics"):
+        self._cursor = cursor
+        self._metrics = metrics
+        self._sql = ""
+
+    def execute(self, sql: str, params=()) -> "_TimedCursor":
+        self._sql = sql
+        start = time.perf_counter()
+        self._cursor.execute(sql, params)
+        self._metrics.observe_sql(sql, time.perf_counter() - start)
+        return self
+
+    def executemany(self, sql: str, seq_of_params) -> "_TimedCursor":
+        self._sql = sql
+        start = time.perf_counter()
+        self._cursor.executemany(sql, seq_of_params)
+        self._metrics.observe_sql(sql, time.perf_counter() - start)
+        return self
+
+    # SQLite steps lazily, so fetch time is charged to the last statement
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = self._cursor.fetchone()
+        self._metrics.observe_sql(self._sql, time.perf_counter() - start, row is not None, calls=0)
+        return row
+
+    def fetchmany(self, size: int = 1):
+        start = time.perf_counter()
+        rows = self._cursor.fetchmany(size)
+        self._metrics.observe_sql(self._sql, time.perf_counter() - start, len(rows), calls=0)
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = self._cursor.fetchall()
+        self._metrics.observe_sql(self._sql, time.perf_counter() - start, len(rows), calls=0)
+        return rows
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+    def __getattr__(self, name: str):
+        return getattr(self._cursor, name)
+
+
+class _TimedConnection:
+    """Connection proxy whose cursors are _TimedCursors."""
+
+    def __init__(self, conn, metrics: "MemoryMetrics"):
+        self._conn = conn
+        self._metrics = metrics
+
+    def cursor(self) -> _TimedCursor:
+        return _TimedCursor(self._conn.cursor(), self._metrics)
+
+    def execute(self, sql: str, params=()) -> _TimedCursor:
+        return self.cursor().execute(sql, params)
+
+    def __getattr__(self, name: str):
+        return getattr(self._conn, name)
+
+
+class MemoryMetrics:
+    """
+    Opt-in instrumentation for the memory stores.
+
+    ``instrument(store)`` replaces the store's public methods, on that
+    instance only, with wrappers that record a latency histogram, error
+    count and rows scanned (fetched from SQLite on the calling thread)
+    versus returned (length of a list result) per operation.
+    SQLite-backed stores also get their connections wrapped so every
+    statement's execute and fetch time is aggregated per statement text.
+    Operations and statements slower than ``slow_threshold`` seconds go
+    to a bounded slow log. Stores with a row cache report its hit rate.
+
+    Stores that were never instrumented run their original methods, so
+    metrics cost nothing when off. Export with ``to_json`` or
+    ``to_prometheus``.
+    """
+
+    # Histogram upper bounds in seconds
+    DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+    # Not worth timing (or, for context managers, not meaningful to)
+    SKIP_METHODS = {"close", "transaction", "cache_info", "invalidate_cache"}
+
+    def __init__(
+        self,
+        slow_threshold: float = 0.1,
+        slow_log_size: int = 256,
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS
+    ):
+        self.slow_threshold = slow_threshold
+        self.buckets = tuple(sorted(buckets))
+        self._operations: Dict[Tuple[str, str], _OperationStats] = {}
+        # statement -> [calls, seconds, max seconds, rows fetched]
+        self._statements: Dict[str, List[float]] = {}
+        self._slow_log: deque = deque(maxlen=slow_log_size)
+        self._stores: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        # Per thread: rows fetched by each operation in progress, innermost last
+        self._active = threading.local()
+
+    def instrument(self, store: Any, name: Optional[str] = None) -> Any:
+        """Record metrics for every public method of ``store`` (returned for chaining)."""
+        name = name or type(store).__name__
+        self._stores[name] = store
+
+        for attr in dir(type(store)):
+            if attr.startswith("_") or attr in self.SKIP_METHODS:
+                continue
+            # Plain methods only: no properties, static/class methods or context managers
+            method = inspect.getattr_static(type(store), attr)
+            if not inspect.isfunction(method) or hasattr(method, "__wrapped__"):
+                continue
+            setattr(store, attr, self._timed(name, attr, getattr(store, attr)))
+
+        if isinstance(store, SQLiteStore):
+            connect = store._connect
+            store._connect = lambda: _TimedConnection(connect(), self)
+        return store
+
+    def _timed(self, store_name: str, operation: str, method):
+        key = (store_name, operation)
+
+        def timed(*args, **kwargs):
+            frames = getattr(self._active, "frames", None)
+            if frames is None:
+                frames = self._active.frames = []
+            frames.append(0)
+            start = time.perf_counter()
+            failed = True
+            try:
+                result = method(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                elapsed = time.perf_counter() - start
+                scanned = frames.pop()
+                if frames:
+                    frames[-1] += scanned
+                returned = len(result) if not failed and isinstance(result, list) else 0
+                self.observe(key, elapsed, scanned, returned, failed)
+
+        timed.__name__ = operation
+        timed.__doc__ = method.__doc__
+        return timed
+
+    def observe(
+        self,
+        key: Tuple[str, str],
+        seconds: float,
+        rows_scanned: int = 0,
+        rows_returned: int = 0,
+        failed: bool = False
+    ):
+        """Record one call of operation ``key`` = (store, operation)."""
+        with self._lock:
+            stats = self._operations.get(key)
+            if stats is None:
+                stats = self._operations[key] = _OperationStats(len(self.buckets))
+            stats.buckets[bisect.bisect_left(self.buckets, seconds)] += 1
+            stats.count += 1
+            stats.total += seconds
+            stats.errors += failed
+            stats.rows_scanned += rows_scanned
+            stats.rows_returned += rows_returned
+            if seconds >= self.slow_threshold:
+                self._slow_log.append({
+                    "kind": "operation",
+                    "store": key[0],
+                    "operation": key[1],
+                    "seconds": seconds,
+                    "at": time.time()
+                })
+
+    def observe_sql(self, sql: str, seconds: float, rows: int = 0, calls: int = 1):
+        """Record a statement execution (``calls=1``) or a fetch of its rows (``calls=0``)."""
+        if rows:
+            frames = getattr(self._active, "frames", None)
+            if frames:
+                frames[-1] += rows
+
+        statement = " ".join(sql.split())
+        with self._lock:
+            totals = self._statements.get(statement)
+            if totals is None:
+                totals = self._statements[statement] = [0, 0.0, 0.0, 0]
+            totals[0] += calls
+            totals[1] += seconds
+            totals[2] = max(totals[2], seconds)
+            totals[3] += rows
+            if seconds >= self.slow_threshold:
+                self._slow_log.append({
+                    "kind": "sql",
+                    "statement": statement,
+                    "seconds": seconds,
+                    "at": time.time()
+                })
+
+    def reset(self):
+        """Forget everything recorded so far (instrumentation stays on)."""
+        with self._lock:
+            self._operations.clear()
+            self._statements.clear()
+            self._slow_log.clear()
+
+    def _percentile(self, stats: _OperationStats, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the ``q`` quantile (None if past the last bound)."""
+        rank = q * stats.count
+        seen = 0
+        for bound, count in zip(self.buckets, stats.buckets):
+            seen += count
+            if seen >= rank:
+                return bound
+        return None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Everything recorded, as plain data (the ``to_json`` payload)."""
+        with self._lock:
+            operations = [
+                {
+                    "store": store,
+                    "operation": operation,
+                    "count": stats.count,
+                    "errors": stats.errors,
+                    "total_seconds": stats.total,
+                    "mean_seconds": stats.total / stats.count,
+                    "p50_seconds": self._percentile(stats, 0.5),
+                    "p99_seconds": self._percentile(stats, 0.99),
+                    "buckets": dict(zip([*map(str, self.buckets), "+Inf"], stats.buckets)),
+                    "rows_scanned": stats.rows_scanned,
+                    "rows_returned": stats.rows_returned
+                }
+                for (store, operation), stats in sorted(self._operations.items())
+            ]
+            statements = sorted(
+                (
+                    {
+                        "statement": statement,
+                        "calls": int(calls),
+                        "total_seconds": seconds,
+                        "max_seconds": longest,
+                        "rows": int(rows)
+                    }
+                    for statement, (calls, seconds, longest, rows) in self._statements.items()
+                ),
+                key=lambda s: s["total_seconds"],
+                reverse=True
+            )
+            slow_log = list(self._slow_log)
+
+        caches = {}
+        for name, store in self._stores.items():
+            if getattr(store, "cache_size", 0):
+                info = store.cache_info()
+                lookups = info["hits"] + info["misses"]
+                caches[name] = dict(info, hit_rate=info["hits"] / lookups if lookups else 0.0)
+
+        return {
+            "operations": operations,
+            "sql": statements,
+            "caches": caches,
+            "slow_log": slow_log,
+            "slow_threshold": self.slow_threshold
+        }
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        return json.dumps(self.snapshot(), indent=indent)
+
+    def to_prometheus(self, prefix: str = "memory") -> str:
+        """The metrics in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+
+        def labels(**values) -> str:
+            escaped = (
+                key + '="' + str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ") + '"'
+                for key, value in values.items()
+            )
+            return "{" + ",".join(escaped) + "}"
+
+        lines = [
+            f"# HELP {prefix}_operation_seconds Latency of memory store operations.",
+            f"# TYPE {prefix}_operation_seconds histogram"
+        ]
+        for op in snapshot["operations"]:
+            cumulative = 0
+            for bound, count in op["buckets"].items():
+                cumulative += count
+                lines.append(
+                    f"{prefix}_operation_seconds_bucket"
+                    f"{labels(store=op['store'], operation=op['operation'], le=bound)} {cumulative}"
+                )
+            key = labels(store=op["store"], operation=op["operation"])
+            lines.append(f"{prefix}_operation_seconds_sum{key} {op['total_seconds']}")
+            lines.append(f"{prefix}_operation_seconds_count{key} {op['count']}")
+
+        for metric, field_name, help_text in (
+            ("operation_errors_total", "errors", "Operations that raised."),
+            ("rows_scanned_total", "rows_scanned", "Rows fetched from SQLite by operations."),
+            ("rows_returned_total", "rows_returned", "Rows returned by operations.")
+        ):
+            lines.append(f"# HELP {prefix}_{metric} {help_text}")
+            lines.append(f"# TYPE {prefix}_{metric} counter")
+            for op in snapshot["operations"]:
+                key = labels(store=op["store"], operation=op["operation"])
+                lines.append(f"{prefix}_{metric}{key} {op[field_name]}")
+
+        lines.append(f"# HELP {prefix}_sql_seconds_total Time spent executing and fetching each statement.")
+        lines.append(f"# TYPE {prefix}_sql_seconds_total counter")
+        for stmt in snapshot["sql"]:
+            lines.append(f"{prefix}_sql_seconds_total{labels(statement=stmt['statement'])} {stmt['total_seconds']}")
+        lines.append(f"# HELP {prefix}_sql_calls_total Executions of each statement.")
+        lines.append(f"# TYPE {prefix}_sql_calls_total counter")
+        for stmt in snapshot["sql"]:
+            lines.append(f"{prefix}_sql_calls_total{labels(statement=stmt['statement'])} {stmt['calls']}")
+
+        for metric, field_name, help_text in (
+            ("cache_hits_total", "hits", "Row cache lookups answered from the cache."),
+            ("cache_misses_total", "misses", "Row cache lookups that went to SQLite.")
+        ):
+            lines.append(f"# HELP {prefix}_{metric} {help_text}")
+            lines.append(f"# TYPE {prefix}_{metric} counter")
+            for store, info in snapshot["caches"].items():
+                lines.append(f"{prefix}_{metric}{labels(store=store)} {info[field_name]}")
+
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,1197 @@
+"""SQLite-backed persistent memory store and its expiry sweeper."""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import heapq
+import json
+import pickle
+import sqlite3
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from .embedders import Embedder, EmbeddingQueue
+from .lazy import numpy as np
+from .sqlite_store import SQLiteStore, SharedConnection
+from .vector import PartitionedVectorIndex
+
+
+# =============================================================================
+# 4. PERSISTENT MEMORY STORE (SQLite-based)
+# =============================================================================
+
+class PersistentMemoryStore(SQLiteStore):
+    """
+    Persistent memory store using SQLite.
+    Survives application restarts and supports complex queries.
+
+    Memories added with a ``ttl`` get an ``expires_at`` time; reads skip
+    them once it passes and ``sweep_expired`` (or an ExpirySweeper running
+    it in the background) deletes them in small batches.
+
+    Content and embeddings are stored once per distinct text in
+    ``memory_blobs``, keyed by SHA-256 and shared by every memory with that
+    content. Triggers keep each blob's refcount and delete it when the last
+    memory using it goes. With ``compression`` ("zlib" or "zstd") long
+    content is stored compressed (see ContentCodec).
+
+    ``search_similar`` filtered by ``memory_type`` or ``metadata_filter``
+    runs against an in-process PartitionedVectorIndex (partitioned by
+    memory_type, with bitmaps for ``indexed_metadata_keys``), built on first
+    use and kept current by replaying ``memory_changes``.
+
+    With ``cache_size`` the last ``cache_size`` rows read by ``get`` are
+    kept decoded in an in-process LRU, so repeated gets of hot ids skip
+    SQLite and unpickling; their access counts are written back in batches
+    (``flush_access_counts``). This store's own writes invalidate cached
+    rows; after changing ``memories`` another way call ``invalidate_cache``.
+
+    With an ``embedder``, memories added without an embedding are embedded
+    in the background in micro-batches (see EmbeddingQueue) and their
+    blobs backfilled; ``flush_embeddings`` waits for the backlog.
+
+    ``search_scored`` ranks by a weighted blend of similarity, recency and
+    importance instead of any one of them.
+    """
+
+    CONTENT_TABLE = "memory_blobs"
+    CHANGE_TABLE = "memories"
+    # Not access_count / last_accessed: reads would flood the log
+    CHANGE_COLUMNS = ["content_hash", "metadata", "memory_type", "importance", "expires_at"]
+
+    STATS_STORE = "memories"
+    STATS_TRIGGERS = [
+        f"""
+            CREATE TRIGGER IF NOT EXISTS memories_stats_insert
+            AFTER INSERT ON memories BEGIN
+                {SQLiteStore._stats_delta("memories", "'count'", "1")}
+                {SQLiteStore._stats_delta("memories", "'type:' || IFNULL(new.memory_type, '')", "1")}
+                {SQLiteStore._stats_delta("memories", "'sum:importance'", "new.importance")}
+                {SQLiteStore._stats_delta("memories", "'sum:access_count'", "new.access_count")}
+            END
+        """,
+        f"""
+            CREATE TRIGGER IF NOT EXISTS memories_stats_delete
+            AFTER DELETE ON memories BEGIN
+                {SQLiteStore._stats_delta("memories", "'count'", "-1")}
+                {SQLiteStore._stats_delta("memories", "'type:' || IFNULL(old.memory_type, '')", "-1")}
+                {SQLiteStore._stats_delta("memories", "'sum:importance'", "-old.importance")}
+                {SQLiteStore._stats_delta("memories", "'sum:access_count'", "-old.access_count")}
+            END
+        """,
+        f"""
+            CREATE TRIGGER IF NOT EXISTS memories_stats_update
+            AFTER UPDATE OF memory_type, importance, access_count ON memories BEGIN
+                {SQLiteStore._stats_delta("memories", "'type:' || IFNULL(old.memory_type, '')", "-1")}
+                {SQLiteStore._stats_delta("memories", "'type:' || IFNULL(new.memory_type, '')", "1")}
+                {SQLiteStore._stats_delta("memories", "'sum:importance'", "new.importance - old.importance")}
+                {SQLiteStore._stats_delta("memories", "'sum:access_count'", "new.access_count - old.access_count")}
+            END
+        """,
+        f"""
+            CREATE TRIGGER IF NOT EXISTS memory_blobs_stats_insert
+            AFTER INSERT ON memory_blobs BEGIN
+                {SQLiteStore._stats_delta("memories", "'blobs'", "1")}
+            END
+        """,
+        f"""
+            CREATE TRIGGER IF NOT EXISTS memory_blobs_stats_delete
+            AFTER DELETE ON memory_blobs BEGIN
+                {SQLiteStore._stats_delta("memories", "'blobs'", "-1")}
+            END
+        """
+    ]
+    STATS_RECOUNT_SQL = """
+        SELECT 'count', COUNT(*) FROM memories
+        UNION ALL SELECT 'sum:importance', TOTAL(importance) FROM memories
+        UNION ALL SELECT 'sum:access_count', TOTAL(access_count) FROM memories
+        UNION ALL SELECT 'type:' || IFNULL(memory_type, ''), COUNT(*)
+                  FROM memories GROUP BY memory_type
+        UNION ALL SELECT 'blobs', COUNT(*) FROM memory_blobs
+    """
+    BLOB_TRIGGERS = [
+        """
+            CREATE TRIGGER IF NOT EXISTS memories_blob_ref
+            AFTER INSERT ON memories BEGIN
+                UPDATE memory_blobs SET refcount = refcount + 1 WHERE hash = new.content_hash;
+            END
+        """,
+        """
+            CREATE TRIGGER IF NOT EXISTS memories_blob_unref
+            AFTER DELETE ON memories BEGIN
+                UPDATE memory_blobs SET refcount = refcount - 1 WHERE hash = old.content_hash;
+                DELETE FROM memory_blobs WHERE hash = old.content_hash AND refcount <= 0;
+            END
+        """,
+        """
+            CREATE TRIGGER IF NOT EXISTS memories_blob_reref
+            AFTER UPDATE OF content_hash ON memories BEGIN
+                UPDATE memory_blobs SET refcount = refcount + 1 WHERE hash = new.content_hash;
+                UPDATE memory_blobs SET refcount = refcount - 1 WHERE hash = old.content_hash;
+                DELETE FROM memory_blobs WHERE hash = old.content_hash AND refcount <= 0;
+            END
+        """
+    ]
+    # expires_at carries milliseconds, so compare against a clock that does too
+    NOW_SQL = "strftime('%Y-%m-%d %H:%M:%f', 'now')"
+    NOT_EXPIRED_SQL = f"(expires_at IS NULL OR expires_at > {NOW_SQL})"
+    # An existing blob keeps its embedding; one stored without gains the new one
+    STORE_BLOB_SQL = """
+        INSERT INTO memory_blobs (hash, content, compressed, dict_id, embedding)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT (hash) DO UPDATE SET embedding = IFNULL(embedding, excluded.embedding)
+    """
+
+    # Past this many pending changes the vector index is rebuilt, not patched
+    VECTOR_INDEX_REBUILD_CHANGES = 10000
+
+    DEFAULT_SCORE_WEIGHTS = {"relevance": 1.0, "recency": 1.0, "importance": 1.0}
+
+    def __init__(
+        self,
+        db_path: str = "agent_memory.db",
+        connection: Optional[SharedConnection] = None,
+        compression: Optional[str] = None,
+        indexed_metadata_keys: Tuple[str, ...] = (),
+        cache_size: int = 0,
+        access_flush_every: int = 256,
+        embedder: Optional[Embedder] = None,
+        embed_batch_size: int = 64,
+        embed_max_latency: float = 0.05
+    ):
+        super().__init__(db_path, connection, compression)
+        self.indexed_metadata_keys = tuple(indexed_metadata_keys)
+        self.embedding_queue = (
+            EmbeddingQueue(embedder, self._apply_embeddings, embed_batch_size, embed_max_latency)
+            if embedder is not None else None
+        )
+
+        # id -> (decoded row, expires_at, content_hash); most recently used last
+        self.cache_size = cache_size
+        self.access_flush_every = access_flush_every
+        self._cache: "OrderedDict[str, Tuple[Dict[str, Any], Optional[str], str]]" = OrderedDict()
+        # content_hash -> ids of cached rows read while that blob had no embedding
+        self._cache_unembedded: Dict[str, set] = {}
+        self._cache_lock = threading.Lock()
+        # Bumped by every invalidation; get() only caches a row if no
+        # invalidation ran between reading it and storing it
+        self._cache_generation = 0
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._pending_accesses: Counter = Counter()
+
+        self._vector_index: Optional[PartitionedVectorIndex] = None
+        self._vector_index_seq = 0
+        self._vector_index_expiry: List[Tuple[str, str]] = []
+        self._vector_index_lock = threading.Lock()
+        self._init_database()
+
+    def _init_database(self):
+        """Initialize database schema."""
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+
+            # Lets incremental_vacuum() return freed pages; only takes effect
+            # on a new database file
+            cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
+
+            # Create memories table. content and embedding hold data only for
+            # rows written before deduplication, which are migrated below.
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS memories (
+                    id TEXT PRIMARY KEY,
+                    content TEXT NOT NULL,
+                    embedding BLOB,
+                    metadata TEXT,
+                    memory_type TEXT,
+                    importance REAL DEFAULT 0.5,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    last_accessed TIMESTAMP,
+                    access_count INTEGER DEFAULT 0,
+                    expires_at TIMESTAMP,
+                    content_hash TEXT
+                )
+            """)
+
+            cursor.execute("PRAGMA table_info(memories)")
+            columns = [row[1] for row in cursor.fetchall()]
+            if "expires_at" not in columns:
+                cursor.execute("ALTER TABLE memories ADD COLUMN expires_at TIMESTAMP")
+            if "content_hash" not in columns:
+                cursor.execute("ALTER TABLE memories ADD COLUMN content_hash TEXT")
+
+            # Deduplicated content, one row per distinct text
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS memory_blobs (
+                    hash TEXT PRIMARY KEY,
+                    content TEXT NOT NULL,
+                    embedding BLOB,
+                    refcount INTEGER NOT NULL DEFAULT 0,
+                    compressed INTEGER NOT NULL DEFAULT 0,
+                    dict_id INTEGER
+                )
+            """)
+
+            for trigger_sql in self.BLOB_TRIGGERS:
+                cursor.execute(trigger_sql)
+
+            # Create indexes
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_created_at
+                ON memories(created_at DESC)
+            """)
+
+            # Partial index: only memories with a TTL, so the sweeper's
+            # lookups stay small however many permanent memories there are
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_expires_at
+                ON memories(expires_at) WHERE expires_at IS NOT NULL
+            """)
+
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_importance
+                ON memories(importance DESC)
+            """)
+
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_memory_type
+                ON memories(memory_type)
+            """)
+
+            self._init_stats(cursor)
+            self._init_change_log(cursor)
+            self._init_compression(cursor)
+            self._migrate_inline_content(cursor)
+
+            conn.commit()
+        finally:
+            conn.close()
+
+    @staticmethod
+    def content_hash(content: str) -> str:
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def _store_blob(self, cursor: sqlite3.Cursor, content: str, embedding_blob: Optional[bytes]) -> str:
+        """Insert the blob for ``content`` unless present; returns its hash."""
+        content_hash = self.content_hash(content)
+        cursor.execute(self.STORE_BLOB_SQL, (content_hash, *self._compress_content(content), embedding_blob))
+        return content_hash
+
+    def _migrate_inline_content(self, cursor: sqlite3.Cursor):
+        """Move content of rows from before deduplication into memory_blobs."""
+        cursor.execute("""
+            SELECT rowid, content, embedding FROM memories WHERE content_hash IS NULL
+        """)
+        for rowid, content, embedding_blob in cursor.fetchall():
+            content_hash = self._store_blob(cursor, content, embedding_blob)
+            cursor.execute("""
+                UPDATE memories SET content_hash = ?, content = '', embedding = NULL
+                WHERE rowid = ?
+            """, (content_hash, rowid))
+
+    def add(
+        self,
+        content: str,
+        memory_type: str = "general",
+        embedding: Optional[np.ndarray] = None,
+        metadata: Dict[str, Any] = None,
+        importance: float = 0.5,
+        memory_id: Optional[str] = None,
+        ttl: Optional[float] = None,
+        queue_embedding: bool = True
+    ) -> str:
+        """
+        Add a memory to persistent storage, expiring after ``ttl`` seconds
+        if given (``0`` expires at once; negative raises ValueError).
+        Content already stored is shared, not copied; its first embedding
+        is kept (see ``lookup_embedding``). With ``queue_embedding=False``
+        content stored without an embedding is not sent to the embedder,
+        for callers already computing one.
+        """
+        if ttl is not None and ttl < 0:
+            raise ValueError(f"ttl must be >= 0 seconds, got {ttl}")
+        memory_id = memory_id or str(uuid.uuid4())
+
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+
+            embedding_blob = pickle.dumps(embedding) if embedding is not None else None
+            metadata_json = json.dumps(metadata or {})
+            # Explicit sign and fixed point: SQLite rejects "+-5" and "1e-05"
+            ttl_modifier = f"{float(ttl):+.3f} seconds" if ttl is not None else None
+            content_hash = self._store_blob(cursor, content, embedding_blob)
+
+            cursor.execute("""
+                INSERT INTO memories (id, content, content_hash, metadata, memory_type, importance, expires_at)
+                VALUES (?, '', ?, ?, ?, ?, strftime('%Y-%m-%d %H:%M:%f', 'now', ?))
+            """, (memory_id, content_hash, metadata_json, memory_type, importance, ttl_modifier))
+
+            needs_embedding = False
+            if embedding is None and queue_embedding and self.embedding_queue is not None:
+                cursor.execute("SELECT embedding IS NULL FROM memory_blobs WHERE hash = ?", (content_hash,))
+                needs_embedding = bool(cursor.fetchone()[0])
+
+            conn.commit()
+        finally:
+            conn.close()
+
+        if embedding is not None and self.cache_size:
+            # The blob may have just gained this embedding (see STORE_BLOB_SQL)
+            self._invalidate_cached_blob(content_hash)
+        if needs_embedding:
+            self.embedding_queue.submit(content_hash, content)
+        return memory_id
+
+    def get(self, memory_id: str) -> Optional[Dict[str, Any]]:
+        """Get a memory by ID."""
+        if self.cache_size:
+            memory = self._cache_get(memory_id)
+            if memory is not None:
+                return memory
+            generation = self._cache_generation
+
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+
+            cursor.execute(f"""
+                SELECT id, {self._text_sql("b")}, b.embedding, metadata, memory_type, importance,
+                       created_at, last_accessed, access_count, expires_at, content_hash
+                FROM memories JOIN memory_blobs b ON b.hash = content_hash
+                WHERE id = ? AND {self.NOT_EXPIRED_SQL}
+            """, (memory_id,))
+
+            row = cursor.fetchone()
+        finally:
+            conn.close()
+
+        if not row:
+            return None
+
+        # Update access count
+        self._update_access_count(memory_id)
+
+        memory = {
+            "id": row[0],
+            "content": row[1],
+            "embedding": pickle.loads(row[2]) if row[2] else None,
+            "metadata": json.loads(row[3]),
+            "memory_type": row[4],
+            "importance": row[5],
+            "created_at": row[6],
+            "last_accessed": row[7],
+            "access_count": row[8]
+        }
+        if self.cache_size:
+            self._cache_put(memory, row[9], row[10], generation)
+        return memory
+
+    @staticmethod
+    def _now() -> str:
+        """Current UTC time in the format of ``expires_at`` (see ``NOW_SQL``)."""
+        now = time.time()
+        return time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(now)) + f".{int(now % 1 * 1000):03d}"
+
+    def _cache_get(self, memory_id: str) -> Optional[Dict[str, Any]]:
+        """A copy of the cached row for ``memory_id``, counting the access; None on a miss."""
+        with self._cache_lock:
+            entry = self._cache.get(memory_id)
+            if entry is not None:
+                memory, expires_at, _ = entry
+                if expires_at is not None and expires_at <= self._now():
+                    self._cache_drop(memory_id)
+                    entry = None
+            if entry is None:
+                self._cache_misses += 1
+                return None
+
+            self._cache.move_to_end(memory_id)
+            self._cache_hits += 1
+            result = self._copy_row(memory)
+            memory["access_count"] += 1
+            memory["last_accessed"] = time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime())
+            self._pending_accesses[memory_id] += 1
+            flush = self._cache_hits % self.access_flush_every == 0
+
+        if flush:
+            self.flush_access_counts()
+        return result
+
+    @staticmethod
+    def _copy_row(memory: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy a row with its own metadata and embedding, so callers and the cache never share them."""
+        row = dict(memory, metadata=copy.deepcopy(memory["metadata"]))
+        if row["embedding"] is not None:
+            row["embedding"] = row["embedding"].copy()
+        return row
+
+    def _cache_put(
+        self,
+        memory: Dict[str, Any],
+        expires_at: Optional[str],
+        content_hash: str,
+        generation: int
+    ):
+        """Cache a row read at ``generation``, unless an invalidation has run since."""
+        cached = self._copy_row(memory)
+        # The row was read before _update_access_count bumped it
+        cached["access_count"] += 1
+        with self._cache_lock:
+            if generation != self._cache_generation:
+                return
+            self._cache_drop(memory["id"])
+            self._cache[memory["id"]] = (cached, expires_at, content_hash)
+            if cached["embedding"] is None:
+                self._cache_unembedded.setdefault(content_hash, set()).add(memory["id"])
+            while len(self._cache) > self.cache_size:
+                self._cache_drop(next(iter(self._cache)))
+
+    def _cache_drop(self, memory_id: str):
+        """Remove one cached row (caller holds the cache lock)."""
+        entry = self._cache.pop(memory_id, None)
+        if entry is not None and entry[0]["embedding"] is None:
+            ids = self._cache_unembedded.get(entry[2])
+            if ids is not None:
+                ids.discard(memory_id)
+                if not ids:
+                    del self._cache_unembedded[entry[2]]
+
+    def _invalidate_cached_blob(self, content_hash: str):
+        """Drop cached rows that read ``content_hash`` before it had an embedding."""
+        with self._cache_lock:
+            self._cache_generation += 1
+            for memory_id in list(self._cache_unembedded.get(content_hash, ())):
+                self._cache_drop(memory_id)
+
+    def invalidate_vector_index(self):
+        """Rebuild the in-memory vector index from the table on its next use."""
+        with self._vector_index_lock:
+            self._vector_index = None
+            self._vector_index_seq = 0
+            self._vector_index_expiry = []
+
+    def invalidate_cache(self, memory_ids: Optional[List[str]] = None):
+        """Drop ``memory_ids`` (every row if None) from the row cache."""
+        with self._cache_lock:
+            self._cache_generation += 1
+            if memory_ids is None:
+                self._cache.clear()
+                self._cache_unembedded.clear()
+            else:
+                for memory_id in memory_ids:
+                    self._cache_drop(memory_id)
+
+    def cache_info(self) -> Dict[str, int]:
+        """Row cache hits, misses, current size and capacity."""
+        with self._cache_lock:
+            return {
+                "hits": self._cache_hits,
+                "misses": self._cache_misses,
+                "size": len(self._cache),
+                "capacity": self.cache_size
+            }
+
+    def flush_access_counts(self):
+        """Write the access counts of cache hits back to SQLite."""
+        with self._cache_lock:
+            pending, self._pending_accesses = self._pending_accesses, Counter()
+        if not pending:
+            return
+
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+
+            cursor.executemany("""
+                UPDATE memories
+                SET access_count = access_count + ?, last_accessed = CURRENT_TIMESTAMP
+                WHERE id = ?
+            """, [(count, memory_id) for memory_id, count in pending.items()])
+
+            conn.commit()
+        finally:
+            conn.close()
+
+    def lookup_embedding(self, content: str) -> Optional[np.ndarray]:
+        """Embedding already stored for this exact content, to skip re-embedding."""
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+
+            cursor.execute("""
+                SELECT embedding FROM memory_blobs WHERE hash = ?
+            """, (self.content_hash(content),))
+            row = cursor.fetchone()
+        finally:
+            conn.close()
+
+        return pickle.loads(row[0]) if row and row[0] else None
+
+    def _apply_embeddings(self, embedded: List[Tuple[str, np.ndarray]]):
+        """Store background-computed embeddings on blobs that still lack one."""
+        hashes = [content_hash for content_hash, _ in embedded]
+        placeholders = ",".join("?" * len(hashes))
+
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+
+            cursor.executemany("""
+                UPDATE memory_blobs SET embedding = ? WHERE hash = ? AND embedding IS NULL
+            """, [(pickle.dumps(vector), content_hash) for content_hash, vector in embedded])
+
+            # Blob updates are not logged as memory changes: patch the index and cache here
+            cursor.execute(f"SELECT id FROM memories WHERE content_hash IN ({placeholders})", hashes)
+            memory_ids = [row[0] for row in cursor.fetchall()]
+            with self._vector_index_lock:
+                if self._vector_index is not None:
+                    self._index_memories(cursor, f"AND content_hash IN ({placeholders})", tuple(hashes))
+
+            conn.commit()
+        finally:
+            conn.close()
+
+        self.invalidate_cache(memory_ids)
+
+    def backfill_embeddings(self) -> int:
+        """Queue every stored content without an embedding; returns how many."""
+        if self.embedding_queue is None:
+            raise ValueError("backfill_embeddings needs a store created with an embedder")
+
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT hash, {self._text_sql()} FROM memory_blobs WHERE embedding IS NULL")
+            rows = cursor.fetchall()
+        finally:
+            conn.close()
+
+        for content_hash, content in rows:
+            self.embedding_queue.submit(content_hash, content)
+        return len(rows)
+
+    def flush_embeddings(self, timeout: Optional[float] = None) -> bool:
+        """Wait for queued embeddings to be stored; False on timeout."""
+        return self.embedding_queue.flush(timeout) if self.embedding_queue is not None else True
+
+    def _update_access_count(self, memory_id: str):
+        """Update access count and last accessed timestamp."""
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+
+            cursor.execute("""
+                UPDATE memories
+                SET access_count = access_count + 1, last_accessed = CURRENT_TIMESTAMP
+                WHERE id = ?
+            """, (memory_id,))
+
+            conn.commit()
+        finally:
+            conn.close()
+
+    def search(
+        self,
+        query: str,
+        memory_type: Optional[str] = None,
+        min_importance: float = 0.0,
+        limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """Search memories by content."""
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+
+            sql = f"""
+                SELECT id, {self._text_sql("b")}, metadata, memory_type, importance,
+                       created_at, access_count
+                FROM memories JOIN memory_blobs b ON b.hash = content_hash
+                WHERE {self._text_sql("b")} LIKE ? AND importance >= ? AND {self.NOT_EXPIRED_SQL}
+            """
+            params = [f"%{query}%", min_importance]
+
+            if memory_type:
+                sql += " AND memory_type = ?"
+                params.append(memory_type)
+
+            sql += " ORDER BY importance DESC, created_at DESC LIMIT ?"
+            params.append(limit)
+
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+        finally:
+            conn.close()
+
+        return [
+            {
+                "id": row[0],
+                "content": row[1],
+                "metadata": json.loads(row[2]),
+                "memory_type": row[3],
+                "importance": row[4],
+                "created_at": row[5],
+                "access_count": row[6]
+            }
+            for row in rows
+        ]
+
+    def search_similar(
+        self,
+        query_embedding: np.ndarray,
+        top_k: int = 5,
+        memory_type: Optional[str] = None,
+        metadata_filter: Optional[Dict[str, Any]] = None
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Search by semantic similarity, optionally only among memories of
+        ``memory_type`` whose metadata has every key/value in ``metadata_filter``.
+        """
+        if memory_type or metadata_filter:
+            return self._search_vector_index(query_embedding, top_k, memory_type, metadata_filter or {})
+
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+
+            sql = f"""
+                SELECT id, {self._text_sql("b")}, b.embedding, metadata, importance
+                FROM memories JOIN memory_blobs b ON b.hash = content_hash
+                WHERE b.embedding IS NOT NULL AND {self.NOT_EXPIRED_SQL}
+            """
+
+            cursor.execute(sql)
+            rows = cursor.fetchall()
+        finally:
+            conn.close()
+
+        # Calculate similarities (once per distinct content)
+        embeddings: Dict[bytes, np.ndarray] = {}
+        results = []
+        for row in rows:
+            memory_id, content, embedding_blob, metadata_json, importance = row
+            stored_embedding = embeddings.get(embedding_blob)
+            if stored_embedding is None:
+                stored_embedding = embeddings[embedding_blob] = pickle.loads(embedding_blob)
+
+            similarity = self._cosine_similarity(query_embedding, stored_embedding)
+
+            results.append((
+                {
+                    "id": memory_id,
+                    "content": content,
+                    "metadata": json.loads(metadata_json),
+                    "importance": importance
+                },
+                similarity
+            ))
+
+        # Sort and return top-k
+        results.sort(key=lambda x: x[1], reverse=True)
+        return results[:top_k]
+
+    def _cosine_similarity(self, a: np.ndarray, b: np.ndarray) -> float:
+        """Calculate cosine similarity."""
+        return np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b) + 1e-8)
+
+    def _search_vector_index(
+        self,
+        query_embedding: np.ndarray,
+        top_k: int,
+        memory_type: Optional[str],
+        metadata_filter: Dict[str, Any]
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        bitmap_filters = {k: v for k, v in metadata_filter.items() if k in self.indexed_metadata_keys}
+        other_filters = {k: v for k, v in metadata_filter.items() if k not in self.indexed_metadata_keys}
+
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+
+            predicate = None
+            if other_filters:
+                # Keys without a bitmap are matched in SQL; the index only scores those ids
+                clauses = " AND ".join("json_extract(metadata, ?) = ?" for _ in other_filters)
+                params = [x for key, value in other_filters.items() for x in (f'$."{key}"', value)]
+                cursor.execute(f"SELECT id FROM memories WHERE {clauses}", params)
+                predicate = {row[0] for row in cursor.fetchall()}.__contains__
+
+            with self._vector_index_lock:
+                self._sync_vector_index(cursor)
+                matches = self._vector_index.search(
+                    query_embedding,
+                    top_k,
+                    partitions=[memory_type] if memory_type else None,
+                    filters=bitmap_filters,
+                    predicate=predicate
+                )
+
+            if not matches:
+                return []
+
+            cursor.execute(f"""
+                SELECT id, {self._text_sql("b")}, metadata, importance
+                FROM memories JOIN memory_blobs b ON b.hash = content_hash
+                WHERE id IN ({",".join("?" * len(matches))}) AND {self.NOT_EXPIRED_SQL}
+            """, [memory_id for memory_id, _ in matches])
+            rows = {row[0]: row for row in cursor.fetchall()}
+        finally:
+            conn.close()
+
+        return [
+            (
+                {
+                    "id": memory_id,
+                    "content": rows[memory_id][1],
+                    "metadata": json.loads(rows[memory_id][2]),
+                    "importance": rows[memory_id][3]
+                },
+                similarity
+            )
+            for memory_id, similarity in matches
+            if memory_id in rows
+        ]
+
+    def search_scored(
+        self,
+        query_embedding: Optional[np.ndarray] = None,
+        top_k: int = 5,
+        weights: Optional[Dict[str, float]] = None,
+        half_life_hours: float = 24.0,
+        memory_type: Optional[str] = None,
+        candidate_pool: int = 64
+    ) -> List[Dict[str, Any]]:
+        """
+        Top ``top_k`` memories by
+
+            relevance * cosine similarity to ``query_embedding`` (0 without one)
+            + recency * 0.5 ** (age in hours / ``half_life_hours``)
+            + importance * importance
+
+        with non-negative ``weights`` (missing keys default to 1.0).
+
+        Rather than scoring the whole table, candidates are the union of the
+        ``candidate_pool`` most similar (vector index), most recent
+        (``idx_created_at``) and most important (``idx_importance``)
+        memories, scored together in one vectorized pass. A memory outside
+        all three lists can score at most the blend of the three lists'
+        last entries; while the k-th candidate scores below that bound the
+        pool is grown, so the result is exact.
+        """
+        weights = {**self.DEFAULT_SCORE_WEIGHTS, **(weights or {})}
+        if min(weights.values()) < 0:
+            raise ValueError("search_scored weights must be non-negative")
+        w_relevance = weights["relevance"] if query_embedding is not None else 0.0
+        decay = np.log(2) / half_life_hours
+
+        type_sql = "AND memory_type = ?" if memory_type else ""
+        type_params = (memory_type,) if memory_type else ()
+
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+
+            pool = max(candidate_pool, top_k)
+            while True:
+                candidates: Dict[str, None] = {}
+                exhausted = False
+                bound = 0.0
+
+                # Most similar: from the vector index
+                if w_relevance:
+                    with self._vector_index_lock:
+                        self._sync_vector_index(cursor)
+                        similar = self._vector_index.search(
+                            query_embedding, pool, partitions=[memory_type] if memory_type else None
+                        )
+                    candidates.update(dict.fromkeys(memory_id for memory_id, _ in similar))
+                    # Unembedded memories count as similarity 0
+                    bound += w_relevance * (max(similar[-1][1], 0.0) if len(similar) == pool else 0.0)
+
+                # Most recent and most important: from their indexes
+                for order_sql, weight in (("created_at DESC", weights["recency"]), ("importance DESC", weights["importance"])):
+                    cursor.execute(f"""
+                        SELECT id, (julianday('now') - julianday(created_at)) * 24.0, importance
+                        FROM memories
+                        WHERE {self.NOT_EXPIRED_SQL} {type_sql}
+                        ORDER BY {order_sql} LIMIT ?
+                    """, (*type_params, pool))
+                    rows = cursor.fetchall()
+                    candidates.update(dict.fromkeys(row[0] for row in rows))
+                    if len(rows) < pool:
+                        exhausted = True  # every matching memory is a candidate
+                    elif order_sql.startswith("created_at"):
+                        bound += weight * float(np.exp(-decay * max(rows[-1][1], 0.0)))
+                    else:
+                        bound += weight * rows[-1][2]
+
+                if not candidates:
+                    return []
+
+                ids = list(candidates)
+                scored = self._score_candidates(
+                    cursor, ids, query_embedding, weights, w_relevance, decay
+                )
+                scores = scored["score"]
+                k = min(top_k, len(ids))
+                best = np.argpartition(-scores, k - 1)[:k]
+                best = best[np.argsort(-scores[best], kind='stable')]
+
+                if exhausted or scores[best[-1]] >= bound:
+                    break
+                pool *= 4
+
+            winners = [ids[i] for i in best.tolist()]
+            cursor.execute(f"""
+                SELECT id, {self._text_sql("b")}, metadata, memory_type, importance, created_at
+                FROM memories JOIN memory_blobs b ON b.hash = content_hash
+                WHERE id IN ({",".join("?" * len(winners))})
+            """, winners)
+            rows = {row[0]: row for row in cursor.fetchall()}
+        finally:
+            conn.close()
+
+        results = []
+        for i in best.tolist():
+            row = rows.get(ids[i])
+            if row is None:
+                continue
+            results.append({
+                "id": row[0],
+                "content": row[1],
+                "metadata": json.loads(row[2]),
+                "memory_type": row[3],
+                "importance": row[4],
+                "created_at": row[5],
+                "score": float(scores[i]),
+                "similarity": float(scored["similarity"][i]),
+                "recency": float(scored["recency"][i])
+            })
+        return results
+
+    def _score_candidates(
+        self,
+        cursor: sqlite3.Cursor,
+        ids: List[str],
+        query_embedding: Optional[np.ndarray],
+        weights: Dict[str, float],
+        w_relevance: float,
+        decay: float
+    ) -> Dict[str, np.ndarray]:
+        """Blend scores of ``ids`` (in order), computed as whole arrays."""
+        ages = np.zeros(len(ids))
+        importance = np.zeros(len(ids))
+        position = {memory_id: i for i, memory_id in enumerate(ids)}
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            cursor.execute(f"""
+                SELECT id, (julianday('now') - julianday(created_at)) * 24.0, importance
+                FROM memories WHERE id IN ({",".join("?" * len(chunk))})
+            """, chunk)
+            for memory_id, age, value in cursor.fetchall():
+                ages[position[memory_id]] = age
+                importance[position[memory_id]] = value
+
+        similarity = np.zeros(len(ids))
+        if w_relevance:
+            with self._vector_index_lock:
+                vectors, found = self._vector_index.vectors(ids)
+            if found.any():
+                query = np.asarray(query_embedding, dtype='float32')
+                query = query / (np.linalg.norm(query) + 1e-8)
+                similarity[found] = vectors[found] @ query
+
+        recency = np.exp(-decay * np.maximum(ages, 0.0))
+        return {
+            "score": w_relevance * similarity + weights["recency"] * recency + weights["importance"] * importance,
+            "similarity": similarity,
+            "recency": recency
+        }
+
+    def _sync_vector_index(self, cursor: sqlite3.Cursor):
+        """
+        Bring the vector index up to date (caller holds its lock): build it
+        on first use, then re-read only the memories logged as changed since
+        and drop the ones whose TTL has passed.
+        """
+        cursor.execute("SELECT IFNULL(MAX(seq), 0) FROM memory_changes WHERE store = ?", (self.STATS_STORE,))
+        latest = cursor.fetchone()[0]
+
+        if self._vector_index is None or latest - self._vector_index_seq > self.VECTOR_INDEX_REBUILD_CHANGES:
+            self._vector_index = PartitionedVectorIndex(self.indexed_metadata_keys)
+            self._vector_index_expiry = []
+            self._index_memories(cursor, "", ())
+        elif latest > self._vector_index_seq:
+            cursor.execute("""
+                SELECT DISTINCT row_id FROM memory_changes WHERE store = ? AND seq > ? AND seq <= ?
+            """, (self.STATS_STORE, self._vector_index_seq, latest))
+            changed = [row[0] for row in cursor.fetchall()]
+            for start in range(0, len(changed), 500):
+                chunk = changed[start:start + 500]
+                for memory_id in chunk:
+                    self._vector_index.remove(memory_id)
+                # Memories sharing a changed blob may have just gained its embedding
+                placeholders = ",".join("?" * len(chunk))
+                self._index_memories(
+                    cursor,
+                    f"""AND (id IN ({placeholders}) OR content_hash IN (
+                        SELECT content_hash FROM memories WHERE id IN ({placeholders})
+                    ))""",
+                    (*chunk, *chunk)
+                )
+        self._vector_index_seq = latest
+
+        now = self._now()
+        expiry = self._vector_index_expiry
+        while expiry and expiry[0][0] <= now:
+            self._vector_index.remove(heapq.heappop(expiry)[1])
+
+    def _index_memories(self, cursor: sqlite3.Cursor, where_sql: str, params: tuple):
+        cursor.execute(f"""
+            SELECT id, b.embedding, memory_type, metadata, expires_at
+            FROM memories JOIN memory_blobs b ON b.hash = content_hash
+            WHERE b.embedding IS NOT NULL AND {self.NOT_EXPIRED_SQL} {where_sql}
+        """, params)
+
+        embeddings: Dict[bytes, np.ndarray] = {}
+        index = self._vector_index
+        for memory_id, embedding_blob, memory_type, metadata_json, expires_at in cursor.fetchall():
+            embedding = embeddings.get(embedding_blob)
+            if embedding is None:
+                embedding = embeddings[embedding_blob] = pickle.loads(embedding_blob)
+            index.add(memory_id, embedding, memory_type, json.loads(metadata_json) if index.bitmap_keys else None)
+            if expires_at is not None:
+                heapq.heappush(self._vector_index_expiry, (expires_at, memory_id))
+
+    def prune_changes(self, up_to_seq: int) -> int:
+        """As SQLiteStore.prune_changes, but keeps changes the vector index has not applied yet."""
+        if self._vector_index is not None:
+            up_to_seq = min(up_to_seq, self._vector_index_seq)
+        return super().prune_changes(up_to_seq)
+
+    def get_recent(self, limit: int = 10, memory_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Get recent memories."""
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+
+            sql = f"""
+                SELECT id, {self._text_sql("b")}, metadata, memory_type, importance,
+                       created_at, access_count
+                FROM memories JOIN memory_blobs b ON b.hash = content_hash
+                WHERE {self.NOT_EXPIRED_SQL}
+            """
+            params = []
+
+            if memory_type:
+                sql += " AND memory_type = ?"
+                params.append(memory_type)
+
+            sql += " ORDER BY created_at DESC LIMIT ?"
+            params.append(limit)
+
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+        finally:
+            conn.close()
+
+        return [
+            {
+                "id": row[0],
+                "content": row[1],
+                "metadata": json.loads(row[2]),
+                "memory_type": row[3],
+                "importance": row[4],
+                "created_at": row[5],
+                "access_count": row[6]
+            }
+            for row in rows
+        ]
+
+    def update_importance(self, memory_id: str, importance: float) -> bool:
+        """Update importance score for a memory."""
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+
+            cursor.execute("""
+                UPDATE memories
+                SET importance = ?
+                WHERE id = ?
+            """, (importance, memory_id))
+
+            success = cursor.rowcount > 0
+            conn.commit()
+        finally:
+            conn.close()
+
+        self.invalidate_cache([memory_id])
+        return success
+
+    def cleanup_old_memories(
+        self,
+        days_old: int = 90,
+        min_importance: float = 0.3,
+        batch_size: int = 500
+    ) -> int:
+        """
+        Remove old, unimportant memories, ``batch_size`` rows per
+        transaction so writers are never blocked for long.
+        """
+        deleted_count = 0
+        while True:
+            deleted = self._delete_batch("""
+                created_at < datetime('now', '-' || ? || ' days')
+                AND importance < ?
+            """, (days_old, min_importance), batch_size)
+            deleted_count += deleted
+            if deleted < batch_size:
+                return deleted_count
+
+    def sweep_expired(self, batch_size: int = 500) -> int:
+        """Delete up to ``batch_size`` expired memories in one short transaction."""
+        return self._delete_batch(
+            f"expires_at IS NOT NULL AND expires_at <= {self.NOW_SQL}",
+            (),
+            batch_size
+        )
+
+    def _delete_batch(self, where_sql: str, params: tuple, batch_size: int) -> int:
+        """Delete at most ``batch_size`` rows matching ``where_sql`` and commit."""
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+
+            cursor.execute(f"""
+                DELETE FROM memories WHERE rowid IN (
+                    SELECT rowid FROM memories WHERE {where_sql} LIMIT ?
+                )
+                RETURNING id
+            """, (*params, batch_size))
+
+            deleted_ids = [row[0] for row in cursor.fetchall()]
+            conn.commit()
+        finally:
+            conn.close()
+
+        self.invalidate_cache(deleted_ids)
+        return len(deleted_ids)
+
+    def incremental_vacuum(self, max_pages: int = 1000) -> int:
+        """
+        Return up to ``max_pages`` free pages to the filesystem. A no-op
+        for databases created before auto_vacuum was enabled. Pending
+        writes are committed first, so it cannot run inside
+        ``transaction()``.
+        """
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+
+            cursor.execute("PRAGMA freelist_count")
+            free_before = cursor.fetchone()[0]
+            # The pragma frees one page per step, and sqlite3 only takes the
+            # first step of a statement without result columns; a script is
+            # stepped to completion
+            conn.executescript(f"PRAGMA incremental_vacuum({int(max_pages)})")
+            cursor.execute("PRAGMA freelist_count")
+            freed = free_before - cursor.fetchone()[0]
+
+            conn.commit()
+        finally:
+            conn.close()
+
+        return freed
+
+    def get_stats(self, exact: bool = False) -> Dict[str, Any]:
+        """
+        Get memory store statistics from the trigger-maintained counters.
+        With ``exact=True`` the counters are verified (and repaired) first.
+        """
+        self.flush_access_counts()
+        if exact:
+            self.verify_stats()
+
+        stats = self._read_stats()
+        total = int(stats.get("count", 0))
+        by_type = {
+            memory_type or None: count
+            for memory_type, count in self._group_stats(stats, "type:").items()
+        }
+
+        return {
+            "total_memories": total,
+            "by_type": by_type,
+            "avg_importance": stats.get("sum:importance", 0) / total if total else 0,
+            "total_accesses": int(stats.get("sum:access_count", 0)),
+            "unique_contents": int(stats.get("blobs", 0))
+        }
+
+
+class ExpirySweeper:
+    """
+    Background thread that deletes expired memories a little at a time.
+
+    Every ``interval`` seconds it runs ``sweep_expired`` batches of
+    ``batch_size`` rows, sleeping ``pause`` seconds between batches so
+    other writers get the database in between, then hands the freed pages
+    back with ``incremental_vacuum``. Works with any store offering those
+    two methods (PersistentMemoryStore, ShardedMemoryStore). A failed sweep
+    is counted in ``errors`` and kept in ``last_error``, and the thread
+    tries again at the next interval.
+    """
+
+    def __init__(
+        self,
+        store: Any,
+        interval: float = 60.0,
+        batch_size: int = 500,
+        pause: float = 0.05,
+        vacuum_pages: int = 1000
+    ):
+        self.store = store
+        self.interval = interval
+        self.batch_size = batch_size
+        self.pause = pause
+        self.vacuum_pages = vacuum_pages
+        self.total_swept = 0
+        self.errors = 0
+        self.last_error: Optional[BaseException] = None
+
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="expiry-sweeper", daemon=True)
+        self._thread.start()
+
+    def sweep_once(self) -> int:
+        """Delete every currently expired memory in paced batches."""
+        swept = 0
+        while not self._stopped.is_set():
+            deleted = self.store.sweep_expired(self.batch_size)
+            swept += deleted
+            if deleted < self.batch_size or self._stopped.wait(self.pause):
+                break
+
+        if swept:
+            self.store.incremental_vacuum(self.vacuum_pages)
+        self.total_swept += swept
+        return swept
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                self.sweep_once()
+            except Exception as e:
+                # Database busy or a failing store: record it and keep the
+                # thread alive; the rows are still expired next time
+                self.errors += 1
+                self.last_error = e
+
+    def stop(self):
+        """Stop the sweeper thread after its current batch."""
+        self._stopped.set()
+        self._thread.join()
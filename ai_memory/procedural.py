@@ -0,0 +1,407 @@
+"""Procedural (skill-based) memory."""
+
+from __future__ import annotations
+
+import json
+import pickle
+import re
+import sqlite3
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+from .lazy import numpy as np
+from .sqlite_store import SQLiteStore, SharedConnection
+
+
+# =============================================================================
+# 9. PROCEDURAL MEMORY (Skill-based)
+# =============================================================================
+
+class ProceduralMemory(SQLiteStore):
+    """
+    Memory system for storing procedures and skills.
+    Procedures have steps and success rates.
+
+    Procedures are ranked by ``success_score``, the lower bound of the Wilson
+    score interval on their success rate. It is stored as a generated column
+    with its own index, so top-N queries read rows in index order instead of
+    scanning and sorting the whole table, and a procedure that succeeded 1/1
+    times no longer outranks one that succeeded 95/100 times.
+
+    Procedures can also be found by task description: name, description and
+    steps are kept in an FTS5 index, and an optional embedding per procedure
+    feeds a small in-process vector index.
+    """
+
+    # z = 1.96 (95% confidence); n = success_count + failure_count
+    SUCCESS_SCORE_SQL = """
+        CASE WHEN success_count + failure_count = 0 THEN 0.0 ELSE (
+            (success_count + 1.9208)
+            - 1.96 * sqrt(
+                CAST(success_count AS REAL) * failure_count
+                    / (success_count + failure_count)
+                + 0.9604
+            )
+        ) / (success_count + failure_count + 3.8416) END
+    """
+
+    STATS_STORE = "procedures"
+    CHANGE_TABLE = "procedures"
+    CHANGE_COLUMNS = ["name", "description", "steps", "embedding", "success_count", "failure_count"]
+    STATS_TRIGGERS = [
+        f"""
+            CREATE TRIGGER IF NOT EXISTS procedures_stats_insert
+            AFTER INSERT ON procedures BEGIN
+                {SQLiteStore._stats_delta("procedures", "'count'", "1")}
+            END
+        """,
+        f"""
+            CREATE TRIGGER IF NOT EXISTS procedures_stats_delete
+            AFTER DELETE ON procedures BEGIN
+                {SQLiteStore._stats_delta("procedures", "'count'", "-1")}
+            END
+        """
+    ]
+    STATS_RECOUNT_SQL = "SELECT 'count', COUNT(*) FROM procedures"
+
+    def __init__(
+        self,
+        db_path: str = "procedural_memory.db",
+        connection: Optional[SharedConnection] = None
+    ):
+        super().__init__(db_path, connection)
+        # (procedure ids, normalized embedding matrix), built lazily
+        self._embedding_index: Optional[Tuple[List[str], np.ndarray]] = None
+        self._init_database()
+
+    def _init_database(self):
+        """Initialize database schema."""
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+
+            cursor.execute(f"""
+                CREATE TABLE IF NOT EXISTS procedures (
+                    id TEXT PRIMARY KEY,
+                    name TEXT UNIQUE,
+                    description TEXT,
+                    steps TEXT,
+                    success_count INTEGER DEFAULT 0,
+                    failure_count INTEGER DEFAULT 0,
+                    last_used TIMESTAMP,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    success_score REAL GENERATED ALWAYS AS ({self.SUCCESS_SCORE_SQL}) STORED
+                )
+            """)
+
+            # Databases created before success_score existed: SQLite can only
+            # add VIRTUAL generated columns to an existing table, which index
+            # just as well.
+            cursor.execute("PRAGMA table_xinfo(procedures)")
+            if "success_score" not in [row[1] for row in cursor.fetchall()]:
+                cursor.execute(f"""
+                    ALTER TABLE procedures ADD COLUMN
+                    success_score REAL GENERATED ALWAYS AS ({self.SUCCESS_SCORE_SQL}) VIRTUAL
+                """)
+
+            cursor.execute("PRAGMA table_info(procedures)")
+            if "embedding" not in [row[1] for row in cursor.fetchall()]:
+                cursor.execute("ALTER TABLE procedures ADD COLUMN embedding BLOB")
+
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_success_score
+                ON procedures(success_score DESC)
+            """)
+
+            # Full-text index over name, description and steps, kept in sync
+            # with the procedures table by triggers
+            cursor.execute("""
+                SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'procedures_fts'
+            """)
+            fts_exists = cursor.fetchone() is not None
+
+            cursor.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS procedures_fts USING fts5(
+                    name, description, steps,
+                    content='procedures', content_rowid='rowid'
+                )
+            """)
+
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS procedures_fts_insert
+                AFTER INSERT ON procedures BEGIN
+                    INSERT INTO procedures_fts (rowid, name, description, steps)
+                    VALUES (new.rowid, new.name, new.description, new.steps);
+                END
+            """)
+
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS procedures_fts_delete
+                AFTER DELETE ON procedures BEGIN
+                    INSERT INTO procedures_fts (procedures_fts, rowid, name, description, steps)
+                    VALUES ('delete', old.rowid, old.name, old.description, old.steps);
+                END
+            """)
+
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS procedures_fts_update
+                AFTER UPDATE OF name, description, steps ON procedures BEGIN
+                    INSERT INTO procedures_fts (procedures_fts, rowid, name, description, steps)
+                    VALUES ('delete', old.rowid, old.name, old.description, old.steps);
+                    INSERT INTO procedures_fts (rowid, name, description, steps)
+                    VALUES (new.rowid, new.name, new.description, new.steps);
+                END
+            """)
+
+            if not fts_exists:
+                # Index procedures learned before the FTS table existed
+                cursor.execute("INSERT INTO procedures_fts (procedures_fts) VALUES ('rebuild')")
+
+            self._init_stats(cursor)
+            self._init_change_log(cursor)
+
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _row_to_procedure(self, row: Tuple) -> Dict[str, Any]:
+        """Convert a procedures row to a dict."""
+        return {
+            "id": row[0],
+            "name": row[1],
+            "description": row[2],
+            "steps": json.loads(row[3]),
+            "success_count": row[4],
+            "failure_count": row[5],
+            "success_rate": row[4] / (row[4] + row[5]) if (row[4] + row[5]) > 0 else 0,
+            "success_score": row[6]
+        }
+
+    def learn_procedure(
+        self,
+        name: str,
+        description: str,
+        steps: List[str],
+        embedding: Optional[np.ndarray] = None
+    ) -> str:
+        """Learn a new procedure."""
+        proc_id = str(uuid.uuid4())
+
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+
+            try:
+                cursor.execute("""
+                    INSERT INTO procedures (id, name, description, steps, embedding)
+                    VALUES (?, ?, ?, ?, ?)
+                """, (
+                    proc_id,
+                    name,
+                    description,
+                    json.dumps(steps),
+                    pickle.dumps(embedding) if embedding is not None else None
+                ))
+
+            except sqlite3.IntegrityError:
+                # Procedure exists, update it
+                return self.get_procedure_by_name(name)["id"]
+
+            conn.commit()
+        finally:
+            conn.close()
+
+        if embedding is not None:
+            self._embedding_index = None
+
+        return proc_id
+
+    def execute_procedure(self, name: str, success: bool) -> Dict[str, Any]:
+        """Record execution of a procedure."""
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+
+            # Update stats and read back the new row in one statement
+            counter = "success_count" if success else "failure_count"
+            cursor.execute(f"""
+                UPDATE procedures
+                SET {counter} = {counter} + 1,
+                    last_used = CURRENT_TIMESTAMP
+                WHERE name = ?
+                RETURNING id, name, description, steps, success_count, failure_count,
+                          success_score
+            """, (name,))
+
+            row = cursor.fetchone()
+            conn.commit()
+        finally:
+            conn.close()
+
+        if not row:
+            return None
+
+        return self._row_to_procedure(row)
+
+    def get_procedure_by_name(self, name: str) -> Optional[Dict[str, Any]]:
+        """Get a procedure by name."""
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+
+            cursor.execute("""
+                SELECT id, name, description, steps, success_count, failure_count,
+                       success_score
+                FROM procedures
+                WHERE name = ?
+            """, (name,))
+
+            row = cursor.fetchone()
+        finally:
+            conn.close()
+
+        if not row:
+            return None
+
+        return self._row_to_procedure(row)
+
+    def get_best_procedures(self, min_success_rate: float = 0.7, limit: int = 10) -> List[Dict[str, Any]]:
+        """Get procedures with the highest success scores."""
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+
+            # Filtering happens before LIMIT, so up to `limit` qualifying rows
+            # are always returned; ORDER BY walks idx_success_score.
+            cursor.execute("""
+                SELECT id, name, description, steps, success_count, failure_count,
+                       success_score
+                FROM procedures
+                WHERE success_count + failure_count >= 3
+                AND success_count >= ? * (success_count + failure_count)
+                ORDER BY success_score DESC
+                LIMIT ?
+            """, (min_success_rate, limit))
+
+            rows = cursor.fetchall()
+        finally:
+            conn.close()
+
+        return [self._row_to_procedure(row) for row in rows]
+
+    def get_stats(self, exact: bool = False) -> Dict[str, Any]:
+        """Get the number of stored procedures."""
+        if exact:
+            self.verify_stats()
+
+        return {"total_procedures": int(self._read_stats().get("count", 0))}
+
+    def find_procedures(
+        self,
+        task_text: str,
+        top_k: int = 5,
+        task_embedding: Optional[np.ndarray] = None,
+        relevance_weight: float = 0.7
+    ) -> List[Dict[str, Any]]:
+        """
+        Find procedures suited to a task description.
+
+        Candidates come from the FTS index (and the embedding index when
+        ``task_embedding`` is given). Each is scored as
+        ``relevance_weight * relevance + (1 - relevance_weight) * success_score``,
+        where relevance is the BM25 score normalized to [0, 1] over the
+        candidates, averaged with cosine similarity if embeddings are used.
+        """
+        candidate_count = top_k * 4
+        text_relevance: Dict[int, float] = {}
+        vector_relevance: Dict[str, float] = {}
+
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+
+            terms = re.findall(r"\w+", task_text.lower())
+            if terms:
+                match = " OR ".join(f'"{term}"' for term in set(terms))
+                # bm25() is lower-is-better; weight name matches double
+                cursor.execute("""
+                    SELECT rowid, -bm25(procedures_fts, 2.0, 1.0, 1.0) AS relevance
+                    FROM procedures_fts
+                    WHERE procedures_fts MATCH ?
+                    ORDER BY relevance DESC
+                    LIMIT ?
+                """, (match, candidate_count))
+                text_relevance = dict(cursor.fetchall())
+
+        finally:
+            conn.close()
+
+        if task_embedding is not None:
+            vector_relevance = self._search_embeddings(task_embedding, candidate_count)
+
+        if not text_relevance and not vector_relevance:
+            return []
+
+        max_text = max(text_relevance.values(), default=0) or 1.0
+
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+
+            rowids = list(text_relevance)
+            ids = list(vector_relevance)
+            rowid_marks = ",".join("?" * len(rowids)) or "NULL"
+            id_marks = ",".join("?" * len(ids)) or "NULL"
+            cursor.execute(f"""
+                SELECT id, name, description, steps, success_count, failure_count,
+                       success_score, rowid
+                FROM procedures
+                WHERE rowid IN ({rowid_marks}) OR id IN ({id_marks})
+            """, rowids + ids)
+
+            rows = cursor.fetchall()
+        finally:
+            conn.close()
+
+        results = []
+        for row in rows:
+            procedure = self._row_to_procedure(row)
+            relevance = text_relevance.get(row[7], 0.0) / max_text
+            if task_embedding is not None:
+                relevance = (relevance + vector_relevance.get(row[0], 0.0)) / 2
+
+            procedure["relevance"] = relevance
+            procedure["score"] = (
+                relevance_weight * relevance
+                + (1 - relevance_weight) * procedure["success_score"]
+            )
+            results.append(procedure)
+
+        results.sort(key=lambda x: x["score"], reverse=True)
+        return results[:top_k]
+
+    def _search_embeddings(self, query_embedding: np.ndarray, top_k: int) -> Dict[str, float]:
+        """Return {procedure id: cosine similarity} for the closest procedures."""
+        if self._embedding_index is None:
+            conn = self._connect()
+            try:
+                cursor = conn.cursor()
+                cursor.execute("SELECT id, embedding FROM procedures WHERE embedding IS NOT NULL")
+                rows = cursor.fetchall()
+            finally:
+                conn.close()
+
+            ids = [row[0] for row in rows]
+            matrix = np.array([pickle.loads(row[1]) for row in rows], dtype="float32")
+            if len(ids):
+                matrix /= np.linalg.norm(matrix, axis=1, keepdims=True) + 1e-8
+            self._embedding_index = (ids, matrix)
+
+        ids, matrix = self._embedding_index
+        if not ids or matrix.shape[1] != len(query_embedding):
+            return {}
+
+        query = np.asarray(query_embedding, dtype="float32")
+        similarities = matrix @ (query / (np.linalg.norm(query) + 1e-8))
+        top = np.argsort(-similarities)[:top_k]
+        return {ids[i]: max(0.0, float(similarities[i])) for i in top}
@@ -0,0 +1,171 @@
+"""
+Compact memory records, the dicts built from them and the concurrency
+helpers shared by the in-memory stores.
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from .lazy import numpy as np
+
+
+# =============================================================================
+# MEMORY RECORDS (Compact In-Memory Representation)
+# =============================================================================
+
+@dataclass(slots=True)
+class MemoryRecord:
+    """
+    One memory held by the in-memory stores and tiers.
+
+    A slotted record with an epoch-float timestamp, an interned memory_type
+    and no metadata dict unless one was given is several times smaller than
+    the equivalent dict, which matters at millions of entries.
+    """
+    id: str
+    content: str
+    created_at: float = field(default_factory=time.time)
+    access_count: int = 0
+    memory_type: Optional[str] = None
+    embedding: Optional[np.ndarray] = None
+    metadata: Optional[Dict[str, Any]] = None
+
+    def __post_init__(self):
+        if self.memory_type is not None:
+            self.memory_type = sys.intern(self.memory_type)
+
+
+class MemoryView(dict):
+    """
+    Plain-dict copy of a MemoryRecord's ``keys``, returned by the
+    dict-returning store APIs.
+
+    It is a real dict (JSON-serializable, open to new keys), built when
+    the API returns. ``created_at`` reads as an ISO string. Assigning a
+    record field writes through to the record, so
+    ``memory["access_count"] += 1`` updates the store as it did when the
+    stores held the dicts themselves; the ``metadata`` dict is the
+    record's own.
+    """
+
+    __slots__ = ("_record",)
+
+    def __init__(self, record: MemoryRecord, keys: Tuple[str, ...]):
+        if "metadata" in keys and record.metadata is None:
+            # Allocated on first view so callers can still mutate it
+            record.metadata = {}
+        super().__init__(
+            (key, datetime.fromtimestamp(record.created_at).isoformat() if key == "created_at"
+             else getattr(record, key))
+            for key in keys
+        )
+        self._record = record
+
+    def __setitem__(self, key: str, value: Any):
+        super().__setitem__(key, value)
+        if key in MemoryRecord.__slots__:
+            if key == "created_at" and isinstance(value, str):
+                value = datetime.fromisoformat(value).timestamp()
+            setattr(self._record, key, value)
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def __reduce__(self):
+        # Pickles (e.g. across the memory service) as the plain dict it shows
+        return dict, (dict(self),)
+
+
+# =============================================================================
+# CONCURRENCY HELPERS (Reader/Writer Locking, Batched Access Counts)
+# =============================================================================
+
+class ReadWriteLock:
+    """
+    Many concurrent readers or one writer. Waiting writers block new
+    readers, so a steady stream of searches cannot starve inserts.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+
+    @contextmanager
+    def read(self):
+        with self._cond:
+            while self._writer or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if self._readers == 0:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def write(self):
+        with self._cond:
+            self._writers_waiting += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._writers_waiting -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = False
+                self._cond.notify_all()
+
+
+class _NoLock:
+    """Stand-in for ReadWriteLock when a store is used from one thread."""
+
+    def read(self):
+        return nullcontext()
+
+    def write(self):
+        return nullcontext()
+
+
+class AccessCounter:
+    """
+    Batches access_count increments off the read path.
+
+    Searches only append the records they touched to a queue (an atomic
+    deque append); the counts are applied in bulk every ``flush_every``
+    hits or on ``flush()``, so readers never write to shared records.
+    """
+
+    def __init__(self, flush_every: int = 256):
+        self.flush_every = flush_every
+        self._pending: deque = deque()
+        self._flush_lock = threading.Lock()
+
+    def hit(self, record: MemoryRecord):
+        self._pending.append(record)
+        if len(self._pending) >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        """Apply all pending increments."""
+        with self._flush_lock:
+            while True:
+                try:
+                    record = self._pending.popleft()
+                except IndexError:
+                    break
+                record.access_count += 1
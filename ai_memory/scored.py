@@ -0,0 +1,111 @@
+"""Memory store with importance tracking."""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List, Optional
+
+from .lazy import numpy as np
+from .persistent import PersistentMemoryStore
+
+
+# =============================================================================
+# 6. MEMORY WITH IMPORTANCE SCORING
+# =============================================================================
+
+class ScoredMemoryStore:
+    """
+    Memory store that tracks importance scores for each memory.
+    Uses importance for retention and retrieval ranking.
+    """
+
+    def __init__(self, db_path: str = "scored_memory.db"):
+        self.store = PersistentMemoryStore(db_path)
+
+    def add(
+        self,
+        content: str,
+        memory_type: str = "general",
+        embedding: Optional[np.ndarray] = None,
+        metadata: Dict[str, Any] = None,
+        initial_importance: float = 0.5
+    ) -> str:
+        """Add memory with importance tracking."""
+        return self.store.add(
+            content=content,
+            memory_type=memory_type,
+            embedding=embedding,
+            metadata=metadata,
+            importance=initial_importance
+        )
+
+    def boost_importance(self, memory_id: str, amount: float = 0.1) -> bool:
+        """Boost importance of a memory."""
+        memory = self.store.get(memory_id)
+        if not memory:
+            return False
+
+        new_importance = min(1.0, memory["importance"] + amount)
+        return self.store.update_importance(memory_id, new_importance)
+
+    def decay_importance(self, memory_id: str, amount: float = 0.05) -> bool:
+        """Decay importance of a memory."""
+        memory = self.store.get(memory_id)
+        if not memory:
+            return False
+
+        new_importance = max(0.0, memory["importance"] - amount)
+        return self.store.update_importance(memory_id, new_importance)
+
+    def get_important_memories(
+        self,
+        min_importance: float = 0.7,
+        limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """Get most important memories."""
+        conn = self.store._connect()
+        try:
+            cursor = conn.cursor()
+
+            cursor.execute(f"""
+                SELECT id, {self.store._text_sql("b")}, metadata, importance, access_count
+                FROM memories JOIN memory_blobs b ON b.hash = content_hash
+                WHERE importance >= ? AND {self.store.NOT_EXPIRED_SQL}
+                ORDER BY importance DESC, access_count DESC
+                LIMIT ?
+            """, (min_importance, limit))
+
+            rows = cursor.fetchall()
+        finally:
+            conn.close()
+
+        return [
+            {
+                "id": row[0],
+                "content": row[1],
+                "metadata": json.loads(row[2]),
+                "importance": row[3],
+                "access_count": row[4]
+            }
+            for row in rows
+        ]
+
+    def auto_decay_old_memories(self, days_old: int = 7, decay_factor: float = 0.1):
+        """Decay importance of old memories."""
+        conn = self.store._connect()
+        try:
+            cursor = conn.cursor()
+
+            cursor.execute("""
+                UPDATE memories
+                SET importance = importance * ?
+                WHERE created_at < datetime('now', '-' || ? || ' days')
+            """, (1 - decay_factor, days_old))
+
+            affected = cursor.rowcount
+            conn.commit()
+        finally:
+            conn.close()
+
+        self.store.invalidate_cache()
+        return affected
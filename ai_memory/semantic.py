@@ -0,0 +1,237 @@
+"""Semantic (fact-based) memory."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+from typing import Any, Dict, List, Optional
+
+from .sqlite_store import SQLiteStore, SharedConnection
+
+
+# =============================================================================
+# 8. SEMANTIC MEMORY (Fact-based)
+# =============================================================================
+
+class SemanticMemory(SQLiteStore):
+    """
+    Memory system for storing facts and knowledge.
+    Facts are de-duplicated and can be verified.
+    """
+
+    STATS_STORE = "facts"
+    CHANGE_TABLE = "facts"
+    STATS_TRIGGERS = [
+        f"""
+            CREATE TRIGGER IF NOT EXISTS facts_stats_insert
+            AFTER INSERT ON facts BEGIN
+                {SQLiteStore._stats_delta("facts", "'count'", "1")}
+                INSERT INTO memory_stats (store, key, value)
+                SELECT 'facts', 'category:' || value, 1 FROM json_each(new.categories) WHERE true
+                ON CONFLICT (store, key) DO UPDATE SET value = value + excluded.value;
+            END
+        """,
+        f"""
+            CREATE TRIGGER IF NOT EXISTS facts_stats_delete
+            AFTER DELETE ON facts BEGIN
+                {SQLiteStore._stats_delta("facts", "'count'", "-1")}
+                INSERT INTO memory_stats (store, key, value)
+                SELECT 'facts', 'category:' || value, -1 FROM json_each(old.categories) WHERE true
+                ON CONFLICT (store, key) DO UPDATE SET value = value + excluded.value;
+            END
+        """
+    ]
+    STATS_RECOUNT_SQL = """
+        SELECT 'count', COUNT(*) FROM facts
+        UNION ALL SELECT 'category:' || json_each.value, COUNT(*)
+                  FROM facts, json_each(facts.categories) GROUP BY json_each.value
+    """
+
+    def __init__(
+        self,
+        db_path: str = "semantic_memory.db",
+        connection: Optional[SharedConnection] = None
+    ):
+        super().__init__(db_path, connection)
+        self._init_database()
+
+    def _init_database(self):
+        """Initialize database schema."""
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS facts (
+                    id TEXT PRIMARY KEY,
+                    fact TEXT UNIQUE,
+                    categories TEXT,
+                    confidence REAL DEFAULT 0.5,
+                    verification_count INTEGER DEFAULT 0,
+                    source_count INTEGER DEFAULT 1,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    last_verified TIMESTAMP
+                )
+            """)
+
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_fact_categories
+                ON facts(categories)
+            """)
+
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_confidence
+                ON facts(confidence DESC)
+            """)
+
+            self._init_stats(cursor)
+            self._init_change_log(cursor)
+
+            conn.commit()
+        finally:
+            conn.close()
+
+    def learn_fact(
+        self,
+        fact: str,
+        categories: List[str] = None,
+        confidence: float = 0.5
+    ) -> str:
+        """Learn a new fact or update existing."""
+        import uuid
+        fact_id = hashlib.md5(fact.encode()).hexdigest()
+
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+
+            # Try to insert new fact
+            try:
+                cursor.execute("""
+                    INSERT INTO facts (id, fact, categories, confidence)
+                    VALUES (?, ?, ?, ?)
+                """, (fact_id, fact, json.dumps(categories or []), confidence))
+
+            except sqlite3.IntegrityError:
+                # Fact exists, update it
+                cursor.execute("""
+                    UPDATE facts
+                    SET confidence = (confidence + ?) / 2,
+                        source_count = source_count + 1,
+                        last_verified = CURRENT_TIMESTAMP
+                    WHERE fact = ?
+                """, (confidence, fact))
+
+            conn.commit()
+        finally:
+            conn.close()
+
+        return fact_id
+
+    def get_facts_by_category(
+        self,
+        category: str,
+        min_confidence: float = 0.5
+    ) -> List[Dict[str, Any]]:
+        """Get facts in a category."""
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+
+            cursor.execute("""
+                SELECT fact, categories, confidence, source_count, last_verified
+                FROM facts
+                WHERE categories LIKE ? AND confidence >= ?
+                ORDER BY confidence DESC
+            """, (f'%"{category}"%', min_confidence))
+
+            rows = cursor.fetchall()
+        finally:
+            conn.close()
+
+        return [
+            {
+                "fact": row[0],
+                "categories": json.loads(row[1]),
+                "confidence": row[2],
+                "source_count": row[3],
+                "last_verified": row[4]
+            }
+            for row in rows
+        ]
+
+    def search_facts(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Search facts by keyword."""
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+
+            cursor.execute("""
+                SELECT fact, categories, confidence
+                FROM facts
+                WHERE fact LIKE ?
+                ORDER BY confidence DESC
+                LIMIT ?
+            """, (f"%{query}%", limit))
+
+            rows = cursor.fetchall()
+        finally:
+            conn.close()
+
+        return [
+            {
+                "fact": row[0],
+                "categories": json.loads(row[1]),
+                "confidence": row[2]
+            }
+            for row in rows
+        ]
+
+    def get_stats(self, exact: bool = False) -> Dict[str, Any]:
+        """Get fact counts, in total and per category."""
+        if exact:
+            self.verify_stats()
+
+        stats = self._read_stats()
+        return {
+            "total_facts": int(stats.get("count", 0)),
+            "by_category": self._group_stats(stats, "category:")
+        }
+
+    def verify_fact(self, fact: str, is_correct: bool) -> bool:
+        """Verify a fact as correct or incorrect."""
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+
+            if is_correct:
+                # Increase confidence
+                cursor.execute("""
+                    UPDATE facts
+                    SET confidence = MIN(1.0, confidence + 0.1),
+                        verification_count = verification_count + 1,
+                        last_verified = CURRENT_TIMESTAMP
+                    WHERE fact = ?
+                """, (fact,))
+            else:
+                # Decrease confidence or delete if too low
+                cursor.execute("""
+                    UPDATE facts
+                    SET confidence = MAX(0.0, confidence - 0.2),
+                        verification_count = verification_count + 1,
+                        last_verified = CURRENT_TIMESTAMP
+                    WHERE fact = ?
+                """, (fact,))
+
+                # Delete very low confidence facts
+                cursor.execute("""
+                    DELETE FROM facts WHERE confidence < 0.2
+                """)
+
+            conn.commit()
+            affected = cursor.rowcount
+        finally:
+            conn.close()
+
+        return affected > 0
@@ -0,0 +1,112 @@
+"""Multi-process memory service and client."""
+
+from __future__ import annotations
+
+import signal
+import sys
+import threading
+import time
+from multiprocessing import Process
+from multiprocessing.managers import BaseManager
+from typing import Any
+
+from .unified import UnifiedMemorySystem
+
+
+# =============================================================================
+# 11. SHARED MEMORY SERVICE (Multi-Process)
+# =============================================================================
+
+class MemoryServiceManager(BaseManager):
+    """Manager exposing one process's memory stores to other processes."""
+
+
+MemoryServiceManager.register("PersistentMemoryStore")
+MemoryServiceManager.register("UnifiedMemorySystem")
+
+
+def serve_memory(
+    base_path: str,
+    address: Any,
+    authkey: bytes,
+    commit_interval: float = 0.05,
+    cache_size: int = 10000
+):
+    """
+    Run the memory service in this process until it is killed.
+
+    The service is the only process that opens the database: one
+    UnifiedMemorySystem in single-database mode with group commit, so
+    writes from every client are serialized on one connection and batched
+    into few commits instead of racing for the SQLite write lock. Reads
+    through the ``PersistentMemoryStore`` proxy are served from one row
+    cache of ``cache_size`` entries, so a row read by any client is a
+    cache hit for the rest; the procedure embedding index is shared the
+    same way. ``address`` is a Unix socket path or a (host, port) tuple.
+    """
+    memory = UnifiedMemorySystem(
+        base_path, single_database=True, commit_interval=commit_interval, cache_size=cache_size
+    )
+
+    class _ServerManager(MemoryServiceManager):
+        pass
+
+    # Every client proxy refers to the same two objects
+    _ServerManager.register("PersistentMemoryStore", callable=lambda: memory.vector_store)
+    _ServerManager.register("UnifiedMemorySystem", callable=lambda: memory)
+
+    # Turn SIGTERM into SystemExit so queued group commits are flushed
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    manager = _ServerManager(address=address, authkey=authkey)
+    try:
+        manager.get_server().serve_forever()
+    finally:
+        memory.close()
+
+
+def start_memory_server(
+    base_path: str,
+    address: Any,
+    authkey: bytes,
+    commit_interval: float = 0.05,
+    cache_size: int = 10000
+) -> Process:
+    """Start ``serve_memory`` in a daemon child process and return it."""
+    process = Process(
+        target=serve_memory,
+        args=(base_path, address, authkey, commit_interval, cache_size),
+        name="memory-service",
+        daemon=True
+    )
+    process.start()
+    return process
+
+
+class MemoryClient:
+    """
+    Thin client for a running memory service.
+
+    ``store`` and ``memory`` are proxies with the method API of
+    PersistentMemoryStore and UnifiedMemorySystem respectively; each call
+    runs in the service process. Context-manager methods such as
+    ``transaction()`` cannot cross the process boundary.
+    """
+
+    def __init__(self, address: Any, authkey: bytes, connect_timeout: float = 5.0):
+        self._manager = MemoryServiceManager(address=address, authkey=authkey)
+
+        # The server may still be starting up
+        deadline = time.monotonic() + connect_timeout
+        while True:
+            try:
+                self._manager.connect()
+                break
+            except (FileNotFoundError, ConnectionRefusedError):
+                if time.monotonic() >= deadline:
+                    raise
+                time.sleep(0.05)
+
+        self.store = self._manager.PersistentMemoryStore()
+        self.memory = self._manager.UnifiedMemorySystem()
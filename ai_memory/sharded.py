@@ -0,0 +1,439 @@
+"""Persistent memory store sharded over several SQLite files."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .lazy import numpy as np
+from .persistent import PersistentMemoryStore
+
+
+# =============================================================================
+# 12. SHARDED PERSISTENT MEMORY STORE (Multiple SQLite Files)
+# =============================================================================
+
+class ShardedMemoryStore:
+    """
+    PersistentMemoryStore spread over several SQLite files.
+
+    Each memory lives in exactly one shard, chosen by a stable hash of its
+    id, so writes to different shards never contend for the same SQLite
+    write lock. Lookups by id touch one shard; searches fan out to every
+    shard on a thread pool and the per-shard top-k lists are merged into a
+    global top-k. The shard count is recorded in ``shards.json`` and can
+    only be changed offline with ``reshard_memory_store``.
+    """
+
+    MANIFEST = "shards.json"
+
+    def __init__(
+        self,
+        base_path: str = "./agent_memory_shards",
+        num_shards: int = 4,
+        compression: Optional[str] = None,
+        indexed_metadata_keys: Tuple[str, ...] = (),
+        cache_size: int = 0
+    ):
+        self.base_path = Path(base_path)
+        self.base_path.mkdir(parents=True, exist_ok=True)
+
+        if (self.base_path / RESHARD_STAGING / RESHARD_JOURNAL).exists():
+            raise RuntimeError(
+                f"{base_path} has an interrupted reshard; run reshard_memory_store() to finish it"
+            )
+
+        manifest = self.base_path / self.MANIFEST
+        if manifest.exists():
+            existing = json.loads(manifest.read_text())["num_shards"]
+            if existing != num_shards:
+                raise ValueError(
+                    f"{base_path} holds {existing} shards, not {num_shards}; "
+                    f"use reshard_memory_store() to change the shard count"
+                )
+        else:
+            manifest.write_text(json.dumps({"num_shards": num_shards}))
+
+        self.num_shards = num_shards
+        self.shards = [
+            PersistentMemoryStore(
+                str(self.shard_path(self.base_path, i)),
+                compression=compression,
+                indexed_metadata_keys=indexed_metadata_keys,
+                cache_size=-(-cache_size // num_shards)
+            )
+            for i in range(num_shards)
+        ]
+        self._executor = ThreadPoolExecutor(
+            max_workers=num_shards,
+            thread_name_prefix="memory-shard"
+        )
+
+    @staticmethod
+    def shard_path(base_path: Path, index: int) -> Path:
+        return Path(base_path) / f"shard_{index:03d}.db"
+
+    @staticmethod
+    def shard_index(memory_id: str, num_shards: int) -> int:
+        """Stable shard for an id (unlike ``hash()``, same in every process)."""
+        digest = hashlib.blake2b(memory_id.encode(), digest_size=8).digest()
+        return int.from_bytes(digest, "big") % num_shards
+
+    def shard_for(self, memory_id: str) -> PersistentMemoryStore:
+        return self.shards[self.shard_index(memory_id, self.num_shards)]
+
+    def _fan_out(self, method: str, *args, **kwargs) -> List[Any]:
+        """Call ``method`` on every shard in parallel; results in shard order."""
+        futures = [
+            self._executor.submit(getattr(shard, method), *args, **kwargs)
+            for shard in self.shards
+        ]
+        return [future.result() for future in futures]
+
+    def add(
+        self,
+        content: str,
+        memory_type: str = "general",
+        embedding: Optional[np.ndarray] = None,
+        metadata: Dict[str, Any] = None,
+        importance: float = 0.5,
+        ttl: Optional[float] = None
+    ) -> str:
+        """Add a memory to the shard owning its (freshly generated) id."""
+        memory_id = str(uuid.uuid4())
+        return self.shard_for(memory_id).add(
+            content=content,
+            memory_type=memory_type,
+            embedding=embedding,
+            metadata=metadata,
+            importance=importance,
+            memory_id=memory_id,
+            ttl=ttl
+        )
+
+    def get(self, memory_id: str) -> Optional[Dict[str, Any]]:
+        """Get a memory by ID."""
+        return self.shard_for(memory_id).get(memory_id)
+
+    def update_importance(self, memory_id: str, importance: float) -> bool:
+        """Update importance score for a memory."""
+        return self.shard_for(memory_id).update_importance(memory_id, importance)
+
+    def search(
+        self,
+        query: str,
+        memory_type: Optional[str] = None,
+        min_importance: float = 0.0,
+        limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """Search memories by content across all shards."""
+        results = [
+            memory
+            for shard_results in self._fan_out("search", query, memory_type, min_importance, limit)
+            for memory in shard_results
+        ]
+        # Same order as PersistentMemoryStore.search
+        results.sort(key=lambda m: (m["importance"], m["created_at"]), reverse=True)
+        return results[:limit]
+
+    def search_similar(
+        self,
+        query_embedding: np.ndarray,
+        top_k: int = 5,
+        memory_type: Optional[str] = None,
+        metadata_filter: Optional[Dict[str, Any]] = None
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """Search by semantic similarity across all shards."""
+        results = [
+            result
+            for shard_results in self._fan_out(
+                "search_similar", query_embedding, top_k, memory_type, metadata_filter
+            )
+            for result in shard_results
+        ]
+        results.sort(key=lambda x: x[1], reverse=True)
+        return results[:top_k]
+
+    def search_scored(
+        self,
+        query_embedding: Optional[np.ndarray] = None,
+        top_k: int = 5,
+        weights: Optional[Dict[str, float]] = None,
+        half_life_hours: float = 24.0,
+        memory_type: Optional[str] = None,
+        candidate_pool: int = 64
+    ) -> List[Dict[str, Any]]:
+        """Blended relevance/recency/importance search across all shards."""
+        results = [
+            memory
+            for shard_results in self._fan_out(
+                "search_scored", query_embedding, top_k, weights, half_life_hours, memory_type, candidate_pool
+            )
+            for memory in shard_results
+        ]
+        results.sort(key=lambda m: m["score"], reverse=True)
+        return results[:top_k]
+
+    def get_recent(self, limit: int = 10, memory_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Get recent memories across all shards."""
+        results = [
+            memory
+            for shard_results in self._fan_out("get_recent", limit, memory_type)
+            for memory in shard_results
+        ]
+        results.sort(key=lambda m: m["created_at"], reverse=True)
+        return results[:limit]
+
+    def cleanup_old_memories(
+        self,
+        days_old: int = 90,
+        min_importance: float = 0.3,
+        batch_size: int = 500
+    ) -> int:
+        """Remove old, unimportant memories from every shard, ``batch_size`` rows per transaction."""
+        return sum(self._fan_out("cleanup_old_memories", days_old, min_importance, batch_size))
+
+    def sweep_expired(self, batch_size: int = 500) -> int:
+        """Delete up to ``batch_size`` expired memories from each shard."""
+        return sum(self._fan_out("sweep_expired", batch_size))
+
+    def incremental_vacuum(self, max_pages: int = 1000) -> int:
+        """Return up to ``max_pages`` free pages per shard to the filesystem."""
+        return sum(self._fan_out("incremental_vacuum", max_pages))
+
+    def train_compression_dictionary(self, sample_size: int = 1000, dict_size: int = 16384) -> List[int]:
+        """Train each shard's dictionary on its own rows."""
+        return self._fan_out("train_compression_dictionary", sample_size, dict_size)
+
+    def recompress_content(self, batch_size: int = 500) -> int:
+        """Rewrite every shard's content with the current codec."""
+        return sum(self._fan_out("recompress_content", batch_size))
+
+    def verify_stats(self) -> bool:
+        """Verify (and repair) every shard's counters."""
+        return all(self._fan_out("verify_stats"))
+
+    def cache_info(self) -> Dict[str, int]:
+        """Row cache counters summed over all shards."""
+        total: Dict[str, int] = {}
+        for info in self._fan_out("cache_info"):
+            for key, value in info.items():
+                total[key] = total.get(key, 0) + value
+        return total
+
+    def flush_access_counts(self):
+        """Write every shard's pending cache-hit access counts."""
+        self._fan_out("flush_access_counts")
+
+    def get_stats(self, exact: bool = False) -> Dict[str, Any]:
+        """Memory store statistics summed over all shards."""
+        total = 0
+        importance_sum = 0.0
+        total_accesses = 0
+        unique_contents = 0
+        by_type: Dict[Optional[str], int] = {}
+
+        for stats in self._fan_out("get_stats", exact):
+            total += stats["total_memories"]
+            importance_sum += stats["avg_importance"] * stats["total_memories"]
+            total_accesses += stats["total_accesses"]
+            # Deduplication is per shard, so this can count a text twice
+            unique_contents += stats["unique_contents"]
+            for memory_type, count in stats["by_type"].items():
+                by_type[memory_type] = by_type.get(memory_type, 0) + count
+
+        return {
+            "total_memories": total,
+            "by_type": by_type,
+            "avg_importance": importance_sum / total if total else 0,
+            "total_accesses": total_accesses,
+            "unique_contents": unique_contents,
+            "num_shards": self.num_shards
+        }
+
+    def close(self):
+        """Stop the fan-out worker threads."""
+        self._executor.shutdown(wait=True)
+
+
+RESHARD_STAGING = "resharding"
+RESHARD_RETIRED = "resharding-old"
+RESHARD_JOURNAL = "journal.json"
+
+
+def _write_json_atomic(path: Path, data: Dict[str, Any]):
+    """Replace ``path`` with ``data`` so a crash leaves the old or the new file, never half of one."""
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w") as f:
+        json.dump(data, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _shard_files(base: Path, index: int) -> List[Path]:
+    path = str(ShardedMemoryStore.shard_path(base, index))
+    return [Path(path + suffix) for suffix in ("", "-wal", "-shm")]
+
+
+def _finish_reshard(base: Path) -> int:
+    """
+    Complete the swap recorded in the staging journal; every step can be
+    repeated, so a crash at any point is resumed from where it stopped.
+    """
+    staging = base / RESHARD_STAGING
+    retired = base / RESHARD_RETIRED
+    journal_path = staging / RESHARD_JOURNAL
+    journal = json.loads(journal_path.read_text())
+
+    if journal["phase"] == "copied":
+        # Move every old shard aside before any new one takes its name
+        retired.mkdir(exist_ok=True)
+        for i in range(journal["old_shards"]):
+            for old_file in _shard_files(base, i):
+                if old_file.exists():
+                    old_file.replace(retired / old_file.name)
+        journal["phase"] = "retired"
+        _write_json_atomic(journal_path, journal)
+
+    if journal["phase"] == "retired":
+        for i in range(journal["num_shards"]):
+            for new_file, target in zip(_shard_files(staging, i), _shard_files(base, i)):
+                if new_file.exists():
+                    new_file.replace(target)
+        _write_json_atomic(base / ShardedMemoryStore.MANIFEST, {"num_shards": journal["num_shards"]})
+        journal["phase"] = "swapped"
+        _write_json_atomic(journal_path, journal)
+
+    if retired.exists():
+        shutil.rmtree(retired)
+    journal_path.unlink()
+    staging.rmdir()
+    return journal["moved"]
+
+
+def reshard_memory_store(base_path: str, num_shards: int, batch_size: int = 1000) -> int:
+    """
+    Redistribute a ShardedMemoryStore over ``num_shards`` files, offline.
+
+    No store may have the directory open while this runs. Rows are copied
+    verbatim (ids, timestamps, access counts) into new shard files built
+    in a staging directory; the old shards are untouched until every row
+    has been copied. Content blobs travel with the memories that use them,
+    and the triggers rebuild their refcounts; compression dictionaries are
+    copied to every new shard under new ids. Returns the number of
+    memories moved.
+
+    Once the copy is complete a journal in the staging directory records
+    it, and the swap (old shards moved aside, new ones moved in, manifest
+    rewritten) follows the journal. If the process dies during the swap,
+    running this again finishes it from the journal instead of copying
+    anew; if it dies during the copy, the partial staging files are
+    discarded and the copy restarts from the untouched old shards.
+    """
+    base = Path(base_path)
+    staging = base / RESHARD_STAGING
+    if (staging / RESHARD_JOURNAL).exists():
+        moved = _finish_reshard(base)
+        if json.loads((base / ShardedMemoryStore.MANIFEST).read_text())["num_shards"] == num_shards:
+            return moved
+
+    manifest = base / ShardedMemoryStore.MANIFEST
+    old_count = json.loads(manifest.read_text())["num_shards"]
+
+    if staging.exists():
+        # No journal: an interrupted copy, superseded by the old shards
+        shutil.rmtree(staging)
+    staging.mkdir()
+
+    # Creating the stores sets up schema, indexes and stats triggers
+    new_paths = [ShardedMemoryStore.shard_path(staging, i) for i in range(num_shards)]
+    for path in new_paths:
+        PersistentMemoryStore(str(path))
+    targets = [sqlite3.connect(str(path)) for path in new_paths]
+
+    moved = 0
+    try:
+        for i in range(old_count):
+            source_path = str(ShardedMemoryStore.shard_path(base, i))
+            PersistentMemoryStore(source_path)  # brings older shard schemas up to date
+            source = sqlite3.connect(source_path)
+            columns = [row[1] for row in source.execute("PRAGMA table_info(memories)")]
+            id_position = columns.index("id")
+            hash_position = columns.index("content_hash")
+            insert_sql = (
+                f"INSERT INTO memories ({', '.join(columns)}) "
+                f"VALUES ({', '.join('?' * len(columns))})"
+            )
+            blob_columns = [
+                row[1] for row in source.execute("PRAGMA table_info(memory_blobs)")
+                if row[1] != "refcount"
+            ]
+            dict_position = blob_columns.index("dict_id")
+            insert_blob_sql = (
+                f"INSERT OR IGNORE INTO memory_blobs ({', '.join(blob_columns)}) "
+                f"VALUES ({', '.join('?' * len(blob_columns))})"
+            )
+
+            # Dictionary ids are per file, so each target gets its own copy
+            dictionaries = source.execute("""
+                SELECT id, store, algorithm, data, created_at FROM compression_dicts ORDER BY id
+            """).fetchall()
+            dict_ids: List[Dict[int, int]] = []
+            for target in targets:
+                mapping = {}
+                for dict_id, *dictionary in dictionaries:
+                    mapping[dict_id] = target.execute("""
+                        INSERT INTO compression_dicts (store, algorithm, data, created_at)
+                        VALUES (?, ?, ?, ?)
+                    """, dictionary).lastrowid
+                dict_ids.append(mapping)
+
+            # Each memory row comes with its blob's columns after its own
+            cursor = source.execute(f"""
+                SELECT {', '.join(f"m.{column}" for column in columns)},
+                       {', '.join(f"b.{column}" for column in blob_columns)}
+                FROM memories m JOIN memory_blobs b ON b.hash = m.content_hash
+            """)
+            width = len(columns)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                buckets: Dict[int, List[tuple]] = {}
+                for row in rows:
+                    index = ShardedMemoryStore.shard_index(row[id_position], num_shards)
+                    buckets.setdefault(index, []).append(row)
+                for index, bucket in buckets.items():
+                    blobs = {}
+                    for row in bucket:
+                        if row[hash_position] not in blobs:
+                            blob = list(row[width:])
+                            if blob[dict_position] is not None:
+                                blob[dict_position] = dict_ids[index][blob[dict_position]]
+                            blobs[row[hash_position]] = blob
+                    targets[index].executemany(insert_blob_sql, blobs.values())
+                    targets[index].executemany(insert_sql, [row[:width] for row in bucket])
+                moved += len(rows)
+            source.close()
+
+        for target in targets:
+            target.commit()
+    finally:
+        for target in targets:
+            target.close()
+
+    _write_json_atomic(staging / RESHARD_JOURNAL, {
+        "phase": "copied",
+        "old_shards": old_count,
+        "num_shards": num_shards,
+        "moved": moved,
+    })
+    return _finish_reshard(base)
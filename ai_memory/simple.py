@@ -0,0 +1,154 @@
+"""Simple in-memory store with substring and token search."""
+
+from __future__ import annotations
+
+import re
+import uuid
+from typing import Any, Dict, List, Optional, Set
+
+from .records import AccessCounter, MemoryRecord, MemoryView, ReadWriteLock, _NoLock
+
+
+# =============================================================================
+# 1. SIMPLE IN-MEMORY STORE (For Prototyping)
+# =============================================================================
+
+class SimpleMemoryStore:
+    """
+    Simple in-memory store for quick prototyping.
+    Not persistent, but very fast and easy to use.
+
+    Memories are indexed on add: by id, by lower-cased token, and by
+    character trigram. ``get`` is a dict lookup, and ``search`` only checks
+    memories that contain every trigram of the query, so lookups stay fast
+    at 10^5+ entries instead of scanning the whole list.
+
+    With ``thread_safe=True`` adds take a write lock and index searches a
+    shared read lock; ``get`` is lock-free. Access counts are applied in
+    batches (see ``flush_access_counts``) in either mode.
+    """
+
+    VIEW_KEYS = ("id", "content", "metadata", "created_at", "access_count")
+
+    def __init__(self, thread_safe: bool = False):
+        self._lock = ReadWriteLock() if thread_safe else _NoLock()
+        self._access = AccessCounter()
+        self._records: List[MemoryRecord] = []
+        self._by_id: Dict[str, MemoryRecord] = {}
+        # Postings hold positions in self._records, i.e. insertion order
+        self._lowered: List[str] = []
+        self._token_index: Dict[str, Set[int]] = {}
+        self._trigram_index: Dict[str, Set[int]] = {}
+
+    def add(self, content: str, metadata: Dict[str, Any] = None) -> str:
+        """Add a memory and return its ID."""
+        lowered = content.lower()
+        tokens = set(re.findall(r"\w+", lowered))
+        trigrams = {lowered[i:i + 3] for i in range(len(lowered) - 2)}
+
+        with self._lock.write():
+            memory_id = uuid.uuid4().hex[:16]
+            while memory_id in self._by_id:
+                memory_id = uuid.uuid4().hex[:16]
+
+            record = MemoryRecord(memory_id, content, metadata=metadata or None)
+
+            position = len(self._records)
+            self._records.append(record)
+            self._lowered.append(lowered)
+
+            for token in tokens:
+                self._token_index.setdefault(token, set()).add(position)
+            for trigram in trigrams:
+                self._trigram_index.setdefault(trigram, set()).add(position)
+
+            # Published last: a lock-free get() never sees a half-indexed record
+            self._by_id[memory_id] = record
+
+        return memory_id
+
+    @property
+    def memories(self) -> List[MemoryView]:
+        """All memories, as dict-style views."""
+        self._access.flush()
+        with self._lock.read():
+            return [MemoryView(record, self.VIEW_KEYS) for record in self._records]
+
+    def get(self, memory_id: str) -> Optional[MemoryView]:
+        """Get a memory by ID."""
+        record = self._by_id.get(memory_id)
+        if record is None:
+            return None
+        self._access.hit(record)
+        return MemoryView(record, self.VIEW_KEYS)
+
+    def flush_access_counts(self):
+        """Apply pending access_count increments."""
+        self._access.flush()
+
+    def search(self, query: str, top_k: int = 5) -> List[Dict[str, Any]]:
+        """Simple keyword (substring) search, in insertion order."""
+        with self._lock.read():
+            records = self._search_locked(query.lower(), top_k)
+
+        for record in records:
+            self._access.hit(record)
+        return [MemoryView(record, self.VIEW_KEYS) for record in records]
+
+    def _search_locked(self, query_lower: str, top_k: int) -> List[MemoryRecord]:
+        """Substring search; caller holds the read lock."""
+        if len(query_lower) >= 3:
+            # Only memories containing every trigram of the query can match
+            postings = sorted(
+                (self._trigram_index.get(query_lower[i:i + 3], set())
+                 for i in range(len(query_lower) - 2)),
+                key=len
+            )
+            candidates = set(postings[0])
+            for posting in postings[1:]:
+                if not candidates:
+                    break
+                candidates &= posting
+            positions = sorted(candidates)
+        else:
+            positions = range(len(self._records))
+
+        results = []
+        for position in positions:
+            if query_lower in self._lowered[position]:
+                results.append(self._records[position])
+                if len(results) == top_k:
+                    break
+
+        return results
+
+    def search_tokens(self, query: str, top_k: int = 5) -> List[Dict[str, Any]]:
+        """
+        Search by whole words using the inverted token index.
+        Memories matching more query tokens rank first, then insertion order.
+        """
+        matches: Dict[int, int] = {}
+        with self._lock.read():
+            for token in set(re.findall(r"\w+", query.lower())):
+                for position in self._token_index.get(token, ()):
+                    matches[position] = matches.get(position, 0) + 1
+
+            ranked = sorted(matches, key=lambda position: (-matches[position], position))
+            records = [self._records[position] for position in ranked[:top_k]]
+
+        for record in records:
+            self._access.hit(record)
+        return [MemoryView(record, self.VIEW_KEYS) for record in records]
+
+    def get_all(self) -> List[MemoryView]:
+        """Get all memories."""
+        return self.memories
+
+    def clear(self):
+        """Clear all memories."""
+        with self._lock.write():
+            self._records = []
+            self._by_id = {}
+            self._lowered = []
+            self._token_index = {}
+            self._trigram_index = {}
@@ -0,0 +1,309 @@
+"""Columnar snapshot export and import for UnifiedMemorySystem."""
+
+from __future__ import annotations
+
+import json
+import pickle
+import zlib
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from .lazy import numpy as np
+
+
+# =============================================================================
+# 13. MEMORY SNAPSHOTS (Columnar Archive)
+# =============================================================================
+
+@dataclass
+class SnapshotTable:
+    """How one table of a UnifiedMemorySystem is written to a snapshot."""
+    store: str                      # attribute of UnifiedMemorySystem
+    table: str
+    columns: List[Tuple[str, str]]  # (name, kind): text, real, int or embedding
+    changed_since_sql: str          # WHERE clause for incremental snapshots
+
+
+SNAPSHOT_TABLES = [
+    SnapshotTable(
+        "episodic", "episodes",
+        [("id", "text"), ("timestamp", "text"), ("event_type", "text"),
+         ("participants", "text"), ("content", "text"), ("outcome", "text"),
+         ("metadata", "text"), ("embedding", "embedding"), ("importance", "real")],
+        "timestamp >= :since"
+    ),
+    SnapshotTable(
+        "semantic", "facts",
+        [("id", "text"), ("fact", "text"), ("categories", "text"),
+         ("confidence", "real"), ("verification_count", "int"), ("source_count", "int"),
+         ("created_at", "text"), ("last_verified", "text")],
+        "created_at >= :since OR last_verified >= :since"
+    ),
+    SnapshotTable(
+        "procedural", "procedures",
+        [("id", "text"), ("name", "text"), ("description", "text"), ("steps", "text"),
+         ("success_count", "int"), ("failure_count", "int"), ("last_used", "text"),
+         ("created_at", "text"), ("embedding", "embedding")],
+        "created_at >= :since OR last_used >= :since"
+    ),
+    SnapshotTable(
+        "vector_store", "memories",
+        [("id", "text"), ("content", "text"), ("embedding", "embedding"),
+         ("metadata", "text"), ("memory_type", "text"), ("importance", "real"),
+         ("created_at", "text"), ("last_accessed", "text"), ("access_count", "int"),
+         ("expires_at", "text")],
+        "created_at >= :since OR last_accessed >= :since"
+    ),
+]
+
+SNAPSHOT_VERSION = 1
+
+
+def _pack_text(values: List[Optional[str]]) -> Dict[str, np.ndarray]:
+    """One zlib-compressed UTF-8 buffer plus offsets and a null mask."""
+    encoded = [value.encode("utf-8") if value is not None else b"" for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    return {
+        "data": np.frombuffer(zlib.compress(b"".join(encoded), 6), dtype=np.uint8),
+        "offsets": offsets,
+        "nulls": np.array([value is None for value in values], dtype=bool)
+    }
+
+
+def _unpack_text(data: np.ndarray, offsets: np.ndarray, nulls: np.ndarray) -> List[Optional[str]]:
+    buffer = zlib.decompress(data.tobytes())
+    bounds = offsets.tolist()
+    return [
+        None if null else buffer[start:stop].decode("utf-8")
+        for start, stop, null in zip(bounds, bounds[1:], nulls.tolist())
+    ]
+
+
+def _pack_embeddings(blobs: List[Optional[bytes]]) -> Dict[str, np.ndarray]:
+    """Rows that have an embedding, and the embeddings as one float32 matrix."""
+    rows = [i for i, blob in enumerate(blobs) if blob is not None]
+    vectors = [np.asarray(pickle.loads(blobs[i]), dtype=np.float32) for i in rows]
+    if len({vector.shape for vector in vectors}) > 1:
+        raise ValueError("embeddings of different dimensions cannot share a snapshot matrix")
+    return {
+        "rows": np.array(rows, dtype=np.int64),
+        "matrix": np.stack(vectors) if vectors else np.empty((0, 0), dtype=np.float32)
+    }
+
+
+def _unpack_embeddings(rows: np.ndarray, matrix: np.ndarray, count: int) -> List[Optional[bytes]]:
+    blobs: List[Optional[bytes]] = [None] * count
+    for row, vector in zip(rows.tolist(), matrix):
+        blobs[row] = pickle.dumps(vector)
+    return blobs
+
+
+def _snapshot_select(memory: "UnifiedMemorySystem", spec: SnapshotTable) -> str:
+    store = getattr(memory, spec.store)
+    if spec.table == "memories":
+        # Content and embedding live in the shared blob rows
+        expressions = {"content": store._text_sql("b"), "embedding": "b.embedding"}
+        source = "memories JOIN memory_blobs b ON b.hash = content_hash"
+    else:
+        expressions = {"content": store._text_sql()} if store.CONTENT_TABLE == spec.table else {}
+        source = spec.table
+    select = ", ".join(expressions.get(name, name) for name, _ in spec.columns)
+    return f"SELECT {select} FROM {source}"
+
+
+def export_snapshot(
+    memory: "UnifiedMemorySystem",
+    path: str,
+    since: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Write every store of ``memory`` to one ``.npz`` archive.
+
+    Each column becomes one array: numbers as int64/float64, text as a
+    single compressed buffer with offsets, embeddings as one float32
+    matrix. With ``since`` (an SQLite timestamp, e.g. the ``taken_at`` of
+    an earlier snapshot) only rows created or touched since then are
+    written. Importance changes and deletions are not captured. Returns
+    the snapshot's metadata.
+    """
+    arrays: Dict[str, np.ndarray] = {}
+    counts: Dict[str, int] = {}
+    taken_at = None
+
+    for spec in SNAPSHOT_TABLES:
+        store = getattr(memory, spec.store)
+        conn = store._connect()
+        try:
+            cursor = conn.cursor()
+
+            if taken_at is None:
+                cursor.execute("SELECT CURRENT_TIMESTAMP")
+                taken_at = cursor.fetchone()[0]
+
+            sql = _snapshot_select(memory, spec)
+            if since is not None:
+                sql += f" WHERE {spec.changed_since_sql}"
+            cursor.execute(sql, {"since": since} if since is not None else {})
+            rows = cursor.fetchall()
+        finally:
+            conn.close()
+
+        counts[spec.table] = len(rows)
+        for position, (name, kind) in enumerate(spec.columns):
+            values = [row[position] for row in rows]
+            prefix = f"{spec.table}.{name}"
+            if kind == "text":
+                packed = _pack_text(values)
+            elif kind == "embedding":
+                packed = _pack_embeddings(values)
+            elif kind == "real":
+                packed = {"values": np.array(
+                    [value if value is not None else np.nan for value in values], dtype=np.float64
+                )}
+            else:
+                packed = {"values": np.array([value or 0 for value in values], dtype=np.int64)}
+            for key, array in packed.items():
+                arrays[f"{prefix}.{key}"] = array
+
+    meta = {"version": SNAPSHOT_VERSION, "taken_at": taken_at, "since": since, "counts": counts}
+    arrays["meta"] = np.frombuffer(json.dumps(meta).encode("utf-8"), dtype=np.uint8)
+    with open(path, "wb") as archive:
+        np.savez(archive, **arrays)
+    return meta
+
+
+def _read_snapshot_table(data: Any, spec: SnapshotTable, count: int) -> Dict[str, List[Any]]:
+    columns = {}
+    for name, kind in spec.columns:
+        prefix = f"{spec.table}.{name}"
+        if kind == "text":
+            columns[name] = _unpack_text(
+                data[f"{prefix}.data"], data[f"{prefix}.offsets"], data[f"{prefix}.nulls"]
+            )
+        elif kind == "embedding":
+            columns[name] = _unpack_embeddings(data[f"{prefix}.rows"], data[f"{prefix}.matrix"], count)
+        elif kind == "real":
+            columns[name] = [
+                None if np.isnan(value) else value for value in data[f"{prefix}.values"].tolist()
+            ]
+        else:
+            columns[name] = data[f"{prefix}.values"].tolist()
+    return columns
+
+
+def import_snapshot(memory: "UnifiedMemorySystem", path: str) -> Dict[str, int]:
+    """
+    Load an archive written by ``export_snapshot`` into ``memory``.
+
+    Rows are upserted by id, so incremental snapshots can be applied on top
+    of a full one in order. A table that is empty beforehand is bulk-loaded:
+    its indexes and triggers are dropped during the load and recreated
+    after, and the derived state they maintain (stats counters, blob
+    refcounts, the procedure FTS index, the ``memory_changes`` log) is
+    rebuilt in one pass. Returns rows loaded per table.
+    """
+    loaded = {}
+    with np.load(path) as data:
+        meta = json.loads(data["meta"].tobytes())
+        if meta["version"] != SNAPSHOT_VERSION:
+            raise ValueError(f"unsupported snapshot version {meta['version']}")
+
+        for spec in SNAPSHOT_TABLES:
+            count = meta["counts"].get(spec.table, 0)
+            loaded[spec.table] = count
+            if count:
+                _load_snapshot_table(memory, spec, _read_snapshot_table(data, spec, count), count)
+
+    memory.vector_store.invalidate_cache()
+    memory.vector_store.invalidate_vector_index()
+    return loaded
+
+
+def _load_snapshot_table(
+    memory: "UnifiedMemorySystem",
+    spec: SnapshotTable,
+    columns: Dict[str, List[Any]],
+    count: int
+):
+    store = getattr(memory, spec.store)
+    conn = store._connect()
+    try:
+        cursor = conn.cursor()
+        # DDL outside a transaction commits at once; the savepoint lets a
+        # failed load undo the index and trigger drops along with the rows
+        cursor.execute("SAVEPOINT load_snapshot")
+        try:
+            # Turn snapshot columns into table columns
+            if spec.table == "memories":
+                hashes = []
+                blobs = {}
+                refcounts: Counter = Counter()
+                for content, embedding_blob in zip(columns.pop("content"), columns.pop("embedding")):
+                    content_hash = store.content_hash(content)
+                    if content_hash not in blobs:
+                        blobs[content_hash] = (content_hash, *store._compress_content(content), embedding_blob)
+                    hashes.append(content_hash)
+                    refcounts[content_hash] += 1
+                cursor.executemany(store.STORE_BLOB_SQL, blobs.values())
+                columns["content_hash"] = hashes
+                columns["content"] = [""] * count
+            elif store.CONTENT_TABLE == spec.table:
+                stored = [store._compress_content(text) for text in columns.pop("content")]
+                columns["content"], columns["compressed"], columns["dict_id"] = (
+                    list(values) for values in zip(*stored)
+                )
+
+            names = list(columns)
+            updates = ", ".join(f"{name} = excluded.{name}" for name in names if name != "id")
+            insert_sql = (
+                f"INSERT INTO {spec.table} ({', '.join(names)}) VALUES ({', '.join('?' * len(names))}) "
+                f"ON CONFLICT (id) DO UPDATE SET {updates}"
+            )
+
+            cursor.execute(f"SELECT EXISTS (SELECT 1 FROM {spec.table})")
+            bulk = not cursor.fetchone()[0]
+            deferred = []
+            if bulk:
+                cursor.execute("""
+                    SELECT type, name, sql FROM sqlite_master
+                    WHERE tbl_name = ? AND type IN ('index', 'trigger') AND sql IS NOT NULL
+                """, (spec.table,))
+                deferred = cursor.fetchall()
+                for kind, name, _ in deferred:
+                    cursor.execute(f"DROP {kind.upper()} {name}")
+
+            cursor.executemany(insert_sql, zip(*columns.values()))
+
+            if bulk:
+                for _, _, sql in deferred:
+                    cursor.execute(sql)
+                if spec.table == "memories":
+                    # The reference triggers were off while the rows went in
+                    cursor.executemany("""
+                        UPDATE memory_blobs SET refcount = refcount + ? WHERE hash = ?
+                    """, [(refs, content_hash) for content_hash, refs in refcounts.items()])
+                if spec.table == "procedures":
+                    cursor.execute("INSERT INTO procedures_fts (procedures_fts) VALUES ('rebuild')")
+                if store.CHANGE_TABLE == spec.table:
+                    # The change-log triggers were off too; every row is an insert
+                    cursor.execute(f"""
+                        INSERT INTO memory_changes (store, op, row_id)
+                        SELECT ?, 'insert', id FROM {spec.table}
+                    """, (store.STATS_STORE,))
+
+            # Counters: bulk loads skipped the triggers, and upserts can change
+            # categories, which the fact triggers do not track
+            store._write_stats(cursor, store._recount_stats(cursor))
+        except BaseException:
+            cursor.execute("ROLLBACK TO load_snapshot")
+            cursor.execute("RELEASE load_snapshot")
+            raise
+        cursor.execute("RELEASE load_snapshot")
+        conn.commit()
+    finally:
+        conn.close()
+
+    if spec.table == "procedures":
+        store._embedding_index = None
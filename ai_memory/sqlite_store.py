@@ -0,0 +1,627 @@
+"""SQLite connection handling, content compression and the SQLiteStore base class."""
+
+from __future__ import annotations
+
+import json
+import re
+import sqlite3
+import threading
+import zlib
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# =============================================================================
+# SQLITE CONNECTIONS (Per-Call or Shared)
+# =============================================================================
+
+class SharedConnection:
+    """
+    One SQLite connection shared by several memory stores.
+
+    Stores normally open a fresh connection per call. Given a
+    SharedConnection instead, each call leases this connection under a lock,
+    so all stores can live in one WAL database: cross-store joins become
+    plain SQL, and ``transaction()`` groups writes from every store into a
+    single commit.
+
+    With ``commit_interval`` (seconds) store commits are grouped: writes
+    stay in one open transaction that a background thread commits every
+    interval, or as soon as ``max_pending_commits`` writes are waiting.
+    Writes acknowledged within the last interval can be lost on a crash.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        commit_interval: Optional[float] = None,
+        max_pending_commits: int = 256
+    ):
+        self.db_path = db_path
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        # Must precede the journal mode switch, which initializes the file
+        self._conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._lock = threading.RLock()
+        self._holder = threading.local()
+        self._transaction_depth = 0
+
+        self.commit_interval = commit_interval
+        self.max_pending_commits = max_pending_commits
+        self._pending_commits = 0
+        self._closed = threading.Event()
+        if commit_interval is not None:
+            threading.Thread(target=self._commit_loop, name="group-commit", daemon=True).start()
+
+    def _commit(self):
+        """Commit a store's write (caller holds the lock), or queue it for group commit."""
+        if self._transaction_depth:
+            return
+        if self.commit_interval is None:
+            self._conn.commit()
+            return
+
+        self._pending_commits += 1
+        if self._pending_commits >= self.max_pending_commits:
+            self._conn.commit()
+            self._pending_commits = 0
+
+    def flush(self):
+        """Commit any writes waiting for group commit."""
+        with self._lock:
+            if self._pending_commits and not self._transaction_depth:
+                self._conn.commit()
+                self._pending_commits = 0
+
+    def _commit_loop(self):
+        while not self._closed.wait(self.commit_interval):
+            self.flush()
+
+    def _acquire(self):
+        self._lock.acquire()
+        self._holder.depth = getattr(self._holder, "depth", 0) + 1
+
+    def _release(self):
+        self._holder.depth -= 1
+        self._lock.release()
+
+    def held(self) -> bool:
+        """Whether the calling thread holds the connection (a lease or a transaction)."""
+        return getattr(self._holder, "depth", 0) > 0
+
+    def lease(self) -> "_ConnectionLease":
+        """Borrow the connection for one store call (released by close())."""
+        return _ConnectionLease(self)
+
+    @contextmanager
+    def transaction(self):
+        """Defer commits from every store until the block exits."""
+        self._acquire()
+        try:
+            self._transaction_depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._transaction_depth -= 1
+                if self._transaction_depth == 0:
+                    self._conn.rollback()
+                raise
+            self._transaction_depth -= 1
+            if self._transaction_depth == 0:
+                self._conn.commit()
+                self._pending_commits = 0
+        finally:
+            self._release()
+
+    def close(self):
+        """Commit pending writes and close the underlying connection."""
+        self._closed.set()
+        self.flush()
+        self._conn.close()
+
+
+class _ConnectionLease:
+    """
+    Connection-like handle whose close() releases, not closes, the shared
+    connection. Callers close it in a ``finally`` block: the lock is
+    reentrant and owned by the leasing thread, so it cannot be released
+    from a finalizer running on another thread.
+    """
+
+    def __init__(self, shared: SharedConnection):
+        self._shared = shared
+        self._released = True
+        self._shared._acquire()
+        self._released = False
+
+    def cursor(self) -> sqlite3.Cursor:
+        return self._shared._conn.cursor()
+
+    def execute(self, sql: str, params=()) -> sqlite3.Cursor:
+        return self._shared._conn.execute(sql, params)
+
+    def commit(self):
+        self._shared._commit()
+
+    def executescript(self, sql: str) -> sqlite3.Cursor:
+        """Run a script; like sqlite3's, it first commits pending writes."""
+        if self._shared._transaction_depth:
+            raise RuntimeError("executescript() would commit the open transaction()")
+        self._shared._pending_commits = 0
+        return self._shared._conn.executescript(sql)
+
+    def create_function(self, *args, **kwargs):
+        self._shared._conn.create_function(*args, **kwargs)
+
+    def close(self):
+        if not self._released:
+            self._released = True
+            self._shared._release()
+
+
+class ContentCodec:
+    """
+    Per-row compression of stored text.
+
+    Rows shorter than ``min_size`` bytes, or that would not shrink, stay
+    plain TEXT; the rest become a zlib or zstd BLOB (zstd needs the
+    ``zstandard`` package). A dictionary trained on a store's own rows lets
+    short rows compress too. Each row records its codec and dictionary id,
+    so a codec with ``algorithm=None`` still reads compressed rows.
+    """
+
+    PLAIN, ZLIB, ZSTD = 0, 1, 2
+    ALGORITHMS = {"zlib": ZLIB, "zstd": ZSTD}
+    DEFAULT_LEVELS = {ZLIB: 6, ZSTD: 3}
+
+    def __init__(self, algorithm: Optional[str] = None, level: Optional[int] = None, min_size: int = 64):
+        if algorithm is not None and algorithm not in self.ALGORITHMS:
+            raise ValueError(f"Unknown compression {algorithm!r}; use one of {list(self.ALGORITHMS)}")
+        self.algorithm = algorithm
+        self.flag = self.ALGORITHMS.get(algorithm, self.PLAIN)
+        if self.flag == self.ZSTD:
+            self._zstd()
+        self.level = level if level is not None else self.DEFAULT_LEVELS.get(self.flag)
+        self.min_size = min_size
+
+        # Dictionaries by id; dict_id is the one new rows are written with
+        self.dictionaries: Dict[int, bytes] = {}
+        self.dict_id: Optional[int] = None
+        self._zstd_dicts: Dict[int, Any] = {}
+
+    @staticmethod
+    def _zstd():
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError("zstd compression requires the 'zstandard' package") from None
+        return zstandard
+
+    def compress(self, text: str) -> Tuple[Any, int, Optional[int]]:
+        """Encode ``text`` for storage: (value, codec flag, dictionary id)."""
+        raw = text.encode("utf-8")
+        if self.flag == self.PLAIN or len(raw) < self.min_size:
+            return text, self.PLAIN, None
+
+        if self.flag == self.ZLIB:
+            if self.dict_id is None:
+                data = zlib.compress(raw, self.level)
+            else:
+                compressor = zlib.compressobj(self.level, zdict=self.dictionaries[self.dict_id])
+                data = compressor.compress(raw) + compressor.flush()
+        else:
+            data = self._zstd().ZstdCompressor(
+                level=self.level,
+                dict_data=self._zstd_dict(self.dict_id)
+            ).compress(raw)
+
+        if len(data) >= len(raw):
+            return text, self.PLAIN, None
+        return data, self.flag, self.dict_id
+
+    def decompress(self, value: Any, flag: int, dict_id: Optional[int]) -> str:
+        """Text of a stored row."""
+        if not flag:
+            return value
+
+        if flag == self.ZLIB:
+            if dict_id is None:
+                raw = zlib.decompress(value)
+            else:
+                raw = zlib.decompressobj(zdict=self.dictionaries[dict_id]).decompress(value)
+        else:
+            raw = self._zstd().ZstdDecompressor(dict_data=self._zstd_dict(dict_id)).decompress(value)
+        return raw.decode("utf-8")
+
+    def _zstd_dict(self, dict_id: Optional[int]):
+        if dict_id is None:
+            return None
+        if dict_id not in self._zstd_dicts:
+            self._zstd_dicts[dict_id] = self._zstd().ZstdCompressionDict(self.dictionaries[dict_id])
+        return self._zstd_dicts[dict_id]
+
+    def train(self, samples: List[str], size: int = 16384) -> bytes:
+        """Build a dictionary for this codec's algorithm from sample rows."""
+        encoded = [sample.encode("utf-8") for sample in samples]
+        if self.flag == self.ZSTD:
+            return self._zstd().train_dictionary(size, encoded).as_bytes()
+
+        # zlib takes any bytes as a preset dictionary: use the substrings
+        # that save the most (frequency x length), best ones last because
+        # zlib encodes nearer matches more cheaply
+        counts = Counter(
+            token for sample in encoded for token in re.findall(rb"\S+\s?", sample)
+        )
+        ranked = sorted(
+            (token for token, count in counts.items() if count > 1),
+            key=lambda token: counts[token] * len(token),
+            reverse=True
+        )
+        chosen, total = [], 0
+        for token in ranked:
+            if total + len(token) > size:
+                break
+            chosen.append(token)
+            total += len(token)
+        return b"".join(reversed(chosen))
+
+
+class SQLiteStore:
+    """
+    Base for SQLite-backed stores: per-call connections or a SharedConnection.
+
+    Subclasses may also keep trigger-maintained counters in the
+    ``memory_stats`` table (one row per store and key), so counts never need
+    a table scan. They set ``STATS_STORE``, ``STATS_TRIGGERS`` and
+    ``STATS_RECOUNT_SQL`` (a query yielding ``(key, value)`` rows that
+    recomputes every counter exactly), and call ``_init_stats`` from
+    ``_init_database``.
+
+    Every store also logs its mutations to ``memory_changes``: triggers on
+    ``CHANGE_TABLE`` append one row per inserted, updated (in one of
+    ``CHANGE_COLUMNS``, or any column if None) or deleted row, numbered by
+    an ever-increasing ``seq``. ``changes_since`` / ChangeFeed tail it.
+
+    Stores whose text may be compressed set ``CONTENT_TABLE``, a table with
+    ``content``, ``compressed`` and ``dict_id`` columns, and call
+    ``_init_compression``. Queries read the text through ``_text_sql()``,
+    which decompresses compressed rows with a SQL function registered on
+    every connection, so LIKE filters still see plain text.
+    """
+
+    STATS_STORE: Optional[str] = None
+    STATS_TRIGGERS: List[str] = []
+    STATS_RECOUNT_SQL: Optional[str] = None
+    CHANGE_TABLE: Optional[str] = None
+    CHANGE_COLUMNS: Optional[List[str]] = None
+    CONTENT_TABLE: Optional[str] = None
+
+    def __init__(
+        self,
+        db_path: str,
+        connection: Optional[SharedConnection] = None,
+        compression: Optional[str] = None
+    ):
+        self.db_path = connection.db_path if connection is not None else db_path
+        self.connection = connection
+        self.codec = ContentCodec(compression)
+
+    def _connect(self):
+        """Open a connection for one call; callers close() it when done."""
+        if self.connection is not None:
+            conn = self.connection.lease()
+        else:
+            conn = sqlite3.connect(self.db_path)
+        if self.CONTENT_TABLE:
+            conn.create_function(
+                f"{self.CONTENT_TABLE}_text", 3, self._decompress_content, deterministic=True
+            )
+        return conn
+
+    @staticmethod
+    def _stats_delta(store: str, key_sql: str, delta_sql: str) -> str:
+        """SQL for a trigger step that adds ``delta_sql`` to one counter."""
+        return f"""
+            INSERT INTO memory_stats (store, key, value)
+            VALUES ('{store}', {key_sql}, {delta_sql})
+            ON CONFLICT (store, key) DO UPDATE SET value = value + excluded.value;
+        """
+
+    def _init_stats(self, cursor: sqlite3.Cursor):
+        """Create the stats table and triggers, seeding counters if missing."""
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS memory_stats (
+                store TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value REAL NOT NULL DEFAULT 0,
+                PRIMARY KEY (store, key)
+            )
+        """)
+
+        for trigger_sql in self.STATS_TRIGGERS:
+            cursor.execute(trigger_sql)
+
+        cursor.execute("""
+            SELECT 1 FROM memory_stats WHERE store = ? AND key = 'count'
+        """, (self.STATS_STORE,))
+        if cursor.fetchone() is None:
+            # New table, or a database created before counters existed
+            self._write_stats(cursor, self._recount_stats(cursor))
+
+    def _init_change_log(self, cursor: sqlite3.Cursor):
+        """Create the change log and this store's logging triggers."""
+        # AUTOINCREMENT: seq never goes back, even after pruning
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS memory_changes (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                store TEXT NOT NULL,
+                op TEXT NOT NULL,
+                row_id TEXT NOT NULL,
+                changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_memory_changes_store
+            ON memory_changes(store, seq)
+        """)
+
+        table, store = self.CHANGE_TABLE, self.STATS_STORE
+        columns = f" OF {', '.join(self.CHANGE_COLUMNS)}" if self.CHANGE_COLUMNS else ""
+        for event, op, row in (("INSERT", "insert", "new"), ("UPDATE", "update", "new"), ("DELETE", "delete", "old")):
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {table}_log_{op}
+                AFTER {event}{columns if event == "UPDATE" else ""} ON {table} BEGIN
+                    INSERT INTO memory_changes (store, op, row_id) VALUES ('{store}', '{op}', {row}.id);
+                END
+            """)
+
+    def changes_since(self, seq: int = 0, limit: int = 1000) -> List[Dict[str, Any]]:
+        """This store's logged changes after ``seq``, oldest first."""
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+
+            cursor.execute("""
+                SELECT seq, op, row_id, changed_at FROM memory_changes
+                WHERE store = ? AND seq > ?
+                ORDER BY seq LIMIT ?
+            """, (self.STATS_STORE, seq, limit))
+            rows = cursor.fetchall()
+        finally:
+            conn.close()
+
+        return [
+            {"seq": row[0], "store": self.STATS_STORE, "op": row[1], "id": row[2], "changed_at": row[3]}
+            for row in rows
+        ]
+
+    def prune_changes(self, up_to_seq: int) -> int:
+        """Drop this store's log entries up to ``up_to_seq`` (every consumer has applied them)."""
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+
+            cursor.execute("""
+                DELETE FROM memory_changes WHERE store = ? AND seq <= ?
+            """, (self.STATS_STORE, up_to_seq))
+            pruned = cursor.rowcount
+
+            conn.commit()
+        finally:
+            conn.close()
+        return pruned
+
+    def _recount_stats(self, cursor: sqlite3.Cursor) -> Dict[str, float]:
+        """Recompute every counter with full aggregate scans."""
+        cursor.execute(self.STATS_RECOUNT_SQL)
+        return {key: value for key, value in cursor.fetchall()}
+
+    def _write_stats(self, cursor: sqlite3.Cursor, stats: Dict[str, float]):
+        """Replace this store's counters."""
+        cursor.execute("DELETE FROM memory_stats WHERE store = ?", (self.STATS_STORE,))
+        cursor.executemany("""
+            INSERT INTO memory_stats (store, key, value) VALUES (?, ?, ?)
+        """, [(self.STATS_STORE, key, value) for key, value in stats.items()])
+
+    def _read_stats(self) -> Dict[str, float]:
+        """Read this store's counters (one indexed range read)."""
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+
+            cursor.execute("""
+                SELECT key, value FROM memory_stats WHERE store = ? AND value != 0
+            """, (self.STATS_STORE,))
+            stats = dict(cursor.fetchall())
+
+        finally:
+            conn.close()
+        return stats
+
+    def verify_stats(self) -> bool:
+        """
+        Recount exactly and compare with the maintained counters.
+        Returns True if they matched; otherwise the counters are rewritten.
+        """
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+
+            exact = {key: value for key, value in self._recount_stats(cursor).items() if value != 0}
+            cursor.execute("""
+                SELECT key, value FROM memory_stats WHERE store = ? AND value != 0
+            """, (self.STATS_STORE,))
+            stored = dict(cursor.fetchall())
+
+            matched = exact.keys() == stored.keys() and all(
+                abs(exact[key] - stored[key]) < 1e-6 for key in exact
+            )
+            if not matched:
+                self._write_stats(cursor, exact)
+                conn.commit()
+
+        finally:
+            conn.close()
+        return matched
+
+    @staticmethod
+    def _group_stats(stats: Dict[str, float], prefix: str) -> Dict[str, int]:
+        """Collect ``prefix<name>`` counters into {name: count}."""
+        return {
+            key[len(prefix):]: int(value)
+            for key, value in stats.items()
+            if key.startswith(prefix)
+        }
+
+    def _init_compression(self, cursor: sqlite3.Cursor):
+        """Add the compression columns and load this store's dictionaries."""
+        cursor.execute(f"PRAGMA table_info({self.CONTENT_TABLE})")
+        columns = [row[1] for row in cursor.fetchall()]
+        if "compressed" not in columns:
+            cursor.execute(
+                f"ALTER TABLE {self.CONTENT_TABLE} ADD COLUMN compressed INTEGER NOT NULL DEFAULT 0"
+            )
+        if "dict_id" not in columns:
+            cursor.execute(f"ALTER TABLE {self.CONTENT_TABLE} ADD COLUMN dict_id INTEGER")
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS compression_dicts (
+                id INTEGER PRIMARY KEY,
+                store TEXT NOT NULL,
+                algorithm TEXT NOT NULL,
+                data BLOB NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        self._load_dictionaries(cursor)
+
+    def _load_dictionaries(self, cursor: sqlite3.Cursor):
+        cursor.execute("""
+            SELECT id, algorithm, data FROM compression_dicts WHERE store = ? ORDER BY id
+        """, (self.STATS_STORE,))
+        for dict_id, algorithm, data in cursor.fetchall():
+            self.codec.dictionaries[dict_id] = data
+            if algorithm == self.codec.algorithm:
+                self.codec.dict_id = dict_id
+
+    def _text_sql(self, alias: str = "") -> str:
+        """SQL expression for the plain text of a content row."""
+        prefix = f"{alias}." if alias else ""
+        return (
+            f"(CASE WHEN {prefix}compressed THEN {self.CONTENT_TABLE}_text("
+            f"{prefix}content, {prefix}compressed, {prefix}dict_id) ELSE {prefix}content END)"
+        )
+
+    def _compress_content(self, text: Optional[str]) -> Tuple[Any, int, Optional[int]]:
+        """Stored form of ``text``: (content, compressed, dict_id) column values."""
+        if text is None:
+            return None, ContentCodec.PLAIN, None
+        return self.codec.compress(text)
+
+    def _decompress_content(self, value: Any, compressed: int, dict_id: Optional[int]) -> str:
+        if dict_id is not None and dict_id not in self.codec.dictionaries:
+            # Trained by another process since this store was opened
+            conn = sqlite3.connect(self.db_path)
+            self._load_dictionaries(conn.cursor())
+            conn.close()
+        return self.codec.decompress(value, compressed, dict_id)
+
+    def train_compression_dictionary(self, sample_size: int = 1000, dict_size: int = 16384) -> int:
+        """
+        Train a dictionary on the most recent ``sample_size`` rows and use it
+        for rows written from now on. Earlier rows keep the dictionary they
+        were written with; ``recompress_content`` rewrites them.
+        """
+        if self.codec.algorithm is None:
+            raise ValueError("store was opened without compression")
+
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+
+            cursor.execute(f"""
+                SELECT {self._text_sql()} FROM {self.CONTENT_TABLE}
+                WHERE content IS NOT NULL
+                ORDER BY rowid DESC LIMIT ?
+            """, (sample_size,))
+            samples = [row[0] for row in cursor.fetchall()]
+            dictionary = self.codec.train(samples, dict_size)
+
+            cursor.execute("""
+                INSERT INTO compression_dicts (store, algorithm, data) VALUES (?, ?, ?)
+            """, (self.STATS_STORE, self.codec.algorithm, dictionary))
+            dict_id = cursor.lastrowid
+            conn.commit()
+        finally:
+            conn.close()
+
+        self.codec.dictionaries[dict_id] = dictionary
+        self.codec.dict_id = dict_id
+        return dict_id
+
+    def recompress_content(self, batch_size: int = 500) -> int:
+        """
+        Rewrite every row with the current codec and dictionary, one short
+        transaction per batch. Returns the number of rows rewritten.
+        """
+        rewritten = 0
+        last_rowid = 0
+        while True:
+            conn = self._connect()
+            try:
+                cursor = conn.cursor()
+
+                cursor.execute(f"""
+                    SELECT rowid, {self._text_sql()}, compressed, dict_id FROM {self.CONTENT_TABLE}
+                    WHERE rowid > ? AND content IS NOT NULL
+                    ORDER BY rowid LIMIT ?
+                """, (last_rowid, batch_size))
+                rows = cursor.fetchall()
+
+                updates = []
+                for rowid, text, compressed, dict_id in rows:
+                    content, new_compressed, new_dict_id = self._compress_content(text)
+                    if (new_compressed, new_dict_id) != (compressed, dict_id):
+                        updates.append((content, new_compressed, new_dict_id, rowid))
+                cursor.executemany(f"""
+                    UPDATE {self.CONTENT_TABLE} SET content = ?, compressed = ?, dict_id = ?
+                    WHERE rowid = ?
+                """, updates)
+
+                conn.commit()
+            finally:
+                conn.close()
+
+            rewritten += len(updates)
+            if len(rows) < batch_size:
+                return rewritten
+            last_rowid = rows[-1][0]
+
+
+class ChangeFeed:
+    """
+    Consumer position in one store's change log.
+
+    ``poll`` returns the next changes after the checkpoint; ``ack`` moves
+    the checkpoint once they are applied (and saves it to
+    ``checkpoint_path`` if given), so a restarted consumer resumes where it
+    stopped and sees every change at least once.
+    """
+
+    def __init__(self, store: SQLiteStore, checkpoint: int = 0, checkpoint_path: Optional[str] = None):
+        self.store = store
+        self.checkpoint_path = Path(checkpoint_path) if checkpoint_path else None
+        if self.checkpoint_path is not None and self.checkpoint_path.exists():
+            checkpoint = json.loads(self.checkpoint_path.read_text())["seq"]
+        self.checkpoint = checkpoint
+
+    def poll(self, limit: int = 1000) -> List[Dict[str, Any]]:
+        return self.store.changes_since(self.checkpoint, limit)
+
+    def ack(self, seq: int):
+        self.checkpoint = seq
+        if self.checkpoint_path is not None:
+            self.checkpoint_path.write_text(json.dumps({"seq": seq}))
@@ -0,0 +1,243 @@
+"""Multi-tier (working / recent / long-term) memory system."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from enum import Enum
+from itertools import count
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .embedders import Embedder, EmbeddingQueue
+from .lazy import numpy as np
+from .persistent import PersistentMemoryStore
+from .records import AccessCounter, MemoryRecord, MemoryView, ReadWriteLock, _NoLock
+
+
+# =============================================================================
+# 5. MULTI-TIER MEMORY SYSTEM (Hierarchical)
+# =============================================================================
+
+class MemoryTier(Enum):
+    WORKING = "working"      # Current session, fast access
+    RECENT = "recent"        # Last few sessions
+    LONG_TERM = "long_term"  # Persistent storage
+
+
+class MultiTierMemorySystem:
+    """
+    Hierarchical memory system with multiple tiers.
+    Automatically moves memories between tiers based on access patterns.
+
+    Consolidation swaps in new tier lists rather than editing them, so
+    ``retrieve`` reads the tiers without locking; ``thread_safe=True``
+    serializes adds and consolidation. Access counts are batched.
+
+    With an ``embedder``, working memories added without an embedding are
+    embedded in the background; one consolidated before its embedding
+    arrives gets it in the long-term store when the job finishes, so it is
+    embedded only once. ``close`` waits for those jobs.
+    """
+
+    WORKING_KEYS = ("id", "content", "memory_type", "embedding", "metadata", "created_at", "access_count")
+    RECENT_KEYS = ("id", "content", "memory_type", "metadata", "created_at", "access_count")
+
+    def __init__(
+        self,
+        long_term_db: str = "agent_memory.db",
+        thread_safe: bool = False,
+        embedder: Optional[Embedder] = None
+    ):
+        self._working: List[MemoryRecord] = []
+        self._recent: List[MemoryRecord] = []
+        self.long_term = PersistentMemoryStore(long_term_db, embedder=embedder)
+        self.embedding_queue = (
+            EmbeddingQueue(embedder, self._apply_embeddings) if embedder is not None else None
+        )
+        # Records whose embedding is still being computed, keyed by a job
+        # token: record ids are not unique within a second, and id(record)
+        # can be reused by a new record once the old one is dropped. The
+        # value is the record while it is in the working tier, then its
+        # long-term content hash once consolidated.
+        self._awaiting_embedding: Dict[int, Union[MemoryRecord, str]] = {}
+        self._embed_tokens = count()
+        self._lock = ReadWriteLock() if thread_safe else _NoLock()
+        self._access = AccessCounter()
+
+        # Tier limits
+        self.max_working = 20
+        self.max_recent = 100
+
+    @property
+    def working_memory(self) -> List[MemoryView]:
+        """Working-tier memories, as dict-style views."""
+        return [MemoryView(record, self.WORKING_KEYS) for record in self._working]
+
+    @property
+    def recent_memory(self) -> List[MemoryView]:
+        """Recent-tier memories, as dict-style views."""
+        return [MemoryView(record, self.RECENT_KEYS) for record in self._recent]
+
+    def add_to_working(
+        self,
+        content: str,
+        memory_type: str = "general",
+        embedding: Optional[np.ndarray] = None,
+        metadata: Dict[str, Any] = None
+    ) -> str:
+        """Add memory to working memory (fastest tier)."""
+        with self._lock.write():
+            record = MemoryRecord(
+                f"work_{len(self._working)}_{int(datetime.now().timestamp())}",
+                content,
+                access_count=1,
+                memory_type=memory_type,
+                embedding=embedding,
+                metadata=metadata or None
+            )
+
+            self._working.append(record)
+            token = None
+            if embedding is None and self.embedding_queue is not None:
+                token = next(self._embed_tokens)
+                self._awaiting_embedding[token] = record
+
+            # Move to recent if working memory is full
+            if len(self._working) > self.max_working:
+                self._consolidate_working_to_recent()
+
+        if token is not None:
+            self.embedding_queue.submit(token, content)
+        return record.id
+
+    def _apply_embeddings(self, embedded: List[Tuple[int, np.ndarray]]):
+        """
+        Attach background-computed embeddings to records still in the
+        working tier, and store those of consolidated records long-term.
+        """
+        consolidated = []
+        with self._lock.write():
+            for key, vector in embedded:
+                target = self._awaiting_embedding.pop(key, None)
+                if isinstance(target, str):
+                    consolidated.append((target, vector))
+                elif target is not None:
+                    target.embedding = vector
+        if consolidated:
+            self.long_term._apply_embeddings(consolidated)
+
+    def flush_embeddings(self, timeout: Optional[float] = None) -> bool:
+        """Wait for working-tier and long-term embeddings; False on timeout."""
+        flushed = self.embedding_queue.flush(timeout) if self.embedding_queue is not None else True
+        return self.long_term.flush_embeddings(timeout) and flushed
+
+    def flush_access_counts(self):
+        """Apply pending access_count increments."""
+        self._access.flush()
+
+    def close(self):
+        """Finish queued embeddings and stop the background embedding workers."""
+        if self.embedding_queue is not None:
+            self.embedding_queue.close()
+        if self.long_term.embedding_queue is not None:
+            self.long_term.embedding_queue.close()
+        self.flush_access_counts()
+
+    def _consolidate_working_to_recent(self):
+        """Move old working memories to recent. Caller holds the write lock."""
+        # Move oldest half to recent
+        to_move = self._working[:self.max_working // 2]
+        self._working = self._working[self.max_working // 2:]
+
+        # Every record in to_move is alive here, so their ids are distinct
+        moving = set(map(id, to_move))
+        pending_tokens = {
+            id(record): token
+            for token, record in self._awaiting_embedding.items()
+            if not isinstance(record, str) and id(record) in moving
+        }
+
+        recent = list(self._recent)
+        for record in to_move:
+            # Store embedding in long-term, keep metadata in recent; a
+            # pending embedding job is redirected to the long-term blob
+            # instead of being queued again there
+            token = pending_tokens.get(id(record))
+            if record.embedding is not None or token is not None:
+                self.long_term.add(
+                    record.content,
+                    record.memory_type,
+                    record.embedding,
+                    record.metadata,
+                    queue_embedding=token is None
+                )
+            if token is not None:
+                self._awaiting_embedding[token] = self.long_term.content_hash(record.content)
+
+            # Move to recent (without embedding to save memory)
+            record.embedding = None
+            recent.append(record)
+
+        # Trim recent if needed
+        self._recent = recent[-self.max_recent:]
+
+    def retrieve(
+        self,
+        query: str,
+        query_embedding: Optional[np.ndarray] = None,
+        top_k: int = 5
+    ) -> List[Dict[str, Any]]:
+        """Retrieve memories from all tiers."""
+        results = []
+        query_lower = query.lower()
+
+        # Search working memory (keyword match)
+        for record in self._working:
+            if query_lower in record.content.lower():
+                self._access.hit(record)
+                results.append({**MemoryView(record, self.WORKING_KEYS), "tier": "working"})
+
+        # Search recent memory (keyword match)
+        for record in self._recent:
+            if query_lower in record.content.lower():
+                self._access.hit(record)
+                results.append({**MemoryView(record, self.RECENT_KEYS), "tier": "recent"})
+
+        # Search long-term (semantic if embedding provided, else keyword)
+        if query_embedding is not None:
+            similar = self.long_term.search_similar(query_embedding, top_k)
+            for memory, similarity in similar:
+                memory["tier"] = "long_term"
+                memory["similarity"] = similarity
+                results.append(memory)
+        else:
+            keyword_results = self.long_term.search(query, limit=top_k)
+            for memory in keyword_results:
+                memory["tier"] = "long_term"
+                results.append(memory)
+
+        # Sort by relevance and return top-k
+        results.sort(key=lambda x: x.get("similarity", x.get("access_count", 0)), reverse=True)
+        return results[:top_k]
+
+    def get_context(self, max_tokens: int = 2000) -> str:
+        """Get context from working memory for LLM."""
+        context_parts = []
+        total_tokens = 0
+
+        for record in self._working:
+            tokens = len(record.content) // 4  # Rough estimate
+            if total_tokens + tokens > max_tokens:
+                break
+            context_parts.append(record.content)
+            total_tokens += tokens
+
+        return "\n\n".join(context_parts)
+
+    def consolidate_all(self):
+        """Force consolidation of all memories to appropriate tiers."""
+        with self._lock.write():
+            while len(self._working) > 0:
+                self._consolidate_working_to_recent()
+
+            # Clear recent (all in long-term now)
+            self._recent = []
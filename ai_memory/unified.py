@@ -0,0 +1,310 @@
+"""Unified memory system combining every memory type."""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .conversation import ConversationMemory
+from .embedders import Embedder
+from .episodic import EpisodicMemory
+from .lazy import numpy as np
+from .metrics import MemoryMetrics
+from .persistent import PersistentMemoryStore
+from .procedural import ProceduralMemory
+from .semantic import SemanticMemory
+from .snapshots import export_snapshot, import_snapshot
+from .sqlite_store import SharedConnection
+
+
+# =============================================================================
+# 10. UNIFIED MEMORY SYSTEM (All-in-One)
+# =============================================================================
+
+class UnifiedMemorySystem:
+    """
+    Complete memory system combining episodic, semantic, and procedural memory.
+    Provides a unified interface for all memory operations.
+
+    With ``single_database=True`` all stores share one connection to
+    ``memory.db`` (WAL mode) instead of four files, which enables
+    cross-store SQL and ``transaction()`` for one commit per agent step.
+    ``commit_interval`` turns on group commit for that connection.
+    ``compression`` ("zlib" or "zstd") compresses episode and memory text.
+    Pass a MemoryMetrics as ``metrics`` to instrument every store and the
+    system's own operations, and an Embedder as ``embedder`` to embed
+    episodes and memories stored without an embedding in the background.
+    ``cache_size`` sizes the vector store's read cache (see
+    ``PersistentMemoryStore``); 0 disables it.
+    """
+
+    def __init__(
+        self,
+        base_path: str = "./agent_memory",
+        single_database: bool = False,
+        commit_interval: Optional[float] = None,
+        compression: Optional[str] = None,
+        metrics: Optional[MemoryMetrics] = None,
+        embedder: Optional[Embedder] = None,
+        cache_size: int = 0
+    ):
+        self.base_path = Path(base_path)
+        self.base_path.mkdir(exist_ok=True)
+
+        self.connection: Optional[SharedConnection] = None
+        if single_database:
+            self.connection = SharedConnection(
+                str(self.base_path / "memory.db"),
+                commit_interval=commit_interval
+            )
+
+        # Initialize all memory types
+        self.episodic = EpisodicMemory(
+            str(self.base_path / "episodic.db"), self.connection, compression, embedder=embedder
+        )
+        self.semantic = SemanticMemory(str(self.base_path / "semantic.db"), self.connection)
+        self.procedural = ProceduralMemory(str(self.base_path / "procedural.db"), self.connection)
+        self.vector_store = PersistentMemoryStore(
+            str(self.base_path / "vectors.db"), self.connection, compression,
+            cache_size=cache_size, embedder=embedder
+        )
+
+        # Conversation memory (ephemeral)
+        self.conversation = ConversationMemory()
+
+        self.metrics = metrics
+        if metrics is not None:
+            metrics.instrument(self.episodic, "episodic")
+            metrics.instrument(self.semantic, "semantic")
+            metrics.instrument(self.procedural, "procedural")
+            metrics.instrument(self.vector_store, "vector_store")
+            metrics.instrument(self, "unified")
+
+    def remember_episode(
+        self,
+        event_type: str,
+        content: str,
+        participants: List[str] = None,
+        outcome: str = None,
+        embedding: np.ndarray = None
+    ) -> str:
+        """Store an episodic memory."""
+        return self.episodic.record_episode(
+            event_type=event_type,
+            participants=participants or [],
+            content=content,
+            outcome=outcome,
+            embedding=embedding
+        )
+
+    def learn_fact(
+        self,
+        fact: str,
+        categories: List[str] = None,
+        confidence: float = 0.5
+    ) -> str:
+        """Learn a semantic fact."""
+        return self.semantic.learn_fact(
+            fact=fact,
+            categories=categories,
+            confidence=confidence
+        )
+
+    def learn_procedure(
+        self,
+        name: str,
+        description: str,
+        steps: List[str],
+        embedding: np.ndarray = None
+    ) -> str:
+        """Learn a procedure."""
+        return self.procedural.learn_procedure(
+            name=name,
+            description=description,
+            steps=steps,
+            embedding=embedding
+        )
+
+    def recall(
+        self,
+        query: str,
+        query_embedding: np.ndarray = None,
+        top_k: int = 5,
+        timeout: Optional[float] = None
+    ) -> Dict[str, List]:
+        """
+        Recall memories from all systems.
+
+        The four stores are queried concurrently, so latency is bounded by the
+        slowest store rather than their sum. With ``timeout`` (seconds), stores
+        that have not answered by the deadline are listed under ``timed_out``
+        and the partial results are returned. A store that raises contributes
+        no results and its exception is reported under ``failed``, keyed by
+        store. ``ranked`` merges every hit into one list of
+        ``{"source", "score", "memory"}`` sorted by score.
+
+        Each call gets its own worker threads, so a store still running after
+        an earlier call timed out does not hold up later recalls.
+
+        Inside ``transaction()`` this thread holds the shared connection,
+        which worker threads would wait on forever, so the stores are
+        queried one after another on this thread and ``timeout`` is not
+        applied.
+        """
+        searches = {
+            "episodic": lambda: self.episodic.search_episodes(
+                query, query_embedding, limit=top_k
+            ),
+            "semantic": lambda: self.semantic.search_facts(query, limit=top_k),
+            "procedural": lambda: self.procedural.find_procedures(
+                query, top_k=top_k, task_embedding=query_embedding
+            ),
+            "vector": lambda: (
+                self.vector_store.search_similar(query_embedding, top_k=top_k)
+                if query_embedding is not None
+                else self.vector_store.search(query, limit=top_k)
+            )
+        }
+        results: Dict[str, Any] = {source: [] for source in searches}
+        failed = {}
+        if self.connection is not None and self.connection.held():
+            for source, search in searches.items():
+                try:
+                    results[source] = search()
+                except Exception as e:
+                    failed[source] = e
+            results["timed_out"] = []
+            results["failed"] = failed
+            results["ranked"] = self._rank_recall_results(results)
+            return results
+
+        executor = ThreadPoolExecutor(max_workers=len(searches), thread_name_prefix="recall")
+        try:
+            futures = {executor.submit(search): source for source, search in searches.items()}
+            done, not_done = wait(futures, timeout=timeout)
+        finally:
+            # Stragglers finish in the background; nothing waits on them
+            executor.shutdown(wait=False)
+
+        for future in done:
+            source = futures[future]
+            try:
+                results[source] = future.result()
+            except Exception as e:
+                failed[source] = e
+
+        results["timed_out"] = sorted(futures[future] for future in not_done)
+        results["failed"] = failed
+        results["ranked"] = self._rank_recall_results(results)
+        return results
+
+    def _rank_recall_results(self, results: Dict[str, List]) -> List[Dict[str, Any]]:
+        """Merge per-store recall results into one list ordered by score."""
+        ranked = []
+
+        for episode in results["episodic"]:
+            ranked.append({
+                "source": "episodic",
+                "score": episode.get("similarity", episode["importance"]),
+                "memory": episode
+            })
+
+        for fact in results["semantic"]:
+            ranked.append({"source": "semantic", "score": fact["confidence"], "memory": fact})
+
+        for procedure in results["procedural"]:
+            ranked.append({"source": "procedural", "score": procedure["score"], "memory": procedure})
+
+        for item in results["vector"]:
+            # search_similar yields (memory, similarity); keyword search yields memories
+            if isinstance(item, tuple):
+                memory, score = item
+            else:
+                memory, score = item, item["importance"]
+            ranked.append({"source": "vector", "score": float(score), "memory": memory})
+
+        ranked.sort(key=lambda x: x["score"], reverse=True)
+        return ranked
+
+    @contextmanager
+    def transaction(self):
+        """
+        Commit every episode, fact, procedure and memory written inside the
+        block atomically, in one commit. Requires ``single_database=True``.
+        """
+        if self.connection is None:
+            raise RuntimeError("transaction() requires single_database=True")
+        with self.connection.transaction():
+            yield self
+
+    def changes_since(
+        self,
+        checkpoints: Optional[Dict[str, int]] = None,
+        limit: int = 1000
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Logged changes per store ("episodes", "facts", "procedures", "memories") after each checkpoint."""
+        checkpoints = checkpoints or {}
+        return {
+            store.STATS_STORE: store.changes_since(checkpoints.get(store.STATS_STORE, 0), limit)
+            for store in (self.episodic, self.semantic, self.procedural, self.vector_store)
+        }
+
+    def export_snapshot(self, path: str, since: Optional[str] = None) -> Dict[str, Any]:
+        """Write all stores to a columnar archive (see ``export_snapshot``)."""
+        return export_snapshot(self, path, since)
+
+    def import_snapshot(self, path: str) -> Dict[str, int]:
+        """Load an archive written by ``export_snapshot`` (see ``import_snapshot``)."""
+        return import_snapshot(self, path)
+
+    def close(self):
+        """Store queued embeddings, then close the shared connection."""
+        for store in (self.episodic, self.vector_store):
+            if store.embedding_queue is not None:
+                store.embedding_queue.close()
+        if self.connection is not None:
+            self.connection.close()
+
+    def get_conversation_context(self) -> str:
+        """Get current conversation context."""
+        return self.conversation.get_context()
+
+    def add_to_conversation(self, role: str, message: str):
+        """Add message to conversation."""
+        if role == "user":
+            self.conversation.add_user_message(message)
+        else:
+            self.conversation.add_assistant_message(message)
+
+    def get_memory_summary(self, exact: bool = False) -> Dict[str, Any]:
+        """
+        Get summary of all memory systems.
+
+        Counts come from trigger-maintained counters, so this is O(1) in the
+        number of memories. ``exact=True`` recounts every store, repairs any
+        drifted counter and reports whether all of them were already right
+        under ``counters_verified``.
+        """
+        summary = {}
+        if exact:
+            summary["counters_verified"] = all([
+                self.episodic.verify_stats(),
+                self.semantic.verify_stats(),
+                self.procedural.verify_stats(),
+                self.vector_store.verify_stats()
+            ])
+
+        episodic_stats = self.episodic.get_stats()
+        semantic_stats = self.semantic.get_stats()
+        summary.update({
+            "episodic_episodes": episodic_stats["total_episodes"],
+            "episodes_by_type": episodic_stats["by_type"],
+            "semantic_facts": semantic_stats["total_facts"],
+            "facts_by_category": semantic_stats["by_category"],
+            "procedural_count": self.procedural.get_stats()["total_procedures"],
+            "vector_memories": self.vector_store.get_stats()["total_memories"],
+            "conversation_messages": len(self.conversation.messages)
+        })
+        return summary
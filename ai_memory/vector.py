@@ -0,0 +1,515 @@
+"""Partitioned vector index and the in-memory vector store."""
+
+from __future__ import annotations
+
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from .lazy import numpy as np
+from .records import AccessCounter, MemoryRecord, MemoryView, ReadWriteLock, _NoLock
+
+
+# =============================================================================
+# VECTOR INDEX (Partitioned, Bitmap Pre-Filters)
+# =============================================================================
+
+class _VectorPartition:
+    """Vectors of one partition, with packed bitmaps over their positions."""
+
+    __slots__ = ("ids", "matrix", "size", "dead", "alive", "bitmaps", "values")
+
+    def __init__(self, dim: int):
+        self.ids: List[Optional[str]] = []
+        self.matrix = np.empty((0, dim), dtype='float32')
+        self.size = 0
+        self.dead = 0
+        self.alive = bytearray()
+        # (key, value) -> bitmap of positions whose metadata has key == value
+        self.bitmaps: Dict[Tuple[str, Any], bytearray] = {}
+        self.values: List[Tuple[Tuple[str, Any], ...]] = []
+
+    def append(self, item_id: str, unit: np.ndarray, values: Tuple[Tuple[str, Any], ...]) -> int:
+        position = self.size
+        if position == len(self.matrix):
+            capacity = max(64, 2 * position)
+            matrix = np.empty((capacity, self.matrix.shape[1]), dtype='float32')
+            matrix[:position] = self.matrix[:position]
+            self.matrix = matrix
+            for bitmap in (self.alive, *self.bitmaps.values()):
+                bitmap.extend(bytes(capacity // 8 - len(bitmap)))
+
+        self.matrix[position] = unit
+        self.ids.append(item_id)
+        self.values.append(values)
+        self.size += 1
+        self._set(self.alive, position)
+        for value in values:
+            bitmap = self.bitmaps.get(value)
+            if bitmap is None:
+                bitmap = self.bitmaps[value] = bytearray(len(self.alive))
+            self._set(bitmap, position)
+        return position
+
+    def remove(self, position: int):
+        self.alive[position >> 3] &= ~(1 << (position & 7)) & 0xFF
+        self.ids[position] = None
+        self.dead += 1
+
+    @staticmethod
+    def _set(bitmap: bytearray, position: int):
+        bitmap[position >> 3] |= 1 << (position & 7)
+
+    def candidates(self, filters: Dict[str, Any]) -> np.ndarray:
+        """Live positions matching every filter (ANDed bitmaps)."""
+        mask = np.frombuffer(self.alive, dtype=np.uint8)
+        for key, value in filters.items():
+            bitmap = self.bitmaps.get((key, value))
+            if bitmap is None:
+                return np.empty(0, dtype=np.int64)
+            mask = mask & np.frombuffer(bitmap, dtype=np.uint8)
+        return np.flatnonzero(np.unpackbits(mask, bitorder='little')[:self.size])
+
+
+class PartitionedVectorIndex:
+    """
+    Cosine-similarity index split into partitions (e.g. by memory_type).
+
+    Each partition holds its unit vectors in one matrix plus a packed bitmap
+    per value of the ``bitmap_keys`` metadata keys. A search only touches
+    the requested partitions, and metadata filters AND those bitmaps before
+    any vector is scored, so a selective filter costs in proportion to the
+    rows it matches. Removed items are tombstoned; a partition is compacted
+    once half of it is dead. Not thread-safe: callers serialize access.
+    """
+
+    def __init__(self, bitmap_keys: Tuple[str, ...] = ()):
+        self.bitmap_keys = tuple(bitmap_keys)
+        self._partitions: Dict[Any, _VectorPartition] = {}
+        self._location: Dict[str, Tuple[Any, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._location)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._location
+
+    def add(
+        self,
+        item_id: str,
+        vector: np.ndarray,
+        partition: Any = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ):
+        """Index ``item_id`` (replacing any earlier entry for it)."""
+        self.remove(item_id)
+
+        vector = np.asarray(vector, dtype='float32')
+        unit = vector / (np.linalg.norm(vector) + 1e-8)
+        values = tuple(
+            (key, metadata[key]) for key in self.bitmap_keys
+            if metadata and isinstance(metadata.get(key), (str, int, float, bool))
+        )
+
+        part = self._partitions.get(partition)
+        if part is None:
+            part = self._partitions[partition] = _VectorPartition(len(unit))
+        self._location[item_id] = (partition, part.append(item_id, unit, values))
+
+    def remove(self, item_id: str) -> bool:
+        location = self._location.pop(item_id, None)
+        if location is None:
+            return False
+        partition, position = location
+        part = self._partitions[partition]
+        part.remove(position)
+        if part.dead > 32 and part.dead * 2 > part.size:
+            self._compact(partition)
+        return True
+
+    def vectors(self, item_ids: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Unit vectors of ``item_ids`` (zero rows for ids not indexed) and a found mask."""
+        dim = next(iter(self._partitions.values())).matrix.shape[1] if self._partitions else 0
+        matrix = np.zeros((len(item_ids), dim), dtype='float32')
+        found = np.zeros(len(item_ids), dtype=bool)
+        for row, item_id in enumerate(item_ids):
+            location = self._location.get(item_id)
+            if location is not None:
+                matrix[row] = self._partitions[location[0]].matrix[location[1]]
+                found[row] = True
+        return matrix, found
+
+    def _compact(self, partition: Any):
+        old = self._partitions[partition]
+        part = self._partitions[partition] = _VectorPartition(old.matrix.shape[1])
+        for position, item_id in enumerate(old.ids[:old.size]):
+            if item_id is not None:
+                self._location[item_id] = (
+                    partition, part.append(item_id, old.matrix[position], old.values[position])
+                )
+
+    def search(
+        self,
+        query: np.ndarray,
+        top_k: int = 5,
+        partitions: Optional[List[Any]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        predicate=None
+    ) -> List[Tuple[str, float]]:
+        """
+        Top ``top_k`` (item_id, similarity) pairs, most similar first, within
+        ``partitions`` (all if None) whose metadata matches ``filters``
+        (bitmap keys only) and, if given, ``predicate(item_id)``.
+        """
+        filters = filters or {}
+        unindexed = set(filters) - set(self.bitmap_keys)
+        if unindexed:
+            raise ValueError(f"metadata keys {sorted(unindexed)} have no bitmap index")
+
+        query = np.asarray(query, dtype='float32')
+        query = query / (np.linalg.norm(query) + 1e-8)
+        keys = self._partitions if partitions is None else partitions
+
+        scored: List[Tuple[float, str]] = []
+        for key in keys:
+            part = self._partitions.get(key)
+            if part is None or part.size == part.dead:
+                continue
+            positions = part.candidates(filters)
+            if predicate is not None:
+                positions = np.array(
+                    [p for p in positions.tolist() if predicate(part.ids[p])], dtype=np.int64
+                )
+            if len(positions) == 0:
+                continue
+
+            if len(positions) == part.size:
+                sims = part.matrix[:part.size] @ query
+            else:
+                sims = part.matrix[positions] @ query
+            k = min(top_k, len(positions))
+            best = np.argpartition(-sims, k - 1)[:k]
+            scored.extend((float(sims[i]), part.ids[positions[i]]) for i in best.tolist())
+
+        scored.sort(key=lambda x: x[0], reverse=True)
+        return [(item_id, sim) for sim, item_id in scored[:top_k]]
+
+
+# =============================================================================
+# 3. VECTOR MEMORY STORE (For Semantic Search)
+# =============================================================================
+
+class VectorMemoryStore:
+    """
+    Memory store with vector embeddings for semantic search.
+    Uses cosine similarity for finding related memories.
+
+    The record list is append-only, so searches read it without locking;
+    ``thread_safe=True`` serializes writers. Access counts are batched.
+
+    With ``graph_k`` the store also keeps an exact k-nearest-neighbour
+    graph: each add computes the new memory's neighbours with one
+    matrix-vector product and patches it into the lists of the memories it
+    displaces, so ``find_similar_memories`` reads a precomputed list instead
+    of scanning. ``rebuild_graph`` recomputes it in bulk and
+    ``save_graph``/``load_graph`` persist it.
+
+    Searches filtered by ``memory_type`` or metadata go through a
+    PartitionedVectorIndex (bitmaps for ``indexed_metadata_keys``), brought
+    up to date with the append-only record list on each filtered search.
+    """
+
+    VIEW_KEYS = ("id", "content", "embedding", "metadata", "created_at", "access_count")
+
+    def __init__(
+        self,
+        embedding_dim: int = 1536,
+        thread_safe: bool = False,
+        graph_k: Optional[int] = None,
+        indexed_metadata_keys: Tuple[str, ...] = ()
+    ):
+        self.embedding_dim = embedding_dim
+        self._records: List[MemoryRecord] = []
+        self._index_by_id: Dict[str, int] = {}
+        self._lock = ReadWriteLock() if thread_safe else _NoLock()
+        self._access = AccessCounter()
+
+        # Filtered-search index; covers the first _filter_indexed records
+        self._filter_index = PartitionedVectorIndex(indexed_metadata_keys)
+        self._filter_indexed = 0
+        self._filter_lock = threading.Lock()
+
+        # kNN graph: row i holds memory i's neighbours (record positions,
+        # -1 padded) and their similarities (-inf padded), most similar first
+        self.graph_k = graph_k
+        self._unit_embeddings = np.empty((0, embedding_dim), dtype='float32')
+        self._knn_ids = np.empty((0, graph_k or 0), dtype='int32')
+        self._knn_sims = np.empty((0, graph_k or 0), dtype='float32')
+
+    @property
+    def memories(self) -> List[MemoryView]:
+        """All memories, as dict-style views."""
+        return [MemoryView(record, self.VIEW_KEYS) for record in self._records]
+
+    def add(
+        self,
+        content: str,
+        embedding: np.ndarray,
+        metadata: Dict[str, Any] = None,
+        memory_type: Optional[str] = None
+    ) -> str:
+        """Add a memory with embedding."""
+        if len(embedding) != self.embedding_dim:
+            raise ValueError(f"Embedding dimension mismatch. Expected {self.embedding_dim}, got {len(embedding)}")
+
+        with self._lock.write():
+            index = len(self._records)
+            memory_id = f"vec_{index}_{int(datetime.now().timestamp())}"
+            self._records.append(MemoryRecord(
+                memory_id,
+                content,
+                memory_type=memory_type,
+                embedding=embedding.astype('float32'),
+                metadata=metadata or None
+            ))
+            self._index_by_id[memory_id] = index
+            if self.graph_k:
+                self._link(index)
+        return memory_id
+
+    def flush_access_counts(self):
+        """Apply pending access_count increments."""
+        self._access.flush()
+
+    def search(
+        self,
+        query_embedding: np.ndarray,
+        top_k: int = 5,
+        min_similarity: float = 0.7,
+        memory_type: Optional[str] = None,
+        metadata_filter: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Search by semantic similarity, optionally only among memories of
+        ``memory_type`` whose metadata matches ``metadata_filter``.
+        """
+        if memory_type is not None or metadata_filter:
+            return self._filtered_search(query_embedding, top_k, min_similarity, memory_type, metadata_filter or {})
+
+        records = self._records
+        if not records:
+            return []
+
+        similarities = []
+        for record in records:
+            sim = self._cosine_similarity(query_embedding, record.embedding)
+            if sim >= min_similarity:
+                self._access.hit(record)
+                similarities.append((record, sim))
+
+        similarities.sort(key=lambda x: x[1], reverse=True)
+        return [
+            {"memory": MemoryView(record, self.VIEW_KEYS), "similarity": sim}
+            for record, sim in similarities[:top_k]
+        ]
+
+    def _cosine_similarity(self, a: np.ndarray, b: np.ndarray) -> float:
+        """Calculate cosine similarity."""
+        return np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b) + 1e-8)
+
+    def _filtered_search(
+        self,
+        query_embedding: np.ndarray,
+        top_k: int,
+        min_similarity: float,
+        memory_type: Optional[str],
+        metadata_filter: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        index = self._filter_index
+        bitmap_filters = {k: v for k, v in metadata_filter.items() if k in index.bitmap_keys}
+        other_filters = {k: v for k, v in metadata_filter.items() if k not in index.bitmap_keys}
+
+        predicate = None
+        if other_filters:
+            def predicate(memory_id: str) -> bool:
+                metadata = self._records[self._index_by_id[memory_id]].metadata or {}
+                return all(metadata.get(k) == v for k, v in other_filters.items())
+
+        with self._filter_lock:
+            records = self._records
+            for record in records[self._filter_indexed:len(records)]:
+                index.add(record.id, record.embedding, record.memory_type, record.metadata)
+            self._filter_indexed = len(records)
+
+            matches = index.search(
+                query_embedding,
+                top_k,
+                partitions=[memory_type] if memory_type is not None else None,
+                filters=bitmap_filters,
+                predicate=predicate
+            )
+
+        results = []
+        for memory_id, sim in matches:
+            if sim < min_similarity:
+                break
+            record = self._records[self._index_by_id[memory_id]]
+            self._access.hit(record)
+            results.append({"memory": MemoryView(record, self.VIEW_KEYS), "similarity": sim})
+        return results
+
+    def find_similar_memories(
+        self,
+        memory_id: str,
+        top_k: int = 5,
+        min_similarity: float = 0.8
+    ) -> List[Dict[str, Any]]:
+        """
+        Find memories similar to a given memory (not including itself).
+        An O(k) graph lookup when ``top_k <= graph_k``, else a full scan.
+        """
+        index = self._index_by_id.get(memory_id)
+        if index is None:
+            return []
+
+        if not self.graph_k or top_k > self.graph_k:
+            results = self.search(self._records[index].embedding, top_k + 1, min_similarity)
+            return [r for r in results if r["memory"]["id"] != memory_id][:top_k]
+
+        with self._lock.read():
+            neighbor_ids = self._knn_ids[index, :top_k].tolist()
+            neighbor_sims = self._knn_sims[index, :top_k].tolist()
+
+        results = []
+        for neighbor, sim in zip(neighbor_ids, neighbor_sims):
+            if neighbor < 0 or sim < min_similarity:
+                break
+            record = self._records[neighbor]
+            self._access.hit(record)
+            results.append({"memory": MemoryView(record, self.VIEW_KEYS), "similarity": sim})
+        return results
+
+    def _unit(self, embeddings: np.ndarray) -> np.ndarray:
+        """Rows scaled to unit length, so dot products are cosine similarities."""
+        norms = np.linalg.norm(embeddings, axis=-1, keepdims=True)
+        return (embeddings / (norms + 1e-8)).astype('float32')
+
+    def _reserve(self, size: int):
+        """Grow the graph arrays (geometrically) to hold ``size`` memories."""
+        capacity = len(self._knn_ids)
+        if size <= capacity:
+            return
+        capacity = max(size, 2 * capacity, 64)
+        k = self.graph_k
+
+        unit = np.empty((capacity, self.embedding_dim), dtype='float32')
+        unit[:len(self._unit_embeddings)] = self._unit_embeddings
+        knn_ids = np.full((capacity, k), -1, dtype='int32')
+        knn_ids[:len(self._knn_ids)] = self._knn_ids
+        knn_sims = np.full((capacity, k), -np.inf, dtype='float32')
+        knn_sims[:len(self._knn_sims)] = self._knn_sims
+
+        self._unit_embeddings, self._knn_ids, self._knn_sims = unit, knn_ids, knn_sims
+
+    def _link(self, index: int):
+        """Add memory ``index`` to the graph (caller holds the write lock)."""
+        self._reserve(index + 1)
+        unit = self._unit(self._records[index].embedding)
+        self._unit_embeddings[index] = unit
+        if index == 0:
+            return
+
+        sims = self._unit_embeddings[:index] @ unit
+
+        k = min(self.graph_k, index)
+        nearest = np.argpartition(-sims, k - 1)[:k]
+        nearest = nearest[np.argsort(-sims[nearest], kind='stable')]
+        self._knn_ids[index, :k] = nearest
+        self._knn_sims[index, :k] = sims[nearest]
+
+        # Reverse edges: every memory whose current k-th neighbour is less
+        # similar than the new one (or that has fewer than k) takes it in
+        for other in np.flatnonzero(sims > self._knn_sims[:index, -1]):
+            row_ids, row_sims = self._knn_ids[other], self._knn_sims[other]
+            position = int(np.searchsorted(-row_sims, -sims[other], side='right'))
+            row_ids[position + 1:] = row_ids[position:-1].copy()
+            row_sims[position + 1:] = row_sims[position:-1].copy()
+            row_ids[position] = index
+            row_sims[position] = sims[other]
+
+    def rebuild_graph(self, k: Optional[int] = None, block_size: int = 1024):
+        """
+        Recompute the whole kNN graph (optionally with a new ``k``) using
+        blocked matrix products, ``block_size`` rows at a time.
+        """
+        with self._lock.write():
+            self.graph_k = k or self.graph_k
+            if not self.graph_k:
+                raise ValueError("rebuild_graph needs k when the store has no graph_k")
+
+            n = len(self._records)
+            self._unit_embeddings = np.empty((0, self.embedding_dim), dtype='float32')
+            self._knn_ids = np.empty((0, self.graph_k), dtype='int32')
+            self._knn_sims = np.empty((0, self.graph_k), dtype='float32')
+            self._reserve(n)
+            if n == 0:
+                return
+
+            unit = self._unit(np.stack([record.embedding for record in self._records]))
+            self._unit_embeddings[:n] = unit
+            k = min(self.graph_k, n - 1)
+            if k == 0:
+                return
+
+            for start in range(0, n, block_size):
+                stop = min(start + block_size, n)
+                sims = unit[start:stop] @ unit.T
+                rows = np.arange(stop - start)
+                sims[rows, rows + start] = -np.inf  # not its own neighbour
+
+                nearest = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+                nearest_sims = np.take_along_axis(sims, nearest, axis=1)
+                order = np.argsort(-nearest_sims, axis=1, kind='stable')
+                self._knn_ids[start:stop, :k] = np.take_along_axis(nearest, order, axis=1)
+                self._knn_sims[start:stop, :k] = np.take_along_axis(nearest_sims, order, axis=1)
+
+    def save_graph(self, path: str):
+        """Write the kNN graph to an ``.npz`` file."""
+        with self._lock.read():
+            n = len(self._records)
+            np.savez(
+                path,
+                ids=np.array([record.id for record in self._records[:n]]),
+                neighbors=self._knn_ids[:n],
+                similarities=self._knn_sims[:n]
+            )
+
+    def load_graph(self, path: str):
+        """
+        Load a graph written by ``save_graph`` for this store's memories.
+        Memories added since it was saved are linked in incrementally.
+        """
+        with np.load(path) as data:
+            ids, neighbors, similarities = data["ids"], data["neighbors"], data["similarities"]
+
+        with self._lock.write():
+            saved = len(ids)
+            if saved > len(self._records) or any(
+                record.id != memory_id for record, memory_id in zip(self._records, ids.tolist())
+            ):
+                raise ValueError(f"graph in {path} was saved for different memories")
+
+            self.graph_k = neighbors.shape[1]
+            self._unit_embeddings = np.empty((0, self.embedding_dim), dtype='float32')
+            self._knn_ids = np.empty((0, self.graph_k), dtype='int32')
+            self._knn_sims = np.empty((0, self.graph_k), dtype='float32')
+            self._reserve(len(self._records))
+
+            if saved:
+                self._unit_embeddings[:saved] = self._unit(
+                    np.stack([record.embedding for record in self._records[:saved]])
+                )
+                self._knn_ids[:saved] = neighbors
+                self._knn_sims[:saved] = similarities
+            for index in range(saved, len(self._records)):
+                self._link(index)
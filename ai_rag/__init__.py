@@ -0,0 +1,54 @@
+"""
+RAG (Retrieval-Augmented Generation) Implementations
+====================================================
+
+RAG systems over different vector stores and retrieval strategies.
+
+Every name below is loaded on first use: ``import ai_rag`` imports no
+submodule, and openai, numpy and chromadb are only imported once a RAG
+object first needs them.
+
+Author: AI Memory Research
+Date: 2026-02-23
+"""
+
+import importlib
+
+# Not typing.TYPE_CHECKING: importing typing would cost more than the package
+TYPE_CHECKING = False
+
+# Public name -> submodule defining it
+_EXPORTS = {
+    "SimpleChromaRAG": "chroma",
+    "SQLiteRAG": "sqlite_rag",
+    "AdvancedRAG": "advanced",
+    "HybridRAG": "hybrid",
+    "ConversationalRAG": "conversational",
+    "BatchEmbedder": "batching",
+    "EmbeddingCache": "cache",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *__all__})
+
+
+if TYPE_CHECKING:
+    from .chroma import SimpleChromaRAG
+    from .sqlite_rag import SQLiteRAG
+    from .advanced import AdvancedRAG
+    from .hybrid import HybridRAG
+    from .conversational import ConversationalRAG
+    from .batching import BatchEmbedder
+    from .cache import EmbeddingCache
@@ -0,0 +1,160 @@
+"""RAG with LLM re-ranking and cited answers."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+from ai_memory.lazy import openai
+
+from .chroma import SimpleChromaRAG
+
+
+# =============================================================================
+# 3. ADVANCED RAG WITH RE-RANKING
+# =============================================================================
+
+class AdvancedRAG:
+    """
+    Advanced RAG with re-ranking and hybrid search.
+    Combines vector search with keyword search and re-ranking.
+    """
+
+    def __init__(self, base_store: SimpleChromaRAG):
+        self.store = base_store
+        self.client = openai.OpenAI()
+
+    def query_with_reranking(
+        self,
+        question: str,
+        initial_k: int = 10,
+        final_k: int = 3
+    ) -> Dict[str, Any]:
+        """
+        Query with retrieval and re-ranking.
+
+        Args:
+            question: User's question
+            initial_k: Number of documents to retrieve initially
+            final_k: Number of documents to return after re-ranking
+
+        Returns:
+            Dict with answer and sources
+        """
+        # Step 1: Retrieve more candidates
+        query_embedding = self.store._embed(question)
+
+        results = self.store.collection.query(
+            query_embeddings=[query_embedding],
+            n_results=initial_k
+        )
+
+        # Step 2: Re-rank by relevance
+        reranked = self._rerank(question, results)
+
+        # Step 3: Use top-k for generation
+        top_results = reranked[:final_k]
+
+        # Build context
+        context = "\n\n---\n\n".join(r["content"] for r in top_results)
+
+        # Generate answer
+        answer = self._generate_answer(question, context, top_results)
+
+        return {
+            "question": question,
+            "answer": answer,
+            "sources": top_results,
+            "retrieved_count": len(results["documents"][0]) if results["documents"] else 0,
+            "context_used": len(top_results) > 0
+        }
+
+    def _rerank(
+        self,
+        question: str,
+        results: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """Re-rank documents by relevance to question."""
+        if not results["documents"] or not results["documents"][0]:
+            return []
+
+        scored_docs = []
+
+        for i, doc in enumerate(results["documents"][0]):
+            # Use LLM to score relevance
+            relevance_score = self._score_relevance(question, doc)
+
+            scored_docs.append({
+                "content": doc,
+                "metadata": results["metadatas"][0][i] if results["metadatas"] else {},
+                "distance": results["distances"][0][i] if results["distances"] else 0,
+                "relevance_score": relevance_score
+            })
+
+        # Sort by relevance score
+        scored_docs.sort(key=lambda x: x["relevance_score"], reverse=True)
+
+        return scored_docs
+
+    def _score_relevance(self, question: str, document: str) -> float:
+        """Score document relevance to question using LLM."""
+        prompt = f"""Rate the relevance of this document to the question on a scale of 0.0 to 1.0.
+
+Question: {question}
+
+Document: {document[:500]}
+
+Respond with only a number:"""
+
+        try:
+            response = self.client.chat.completions.create(
+                model="gpt-4",
+                messages=[{"role": "user", "content": prompt}],
+                temperature=0,
+                max_tokens=10
+            )
+
+            score_text = response.choices[0].message.content.strip()
+            return float(score_text)
+        except:
+            return 0.5  # Default score on error
+
+    def _generate_answer(
+        self,
+        question: str,
+        context: str,
+        sources: List[Dict[str, Any]]
+    ) -> str:
+        """Generate answer with citations."""
+        if not context:
+            return "I don't have relevant information to answer this question."
+
+        # Add source indicators
+        numbered_context = ""
+        for i, source in enumerate(sources, 1):
+            numbered_context += f"[{i}] {source['content']}\n\n"
+
+        prompt = f"""Use the following context to answer the question. Cite your sources using [1], [2], etc.
+
+Context:
+{numbered_context}
+
+Question: {question}
+
+Answer:"""
+
+        response = self.client.chat.completions.create(
+            model="gpt-4",
+            messages=[
+                {
+                    "role": "system",
+                    "content": "You are a helpful assistant that answers questions based on provided context and cites sources."
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            temperature=0
+        )
+
+        return response.choices[0].message.content
@@ -0,0 +1,212 @@
+"""Batched, pipelined embedding for document ingestion."""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Iterator, List, Optional, Tuple, Union
+
+from .cache import EmbeddingCache
+
+
+# =============================================================================
+# BATCHED EMBEDDING (Size-Capped, Pipelined, Slice Retry)
+# =============================================================================
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token), without a tokenizer."""
+    return len(text) // 4 + 1
+
+
+class BatchEmbedder:
+    """
+    Embeds many texts with as few requests as the size caps allow.
+
+    ``embed_batch(texts)`` makes one request and returns one embedding per
+    text, with ``None`` for any the response left out. Texts are cut into
+    batches of at most ``max_items`` texts and ``max_tokens`` estimated
+    tokens; a single text over the token cap goes alone.
+
+    A failed request is retried for that batch alone, never for batches
+    already embedded, and a retry after a partial response only re-sends
+    the texts that came back without an embedding. Each batch gets
+    ``max_retries`` attempts with exponential backoff from ``retry_delay``
+    before the error propagates.
+
+    ``pipeline(texts)`` embeds up to ``prefetch`` batches ahead in
+    background threads while the caller writes the previous batch, so
+    ingestion is bound by the slower of the two rather than their sum.
+    ``embed_batch`` is then called from several threads at once; with
+    ``prefetch=0`` every batch is embedded on the caller's thread.
+    """
+
+    def __init__(
+        self,
+        embed_batch: Callable[[List[str]], List[Optional[Any]]],
+        max_items: int = 512,
+        max_tokens: int = 100_000,
+        max_retries: int = 3,
+        retry_delay: float = 0.5,
+        prefetch: int = 2
+    ):
+        self.embed_batch = embed_batch
+        self.max_items = max_items
+        self.max_tokens = max_tokens
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.prefetch = prefetch
+        self.stats = {"texts": 0, "batches": 0, "requests": 0, "retries": 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, key: str, n: int = 1):
+        with self._stats_lock:
+            self.stats[key] += n
+
+    def batches(self, texts: List[str]) -> Iterator[Tuple[int, int]]:
+        """Yield ``(start, end)`` slices of `texts` within the size caps."""
+        start, tokens = 0, 0
+        for i, text in enumerate(texts):
+            cost = estimate_tokens(text)
+            if i > start and (i - start >= self.max_items or tokens + cost > self.max_tokens):
+                yield start, i
+                start, tokens = i, 0
+            tokens += cost
+        if start < len(texts):
+            yield start, len(texts)
+
+    def embed(
+        self,
+        texts: List[str],
+        embed_batch: Optional[Callable[[List[str]], List[Optional[Any]]]] = None
+    ) -> List[Any]:
+        """
+        Embed one batch, retrying only the texts still without an embedding.
+        `embed_batch` replaces the instance's request function for this call.
+        """
+        embed_batch = embed_batch or self.embed_batch
+        embeddings: List[Optional[Any]] = [None] * len(texts)
+        missing = list(range(len(texts)))
+
+        for attempt in range(self.max_retries):
+            if attempt:
+                self._count("retries")
+                time.sleep(self.retry_delay * 2 ** (attempt - 1))
+            self._count("requests")
+            try:
+                result = embed_batch([texts[i] for i in missing])
+            except Exception:
+                if attempt + 1 == self.max_retries:
+                    raise
+                continue
+            for i, embedding in zip(missing, result):
+                embeddings[i] = embedding
+            missing = [i for i in missing if embeddings[i] is None]
+            if not missing:
+                break
+        else:
+            raise RuntimeError(f"no embedding returned for {len(missing)} text(s) after {self.max_retries} attempts")
+
+        self._count("texts", len(texts))
+        self._count("batches")
+        return embeddings
+
+    def pipeline(self, texts: List[str], prefetch: Optional[int] = None) -> Iterator[Tuple[int, int, List[Any]]]:
+        """
+        Yield ``(start, end, embeddings)`` for each batch, in order, while
+        the next batches are already being embedded. `prefetch` overrides
+        the instance setting for this call.
+        """
+        depth = self.prefetch if prefetch is None else prefetch
+        slices = self.batches(texts)
+        if depth <= 0:
+            for start, end in slices:
+                yield start, end, self.embed(texts[start:end])
+            return
+        with ThreadPoolExecutor(max_workers=depth, thread_name_prefix="embed-batch") as pool:
+            in_flight = [(a, b, pool.submit(self.embed, texts[a:b])) for a, b in islice(slices, depth)]
+            try:
+                while in_flight:
+                    start, end, future = in_flight.pop(0)
+                    embeddings = future.result()
+                    next_slice = next(slices, None)
+                    if next_slice is not None:
+                        a, b = next_slice
+                        in_flight.append((a, b, pool.submit(self.embed, texts[a:b])))
+                    yield start, end, embeddings
+            finally:
+                for _, _, future in in_flight:
+                    future.cancel()
+
+
+class EmbeddingMixin:
+    """
+    Embedding methods shared by the RAG classes.
+
+    The host class sets ``embedding_model`` and ``client`` (an OpenAI
+    client) and calls ``_init_embedding`` from ``__init__``. ``_embed``
+    embeds one text and ``_embedding_pipeline`` many (see
+    ``BatchEmbedder.pipeline``); both go through the embedding cache.
+    Subclasses may override ``_embed`` alone to use other vectors.
+    """
+
+    def _init_embedding(
+        self,
+        embed_batch_size: int,
+        embed_batch_tokens: int,
+        embedding_cache: Union[EmbeddingCache, str, bool, None],
+        default_cache_path: str
+    ):
+        self.embedding_cache = EmbeddingCache.from_setting(embedding_cache, default_cache_path)
+        self.batch_embedder = BatchEmbedder(
+            self._embed_batch, max_items=embed_batch_size, max_tokens=embed_batch_tokens
+        )
+
+    def _embed(self, text: str) -> List[float]:
+        """Generate embedding for text, through the embedding cache."""
+        return self.batch_embedder.embed([text], self._cached_embeddings)[0]
+
+    def _embed_batch(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """
+        Generate embeddings for several texts, requesting only those not in
+        the embedding cache; ``None`` for any the response left out.
+        Subclasses that only override ``_embed`` get one ``_embed`` call per
+        text, uncached, since their vectors do not come from
+        ``embedding_model``.
+        """
+        if self._overrides_embed():
+            return [self._embed(text) for text in texts]
+        return self._cached_embeddings(texts)
+
+    def _cached_embeddings(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """
+        Embeddings from ``embedding_model``, via the cache when there is one.
+        The base ``_embed`` calls this rather than ``_embed_batch``, so an
+        override that calls ``super()._embed()`` does not recurse.
+        """
+        if self.embedding_cache is None:
+            return self._request_embeddings(texts)
+        return self.embedding_cache.fetch(self.embedding_model, texts, self._request_embeddings)
+
+    def _overrides_embed(self) -> bool:
+        """
+        Whether a subclass replaced ``_embed``. Such overrides are only
+        called from the caller's thread, so they need not be thread-safe.
+        """
+        return type(self)._embed is not EmbeddingMixin._embed
+
+    def _embedding_pipeline(self, texts: List[str]) -> Iterator[Tuple[int, int, List[Any]]]:
+        """``batch_embedder.pipeline``, without prefetch threads for an overridden ``_embed``."""
+        return self.batch_embedder.pipeline(texts, prefetch=0 if self._overrides_embed() else None)
+
+    def _request_embeddings(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """One embeddings request for `texts`."""
+        response = self.client.embeddings.create(
+            model=self.embedding_model,
+            input=texts
+        )
+        embeddings: List[Optional[List[float]]] = [None] * len(texts)
+        for item in response.data:
+            embeddings[item.index] = item.embedding
+        return embeddings
@@ -0,0 +1,282 @@
+"""Persistent, content-addressed embedding cache shared by the RAG classes."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+
+# =============================================================================
+# EMBEDDING CACHE (SQLite + In-Process LRU)
+# =============================================================================
+
+class EmbeddingCache:
+    """
+    Embeddings keyed by ``(model, sha256(text))``, stored as raw float32.
+
+    Lookups check a bounded in-process LRU first, then the SQLite file;
+    only texts found in neither are sent to the embedding function, and
+    their results are written to both. Identical texts in one call are
+    embedded once.
+
+    Both layers are bounded by size in bytes of stored vectors: the LRU
+    drops its least recently used entries past ``max_memory_bytes``, and
+    the file drops its least recently used rows (by ``last_used``) past
+    ``max_disk_bytes``, down to 90% of the limit so eviction does not run
+    on every write. ``None`` disables the disk limit.
+
+    ``EmbeddingCache.open(path)`` returns one instance per path, so every
+    RAG object configured with the same file shares one LRU and one set
+    of stats. Each ``open`` is matched by a ``close``; the file is closed
+    when the last holder closes it.
+
+    Reads do not write: ``last_used`` updates for disk hits are buffered
+    and written with the next ``put_many``, eviction or ``close``.
+    """
+
+    # Host parameters per IN (...) lookup, under SQLite's default limit
+    LOOKUP_CHUNK = 500
+
+    _instances: Dict[str, "EmbeddingCache"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(
+        self,
+        path: str = "embedding_cache.db",
+        max_memory_bytes: int = 64 * 1024 * 1024,
+        max_disk_bytes: Optional[int] = 1024 * 1024 * 1024
+    ):
+        self.path = path
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self._lock = threading.Lock()
+        self._lru: "OrderedDict[Tuple[str, bytes], bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        self._touched: Dict[Tuple[str, bytes], float] = {}
+        self._refs = 1
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0, "disk_evictions": 0}
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model TEXT NOT NULL,
+                text_hash BLOB NOT NULL,
+                vector BLOB NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (model, text_hash)
+            ) WITHOUT ROWID
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings(last_used)")
+        self._conn.commit()
+        self._disk_bytes = self._conn.execute(
+            "SELECT COALESCE(SUM(length(vector)), 0) FROM embeddings"
+        ).fetchone()[0]
+
+    @classmethod
+    def open(cls, path: str = "embedding_cache.db", **kwargs) -> "EmbeddingCache":
+        """The shared cache for `path`, created on first use."""
+        key = path if path == ":memory:" else os.path.abspath(path)
+        with cls._instances_lock:
+            cache = cls._instances.get(key)
+            if cache is None:
+                cache = cls._instances[key] = cls(path, **kwargs)
+            else:
+                cache._refs += 1
+            return cache
+
+    @classmethod
+    def from_setting(cls, setting: Union["EmbeddingCache", str, bool, None], default_path: str) -> Optional["EmbeddingCache"]:
+        """
+        The cache a RAG class was configured with: an instance as is, a
+        path via ``open``, ``True`` for `default_path`, or ``None``/``False``
+        for no cache.
+        """
+        if setting is True:
+            setting = default_path
+        if isinstance(setting, str):
+            return cls.open(setting)
+        return setting or None
+
+    @staticmethod
+    def _key(model: str, text: str) -> Tuple[str, bytes]:
+        return model, hashlib.sha256(text.encode("utf-8")).digest()
+
+    def _remember(self, key: Tuple[str, bytes], blob: bytes):
+        """Insert into the LRU and evict past the memory limit; caller holds the lock."""
+        old = self._lru.pop(key, None)
+        if old is not None:
+            self._memory_bytes -= len(old)
+        self._lru[key] = blob
+        self._memory_bytes += len(blob)
+        while self._memory_bytes > self.max_memory_bytes and len(self._lru) > 1:
+            _, evicted = self._lru.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+            self.stats["evictions"] += 1
+
+    def get_many(self, model: str, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        """Cached embeddings for `texts`, ``None`` for each miss."""
+        keys = [self._key(model, text) for text in texts]
+        found: Dict[Tuple[str, bytes], bytes] = {}
+
+        with self._lock:
+            for key in keys:
+                blob = self._lru.get(key)
+                if blob is not None:
+                    self._lru.move_to_end(key)
+                    found[key] = blob
+
+            on_disk = {key for key in keys if key not in found}
+            if on_disk:
+                for text_hash, blob in self._select(
+                    "SELECT text_hash, vector FROM embeddings", model, [key[1] for key in on_disk]
+                ):
+                    found[(model, text_hash)] = blob
+                    self._remember((model, text_hash), blob)
+                now = time.time()
+                for key in on_disk:
+                    if key in found:
+                        self._touched[key] = now
+
+            results = []
+            for key in keys:
+                blob = found.get(key)
+                if blob is None:
+                    self.stats["misses"] += 1
+                    results.append(None)
+                else:
+                    self.stats["hits" if key not in on_disk else "disk_hits"] += 1
+                    results.append(array("f", blob).tolist())
+            return results
+
+    def put_many(self, model: str, texts: Sequence[str], embeddings: Sequence[Optional[Sequence[float]]]):
+        """Store embeddings for `texts`; ``None`` entries are skipped."""
+        rows = {}
+        for text, embedding in zip(texts, embeddings):
+            if embedding is not None:
+                rows[self._key(model, text)] = array("f", embedding).tobytes()
+        if not rows:
+            return
+
+        with self._lock:
+            now = time.time()
+            old_sizes = dict(self._select(
+                "SELECT text_hash, length(vector) FROM embeddings", model, [key[1] for key in rows]
+            ))
+            for key, blob in rows.items():
+                self._disk_bytes += len(blob) - old_sizes.get(key[1], 0)
+                self._remember(key, blob)
+                self._touched.pop(key, None)
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, text_hash, vector, last_used) VALUES (?, ?, ?, ?)",
+                [(model_name, text_hash, blob, now) for (model_name, text_hash), blob in rows.items()]
+            )
+            self._flush_touches()
+            if self.max_disk_bytes is not None and self._disk_bytes > self.max_disk_bytes:
+                self._evict_disk(int(self.max_disk_bytes * 0.9))
+            self._conn.commit()
+
+    def _select(self, sql: str, model: str, text_hashes: List[bytes]) -> List[Tuple[Any, ...]]:
+        """Rows of ``sql`` for `model` and `text_hashes`, in chunked IN lookups; caller holds the lock."""
+        rows = []
+        for i in range(0, len(text_hashes), self.LOOKUP_CHUNK):
+            chunk = text_hashes[i:i + self.LOOKUP_CHUNK]
+            rows.extend(self._conn.execute(
+                f"{sql} WHERE model = ? AND text_hash IN ({', '.join('?' * len(chunk))})",
+                (model, *chunk)
+            ))
+        return rows
+
+    def _flush_touches(self):
+        """Write buffered ``last_used`` updates; caller holds the lock and commits."""
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE embeddings SET last_used = ? WHERE model = ? AND text_hash = ?",
+                [(used, model_name, text_hash) for (model_name, text_hash), used in self._touched.items()]
+            )
+            self._touched.clear()
+
+    def _evict_disk(self, target_bytes: int):
+        """Delete least recently used rows until the file holds `target_bytes`; caller holds the lock."""
+        while self._disk_bytes > target_bytes:
+            victims = self._conn.execute(
+                "SELECT model, text_hash, length(vector) FROM embeddings ORDER BY last_used LIMIT 256"
+            ).fetchall()
+            if not victims:
+                self._disk_bytes = 0
+                break
+            batch = []
+            for model_name, text_hash, size in victims:
+                batch.append((model_name, text_hash))
+                self._disk_bytes -= size
+                if self._disk_bytes <= target_bytes:
+                    break
+            self._conn.executemany("DELETE FROM embeddings WHERE model = ? AND text_hash = ?", batch)
+            self.stats["disk_evictions"] += len(batch)
+
+    def fetch(
+        self,
+        model: str,
+        texts: List[str],
+        compute: Callable[[List[str]], List[Optional[Any]]]
+    ) -> List[Optional[List[float]]]:
+        """
+        Embeddings for `texts`, calling ``compute`` once with the distinct
+        texts that are not cached. ``None`` from ``compute`` is passed
+        through (and not cached) so the caller can retry those texts.
+        """
+        results = self.get_many(model, texts)
+        missing = list(dict.fromkeys(text for text, result in zip(texts, results) if result is None))
+        if not missing:
+            return results
+
+        computed = dict(zip(missing, compute(missing)))
+        self.put_many(model, missing, [computed.get(text) for text in missing])
+        return [
+            result if result is not None else computed.get(text)
+            for text, result in zip(texts, results)
+        ]
+
+    def cache_info(self) -> Dict[str, Any]:
+        """Hit counts, hit rate, and the size of each layer."""
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["disk_hits"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "hit_rate": (self.stats["hits"] + self.stats["disk_hits"]) / lookups if lookups else 0.0,
+                "memory_items": len(self._lru),
+                "memory_bytes": self._memory_bytes,
+                "disk_items": self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0],
+                "disk_bytes": self._disk_bytes,
+            }
+
+    def clear(self):
+        """Drop every cached embedding, in memory and on disk."""
+        with self._lock:
+            self._lru.clear()
+            self._touched.clear()
+            self._memory_bytes = 0
+            self._disk_bytes = 0
+            self._conn.execute("DELETE FROM embeddings")
+            self._conn.commit()
+
+    def close(self):
+        """Release this holder's reference; the last one closes the file."""
+        with self._instances_lock:
+            self._refs -= 1
+            if self._refs > 0:
+                return
+            for key, cache in list(self._instances.items()):
+                if cache is self:
+                    del self._instances[key]
+        with self._lock:
+            self._flush_touches()
+            self._conn.commit()
+            self._conn.close()
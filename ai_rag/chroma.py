@@ -0,0 +1,177 @@
+"""Simple RAG on ChromaDB."""
+
+from __future__ import annotations
+
+import os
+from typing import Any, Dict, List, Optional, Union
+
+from ai_memory.lazy import openai
+
+from .batching import EmbeddingMixin
+from .cache import EmbeddingCache
+
+
+# =============================================================================
+# 1. SIMPLE RAG WITH CHROMADB
+# =============================================================================
+
+class SimpleChromaRAG(EmbeddingMixin):
+    """
+    Simple RAG system using ChromaDB.
+    Great for prototyping and small-to-medium applications.
+    """
+
+    def __init__(
+        self,
+        collection_name: str = "rag_documents",
+        persist_directory: str = "./chroma_db",
+        embedding_model: str = "text-embedding-3-small",
+        embed_batch_size: int = 512,
+        embed_batch_tokens: int = 100_000,
+        embedding_cache: Union[EmbeddingCache, str, bool, None] = True
+    ):
+        import chromadb
+        from chromadb.config import Settings
+
+        self.embedding_model = embedding_model
+        self.client = openai.OpenAI()
+        # The default cache file sits inside the ChromaDB directory, not in the cwd
+        self._init_embedding(
+            embed_batch_size, embed_batch_tokens, embedding_cache,
+            os.path.join(persist_directory, "embedding_cache.db")
+        )
+
+        # Initialize ChromaDB
+        self.chroma_client = chromadb.PersistentClient(path=persist_directory)
+        self.collection = self.chroma_client.get_or_create_collection(
+            name=collection_name,
+            metadata={"hnsw:space": "cosine"}
+        )
+
+    def add_documents(self, documents: List[Dict[str, Any]]) -> List[str]:
+        """
+        Add documents to the knowledge base.
+
+        Contents are embedded in batches (see ``BatchEmbedder``), and each
+        batch is written to ChromaDB while the next ones are embedded.
+
+        Args:
+            documents: List of dicts with 'content' and optional 'metadata'
+
+        Returns:
+            List of document IDs
+        """
+        import uuid
+
+        ids = [doc.get("id", str(uuid.uuid4())) for doc in documents]
+        contents = [doc["content"] for doc in documents]
+        metadatas = [doc.get("metadata", {}) for doc in documents]
+
+        for start, end, embeddings in self._embedding_pipeline(contents):
+            self.collection.add(
+                ids=ids[start:end],
+                embeddings=embeddings,
+                documents=contents[start:end],
+                metadatas=metadatas[start:end]
+            )
+
+        return ids
+
+    def query(
+        self,
+        question: str,
+        top_k: int = 3,
+        filter_metadata: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Query the RAG system.
+
+        Args:
+            question: User's question
+            top_k: Number of documents to retrieve
+            filter_metadata: Optional metadata filter
+
+        Returns:
+            Dict with answer and sources
+        """
+        # Generate query embedding
+        query_embedding = self._embed(question)
+
+        # Retrieve relevant documents
+        results = self.collection.query(
+            query_embeddings=[query_embedding],
+            n_results=top_k,
+            where=filter_metadata
+        )
+
+        # Build context
+        context_parts = []
+        sources = []
+
+        if results["documents"] and results["documents"][0]:
+            for i, doc in enumerate(results["documents"][0]):
+                context_parts.append(doc)
+                sources.append({
+                    "content": doc,
+                    "metadata": results["metadatas"][0][i] if results["metadatas"] else {},
+                    "distance": results["distances"][0][i] if results["distances"] else 0
+                })
+
+        context = "\n\n---\n\n".join(context_parts)
+
+        # Generate answer
+        answer = self._generate_answer(question, context)
+
+        return {
+            "question": question,
+            "answer": answer,
+            "sources": sources,
+            "context_used": len(context_parts) > 0
+        }
+
+    def _generate_answer(self, question: str, context: str) -> str:
+        """Generate answer using retrieved context."""
+        if not context:
+            return "I don't have relevant information to answer this question."
+
+        prompt = f"""Use the following context to answer the question.
+
+Context:
+{context}
+
+Question: {question}
+
+Answer:"""
+
+        response = self.client.chat.completions.create(
+            model="gpt-4",
+            messages=[
+                {
+                    "role": "system",
+                    "content": "You are a helpful assistant that answers questions based on the provided context."
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            temperature=0
+        )
+
+        return response.choices[0].message.content
+
+    def delete_documents(self, document_ids: List[str]) -> bool:
+        """Delete documents by IDs."""
+        try:
+            self.collection.delete(ids=document_ids)
+            return True
+        except Exception as e:
+            print(f"Error deleting documents: {e}")
+            return False
+
+    def get_collection_stats(self) -> Dict[str, Any]:
+        """Get statistics about the collection."""
+        return {
+            "document_count": self.collection.count(),
+            "collection_name": self.collection.name
+        }
@@ -0,0 +1,172 @@
+"""RAG that keeps conversation history for follow-up questions."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+from ai_memory.lazy import openai
+
+from .chroma import SimpleChromaRAG
+
+
+# =============================================================================
+# 5. RAG WITH CONVERSATION MEMORY
+# =============================================================================
+
+class ConversationalRAG:
+    """
+    RAG system that maintains conversation context.
+    Remembers previous questions and answers for follow-up queries.
+    """
+
+    def __init__(self, rag_store: SimpleChromaRAG):
+        self.rag_store = rag_store
+        self.client = openai.OpenAI()
+        self.conversation_history = []
+
+    def query(
+        self,
+        question: str,
+        top_k: int = 3,
+        use_history: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Query with conversation context.
+
+        Args:
+            question: User's question
+            top_k: Number of documents to retrieve
+            use_history: Whether to use conversation history
+
+        Returns:
+            Dict with answer and sources
+        """
+        # Step 1: Expand query with context
+        expanded_query = question
+        if use_history and self.conversation_history:
+            expanded_query = self._expand_query_with_history(question)
+
+        # Step 2: Retrieve relevant documents
+        query_embedding = self.rag_store._embed(expanded_query)
+        results = self.rag_store.collection.query(
+            query_embeddings=[query_embedding],
+            n_results=top_k
+        )
+
+        # Step 3: Build context
+        context_parts = []
+        sources = []
+
+        if results["documents"] and results["documents"][0]:
+            for i, doc in enumerate(results["documents"][0]):
+                context_parts.append(doc)
+                sources.append({
+                    "content": doc,
+                    "metadata": results["metadatas"][0][i] if results["metadatas"] else {}
+                })
+
+        context = "\n\n---\n\n".join(context_parts)
+
+        # Step 4: Generate answer with conversation context
+        answer = self._generate_answer_with_history(
+            question,
+            context,
+            self.conversation_history if use_history else []
+        )
+
+        # Step 5: Update conversation history
+        self.conversation_history.append({
+            "role": "user",
+            "content": question
+        })
+        self.conversation_history.append({
+            "role": "assistant",
+            "content": answer
+        })
+
+        # Keep only last 10 exchanges
+        if len(self.conversation_history) > 20:
+            self.conversation_history = self.conversation_history[-20:]
+
+        return {
+            "question": question,
+            "answer": answer,
+            "sources": sources,
+            "expanded_query": expanded_query if use_history else question,
+            "conversation_turns": len(self.conversation_history) // 2
+        }
+
+    def _expand_query_with_history(self, question: str) -> str:
+        """Expand query using conversation history."""
+        # Get recent conversation
+        recent = self.conversation_history[-6:] if len(self.conversation_history) > 6 else self.conversation_history
+
+        conversation_text = "\n".join([f"{m['role']}: {m['content']}" for m in recent])
+
+        prompt = f"""Given this conversation history, expand the current question to be more specific.
+
+Conversation:
+{conversation_text}
+
+Current question: {question}
+
+Expanded question (more specific, incorporating context):"""
+
+        response = self.client.chat.completions.create(
+            model="gpt-4",
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0,
+            max_tokens=100
+        )
+
+        return response.choices[0].message.content.strip()
+
+    def _generate_answer_with_history(
+        self,
+        question: str,
+        context: str,
+        history: List[Dict[str, str]]
+    ) -> str:
+        """Generate answer with conversation history."""
+        messages = [
+            {
+                "role": "system",
+                "content": "You are a helpful assistant that answers questions based on provided context and conversation history."
+            }
+        ]
+
+        # Add conversation history
+        for msg in history:
+            messages.append({
+                "role": msg["role"],
+                "content": msg["content"]
+            })
+
+        # Add current question with context
+        prompt = f"""Context:
+{context}
+
+Question: {question}
+
+Answer:"""
+
+        messages.append({
+            "role": "user",
+            "content": prompt
+        })
+
+        response = self.client.chat.completions.create(
+            model="gpt-4",
+            messages=messages,
+            temperature=0
+        )
+
+        return response.choices[0].message.content
+
+    def clear_history(self):
+        """Clear conversation history."""
+        self.conversation_history = []
+
+    def get_history(self) -> List[Dict[str, str]]:
+        """Get conversation history."""
+        return self.conversation_history.copy()
@@ -0,0 +1,211 @@
+"""Hybrid (vector + keyword) RAG."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+from ai_memory.lazy import openai
+
+from .chroma import SimpleChromaRAG
+
+
+# =============================================================================
+# 4. HYBRID RAG (Vector + Keyword)
+# =============================================================================
+
+class HybridRAG:
+    """
+    Hybrid RAG combining vector search and keyword search.
+    Provides better results for queries with specific terms.
+    """
+
+    def __init__(self, vector_store: SimpleChromaRAG):
+        self.vector_store = vector_store
+        self.keyword_index = {}  # Simple keyword index
+        self.client = openai.OpenAI()
+
+    def add_documents(self, documents: List[Dict[str, Any]]) -> List[str]:
+        """Add documents to both vector and keyword indexes."""
+        # Add to vector store
+        ids = self.vector_store.add_documents(documents)
+
+        # Add to keyword index
+        for doc, doc_id in zip(documents, ids):
+            content = doc["content"]
+            self._index_keywords(doc_id, content)
+
+        return ids
+
+    def _index_keywords(self, doc_id: str, content: str):
+        """Index keywords for a document."""
+        import re
+
+        # Extract words (simple tokenization)
+        words = re.findall(r'\b\w+\b', content.lower())
+
+        for word in set(words):
+            if len(word) > 3:  # Ignore short words
+                if word not in self.keyword_index:
+                    self.keyword_index[word] = []
+                self.keyword_index[word].append(doc_id)
+
+    def query_hybrid(
+        self,
+        question: str,
+        top_k: int = 3,
+        alpha: float = 0.5
+    ) -> Dict[str, Any]:
+        """
+        Query using hybrid search (vector + keyword).
+
+        Args:
+            question: User's question
+            top_k: Number of results to return
+            alpha: Weight for vector search (0-1). 1 = pure vector, 0 = pure keyword
+
+        Returns:
+            Dict with answer and sources
+        """
+        # Vector search
+        query_embedding = self.vector_store._embed(question)
+        vector_results = self.vector_store.collection.query(
+            query_embeddings=[query_embedding],
+            n_results=top_k * 2
+        )
+
+        # Keyword search
+        keyword_results = self._keyword_search(question, top_k * 2)
+
+        # Combine scores
+        combined = self._combine_results(
+            vector_results,
+            keyword_results,
+            alpha
+        )
+
+        # Take top-k
+        top_results = combined[:top_k]
+
+        # Generate answer
+        context = "\n\n---\n\n".join(r["content"] for r in top_results)
+        answer = self._generate_answer(question, context)
+
+        return {
+            "question": question,
+            "answer": answer,
+            "sources": top_results,
+            "vector_weight": alpha,
+            "keyword_weight": 1 - alpha
+        }
+
+    def _keyword_search(self, query: str, top_k: int) -> List[Dict[str, Any]]:
+        """Search by keywords."""
+        import re
+
+        query_words = set(re.findall(r'\b\w+\b', query.lower()))
+
+        # Find documents matching keywords
+        doc_scores = {}
+        for word in query_words:
+            if word in self.keyword_index:
+                for doc_id in self.keyword_index[word]:
+                    doc_scores[doc_id] = doc_scores.get(doc_id, 0) + 1
+
+        # Get top documents
+        sorted_docs = sorted(doc_scores.items(), key=lambda x: x[1], reverse=True)
+        top_doc_ids = [doc_id for doc_id, _ in sorted_docs[:top_k]]
+
+        # Retrieve full documents
+        results = []
+        for doc_id in top_doc_ids:
+            # Get from vector store (simplified)
+            doc_result = self.vector_store.collection.get(
+                ids=[doc_id],
+                include=["documents", "metadatas"]
+            )
+            if doc_result["documents"]:
+                results.append({
+                    "id": doc_id,
+                    "content": doc_result["documents"][0],
+                    "metadata": doc_result["metadatas"][0] if doc_result["metadatas"] else {},
+                    "keyword_score": doc_scores[doc_id]
+                })
+
+        return results
+
+    def _combine_results(
+        self,
+        vector_results: Dict[str, Any],
+        keyword_results: List[Dict[str, Any]],
+        alpha: float
+    ) -> List[Dict[str, Any]]:
+        """Combine vector and keyword search results."""
+        combined = {}
+
+        # Process vector results
+        if vector_results["documents"] and vector_results["documents"][0]:
+            for i, doc_id in enumerate(vector_results["ids"][0]):
+                combined[doc_id] = {
+                    "id": doc_id,
+                    "content": vector_results["documents"][0][i],
+                    "metadata": vector_results["metadatas"][0][i] if vector_results["metadatas"] else {},
+                    "vector_score": 1 - (i / len(vector_results["ids"][0])),  # Normalize
+                    "keyword_score": 0
+                }
+
+        # Add keyword scores
+        for result in keyword_results:
+            doc_id = result["id"]
+            if doc_id in combined:
+                combined[doc_id]["keyword_score"] = result["keyword_score"]
+            else:
+                combined[doc_id] = {
+                    "id": doc_id,
+                    "content": result["content"],
+                    "metadata": result["metadata"],
+                    "vector_score": 0,
+                    "keyword_score": result["keyword_score"]
+                }
+
+        # Calculate combined score
+        for doc_id, doc in combined.items():
+            # Normalize scores
+            vec_score = doc["vector_score"]
+            kw_score = min(doc["keyword_score"] / 10, 1.0)  # Normalize keyword score
+
+            doc["combined_score"] = alpha * vec_score + (1 - alpha) * kw_score
+
+        # Sort by combined score
+        results = list(combined.values())
+        results.sort(key=lambda x: x["combined_score"], reverse=True)
+
+        return results
+
+    def _generate_answer(self, question: str, context: str) -> str:
+        """Generate answer using context."""
+        if not context:
+            return "I don't have relevant information to answer this question."
+
+        prompt = f"""Context:
+{context}
+
+Question: {question}
+
+Answer:"""
+
+        response = self.client.chat.completions.create(
+            model="gpt-4",
+            messages=[
+                {
+                    "role": "system",
+                    "content": "You are a helpful assistant that answers questions based on provided context."
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            temperature=0
+        )
+
+        return response.choices[0].message.content
@@ -0,0 +1,197 @@
+"""Fully local RAG on SQLite."""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import Any, Dict, List, Union
+
+from ai_memory.lazy import numpy as np, openai
+
+from .batching import EmbeddingMixin
+from .cache import EmbeddingCache
+
+
+# =============================================================================
+# 2. RAG WITH SQLITE (Fully Local)
+# =============================================================================
+
+class SQLiteRAG(EmbeddingMixin):
+    """
+    RAG system using SQLite for storage.
+    Completely local, no external dependencies needed.
+    """
+
+    def __init__(
+        self,
+        db_path: str = "rag_knowledge.db",
+        openai_api_key: str = None,
+        embed_batch_size: int = 512,
+        embed_batch_tokens: int = 100_000,
+        embedding_cache: Union[EmbeddingCache, str, bool, None] = True,
+        embedding_model: str = "text-embedding-3-small"
+    ):
+        self.db_path = db_path
+        self.embedding_model = embedding_model
+        self._openai_api_key = openai_api_key
+        self._client = None
+        # The default cache file sits beside the knowledge base, not in the cwd
+        self._init_embedding(
+            embed_batch_size, embed_batch_tokens, embedding_cache,
+            ":memory:" if db_path == ":memory:"
+            else os.path.join(os.path.dirname(db_path), "embedding_cache.db")
+        )
+        self._init_database()
+
+    @property
+    def client(self):
+        """OpenAI client, created on first use so openai is only imported when needed."""
+        if self._client is None:
+            self._client = openai.OpenAI(api_key=self._openai_api_key)
+        return self._client
+
+    def _init_database(self):
+        """Initialize SQLite database."""
+        import sqlite3
+
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS documents (
+                id TEXT PRIMARY KEY,
+                content TEXT NOT NULL,
+                embedding BLOB,
+                metadata TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_created_at
+            ON documents(created_at DESC)
+        """)
+
+        conn.commit()
+        conn.close()
+
+    def add_documents(self, documents: List[Dict[str, Any]]) -> List[str]:
+        """
+        Add documents to knowledge base.
+
+        Contents are embedded in batches (see ``BatchEmbedder``), and each
+        batch is inserted while the next ones are embedded. All documents
+        are committed together, so a failed batch leaves none of them stored.
+        """
+        import sqlite3
+        import pickle
+        import uuid
+
+        ids = [doc.get("id", str(uuid.uuid4())) for doc in documents]
+        contents = [doc["content"] for doc in documents]
+
+        conn = sqlite3.connect(self.db_path)
+        try:
+            for start, end, embeddings in self._embedding_pipeline(contents):
+                conn.executemany("""
+                    INSERT INTO documents (id, content, embedding, metadata)
+                    VALUES (?, ?, ?, ?)
+                """, [
+                    (
+                        ids[i],
+                        contents[i],
+                        pickle.dumps(embedding),
+                        json.dumps(documents[i].get("metadata", {}))
+                    )
+                    for i, embedding in zip(range(start, end), embeddings)
+                ])
+            conn.commit()
+        finally:
+            conn.close()
+
+        return ids
+
+    def query(
+        self,
+        question: str,
+        top_k: int = 3
+    ) -> Dict[str, Any]:
+        """Query the RAG system."""
+        import sqlite3
+        import pickle
+
+        # Generate query embedding
+        query_embedding = self._embed(question)
+
+        # Retrieve similar documents
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute("SELECT id, content, embedding, metadata FROM documents")
+        rows = cursor.fetchall()
+        conn.close()
+
+        # Calculate similarities
+        results = []
+        for row in rows:
+            doc_id, content, embedding_blob, metadata_json = row
+            doc_embedding = pickle.loads(embedding_blob)
+
+            similarity = self._cosine_similarity(query_embedding, doc_embedding)
+
+            results.append({
+                "id": doc_id,
+                "content": content,
+                "metadata": json.loads(metadata_json),
+                "similarity": similarity
+            })
+
+        # Sort and take top-k
+        results.sort(key=lambda x: x["similarity"], reverse=True)
+        top_results = results[:top_k]
+
+        # Build context
+        context = "\n\n---\n\n".join(r["content"] for r in top_results)
+
+        # Generate answer
+        answer = self._generate_answer(question, context)
+
+        return {
+            "question": question,
+            "answer": answer,
+            "sources": top_results,
+            "context_used": len(top_results) > 0
+        }
+
+    def _cosine_similarity(self, a: List[float], b: List[float]) -> float:
+        """Calculate cosine similarity."""
+        return np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b) + 1e-8)
+
+    def _generate_answer(self, question: str, context: str) -> str:
+        """Generate answer using context."""
+        if not context:
+            return "I don't have relevant information to answer this question."
+
+        prompt = f"""Context:
+{context}
+
+Question: {question}
+
+Answer based on the context above:"""
+
+        response = self.client.chat.completions.create(
+            model="gpt-4",
+            messages=[
+                {
+                    "role": "system",
+                    "content": "You are a helpful assistant that answers questions based on provided context."
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            temperature=0
+        )
+
+        return response.choices[0].message.content
@@ -0,0 +1,661 @@
+"""
+AI Agent Memory Systems - Benchmark Suite
+==========================================
+
+Offline benchmarks for the store classes in the ai_memory package.
+Synthetic memories, episodes, facts, procedures and seeded random
+embeddings are generated at each requested scale, and every operation is
+timed call by call to report throughput and p50/p99 latency.
+
+Results are written as JSON so two runs can be compared:
+
+    python memory_benchmarks.py --scales 1000 10000 --output base.json
+    python memory_benchmarks.py --scales 1000 10000 --compare base.json
+
+``--threads 1 2 4 8`` adds a mixed read/write stress test of the
+thread-safe in-memory stores at each thread count.
+
+``--imports`` times ``import ai_memory``, ``import ai_rag`` and single-name
+imports from both in fresh interpreters, and reports which heavy modules
+(numpy, openai, chromadb) each one pulled in; ``--max-import-ms`` fails the
+run when any median import time exceeds the budget:
+
+    python memory_benchmarks.py --scales --imports --max-import-ms 100
+
+Author: AI Memory Research
+Date: 2026-02-23
+"""
+
+import argparse
+import json
+import platform
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from ai_memory import (
+    ConversationMemory,
+    EpisodicMemory,
+    MultiTierMemorySystem,
+    PersistentMemoryStore,
+    ProceduralMemory,
+    SemanticMemory,
+    ShardedMemoryStore,
+    SimpleMemoryStore,
+    UnifiedMemorySystem,
+    VectorMemoryStore,
+)
+
+VOCABULARY = [
+    "agent", "memory", "vector", "embedding", "retrieval", "python", "user",
+    "project", "deploy", "test", "database", "query", "index", "cache",
+    "latency", "model", "prompt", "context", "session", "tool", "error",
+    "search", "rank", "score", "fact", "episode", "procedure", "summary",
+    "token", "batch", "thread", "request", "response", "config", "schema",
+]
+EVENT_TYPES = ["user_interaction", "tool_call", "error", "observation", "general"]
+CATEGORIES = ["AI", "LLM", "python", "ops", "preferences", "projects"]
+
+
+# =============================================================================
+# SYNTHETIC WORKLOADS
+# =============================================================================
+
+@dataclass
+class Workload:
+    """Synthetic data for one scale, fully determined by the seed."""
+    texts: List[str]
+    embeddings: np.ndarray
+    queries: List[str]
+    query_embeddings: np.ndarray
+    event_types: List[str]
+    categories: List[List[str]]
+
+
+def generate_workload(scale: int, query_count: int, dim: int, seed: int) -> Workload:
+    """Generate `scale` items and `query_count` queries."""
+    rng = np.random.default_rng(seed)
+    vocabulary = np.array(VOCABULARY)
+
+    lengths = rng.integers(5, 30, size=scale)
+    texts = [
+        f"memory {i}: " + " ".join(rng.choice(vocabulary, size=length))
+        for i, length in enumerate(lengths)
+    ]
+    queries = [str(word) for word in rng.choice(vocabulary, size=query_count)]
+
+    return Workload(
+        texts=texts,
+        embeddings=rng.random((scale, dim), dtype=np.float32),
+        queries=queries,
+        query_embeddings=rng.random((query_count, dim), dtype=np.float32),
+        event_types=[EVENT_TYPES[i] for i in rng.integers(0, len(EVENT_TYPES), size=scale)],
+        categories=[
+            [CATEGORIES[i] for i in rng.choice(len(CATEGORIES), size=2, replace=False)]
+            for _ in range(scale)
+        ],
+    )
+
+
+# =============================================================================
+# MEASUREMENT
+# =============================================================================
+
+def measure(fn: Callable[[Any], Any], inputs: Iterable[Any]) -> Dict[str, float]:
+    """Call `fn` once per input and summarize the per-call latencies."""
+    latencies = []
+    for item in inputs:
+        start = time.perf_counter()
+        fn(item)
+        latencies.append(time.perf_counter() - start)
+    return summarize(latencies)
+
+
+def summarize(latencies: List[float]) -> Dict[str, float]:
+    """Throughput and p50/p99 latency of a list of per-call seconds."""
+    if not latencies:
+        return {}
+
+    latencies = np.array(latencies)
+    total = float(latencies.sum())
+    return {
+        "count": len(latencies),
+        "total_s": total,
+        "ops_per_s": len(latencies) / total if total > 0 else float("inf"),
+        "p50_ms": float(np.percentile(latencies, 50) * 1000),
+        "p99_ms": float(np.percentile(latencies, 99) * 1000),
+    }
+
+
+# =============================================================================
+# PER-STORE BENCHMARKS
+# =============================================================================
+# Each benchmark takes (workload, work_dir) and returns {operation: stats}.
+
+def bench_simple_store(workload: Workload, work_dir: Path) -> Dict[str, Dict[str, float]]:
+    store = SimpleMemoryStore()
+    ids = []
+    results = {"add": measure(
+        lambda i: ids.append(store.add(workload.texts[i], {"n": i})),
+        range(len(workload.texts))
+    )}
+    results["get"] = measure(store.get, ids[::max(1, len(ids) // len(workload.queries))])
+    results["keyword_search"] = measure(store.search, workload.queries)
+    return results
+
+
+def bench_vector_store(workload: Workload, work_dir: Path) -> Dict[str, Dict[str, float]]:
+    store = VectorMemoryStore(embedding_dim=workload.embeddings.shape[1])
+    ids = []
+    results = {"add": measure(
+        lambda i: ids.append(store.add(
+            workload.texts[i], workload.embeddings[i], memory_type=workload.event_types[i]
+        )),
+        range(len(workload.texts))
+    )}
+    results["similarity_search"] = measure(
+        lambda q: store.search(q, top_k=5, min_similarity=0.0),
+        workload.query_embeddings
+    )
+    results["filtered_search"] = measure(
+        lambda q: store.search(q, top_k=5, min_similarity=0.0, memory_type=workload.event_types[0]),
+        workload.query_embeddings
+    )
+    sample = ids[::max(1, len(ids) // len(workload.queries))]
+    results["related_scan"] = measure(
+        lambda memory_id: store.find_similar_memories(memory_id, top_k=5, min_similarity=0.0),
+        sample
+    )
+    results["graph_rebuild"] = measure(lambda _: store.rebuild_graph(k=10), range(1))
+    results["related_graph"] = measure(
+        lambda memory_id: store.find_similar_memories(memory_id, top_k=5, min_similarity=0.0),
+        sample
+    )
+
+    graph_store = VectorMemoryStore(embedding_dim=workload.embeddings.shape[1], graph_k=10)
+    results["add_with_graph"] = measure(
+        lambda i: graph_store.add(workload.texts[i], workload.embeddings[i]),
+        range(len(workload.texts))
+    )
+    return results
+
+
+def bench_persistent_store(workload: Workload, work_dir: Path) -> Dict[str, Dict[str, float]]:
+    results = _bench_memory_store(PersistentMemoryStore(str(work_dir / "persistent.db")), workload)
+
+    # Same database, read through the row cache (warmed by the first pass)
+    store = PersistentMemoryStore(str(work_dir / "persistent.db"), cache_size=len(workload.queries))
+    ids = [memory["id"] for memory in store.get_recent(limit=len(workload.queries))]
+    for memory_id in ids:
+        store.get(memory_id)
+    results["cached_get"] = measure(store.get, ids)
+    return results
+
+
+def bench_sharded_store(workload: Workload, work_dir: Path) -> Dict[str, Dict[str, float]]:
+    store = ShardedMemoryStore(str(work_dir / "sharded"), num_shards=4)
+    try:
+        return _bench_memory_store(store, workload)
+    finally:
+        store.close()
+
+
+def _bench_memory_store(store: Any, workload: Workload) -> Dict[str, Dict[str, float]]:
+    ids = []
+    results = {"add": measure(
+        lambda i: ids.append(store.add(
+            workload.texts[i],
+            memory_type=workload.event_types[i],
+            embedding=workload.embeddings[i],
+            importance=float(i % 10) / 10
+        )),
+        range(len(workload.texts))
+    )}
+    results["get"] = measure(store.get, ids[::max(1, len(ids) // len(workload.queries))])
+    results["keyword_search"] = measure(store.search, workload.queries)
+    results["similarity_search"] = measure(
+        lambda q: store.search_similar(q, top_k=5),
+        workload.query_embeddings
+    )
+    results["filtered_search"] = measure(
+        lambda q: store.search_similar(q, top_k=5, memory_type=workload.event_types[0]),
+        workload.query_embeddings
+    )
+    results["scored_search"] = measure(
+        lambda q: store.search_scored(q, top_k=5, weights={"relevance": 1.0, "recency": 0.5, "importance": 0.5}),
+        workload.query_embeddings
+    )
+    results["stats"] = measure(lambda _: store.get_stats(), range(len(workload.queries)))
+    return results
+
+
+def bench_multi_tier(workload: Workload, work_dir: Path) -> Dict[str, Dict[str, float]]:
+    system = MultiTierMemorySystem(str(work_dir / "multi_tier.db"))
+    results = {"add": measure(
+        lambda i: system.add_to_working(workload.texts[i], embedding=workload.embeddings[i]),
+        range(len(workload.texts))
+    )}
+    results["keyword_search"] = measure(system.retrieve, workload.queries)
+    results["similarity_search"] = measure(
+        lambda i: system.retrieve(workload.queries[i], workload.query_embeddings[i]),
+        range(len(workload.queries))
+    )
+
+    def consolidate(i: int):
+        system.consolidate_all()
+
+    def refill(i: int):
+        # Filling exactly max_working items does not trigger consolidation
+        for j in range(system.max_working):
+            k = (i * system.max_working + j) % len(workload.texts)
+            system.add_to_working(workload.texts[k], embedding=workload.embeddings[k])
+        return i
+
+    # Only consolidate_all is timed; refilling the working tier is not
+    system.consolidate_all()
+    results["consolidation"] = measure(consolidate, (refill(i) for i in range(len(workload.queries))))
+    return results
+
+
+def bench_episodic(workload: Workload, work_dir: Path) -> Dict[str, Dict[str, float]]:
+    store = EpisodicMemory(str(work_dir / "episodic.db"))
+    results = {"add": measure(
+        lambda i: store.record_episode(
+            workload.event_types[i], ["user"], workload.texts[i],
+            embedding=workload.embeddings[i]
+        ),
+        range(len(workload.texts))
+    )}
+    results["keyword_search"] = measure(store.search_episodes, workload.queries)
+    results["similarity_search"] = measure(
+        lambda q: store.search_episodes("", q, limit=5),
+        workload.query_embeddings
+    )
+    results["get_by_type"] = measure(store.get_episodes_by_type, workload.event_types[:len(workload.queries)])
+    return results
+
+
+def bench_semantic(workload: Workload, work_dir: Path) -> Dict[str, Dict[str, float]]:
+    store = SemanticMemory(str(work_dir / "semantic.db"))
+    results = {"add": measure(
+        lambda i: store.learn_fact(workload.texts[i], workload.categories[i], 0.5 + (i % 5) / 10),
+        range(len(workload.texts))
+    )}
+    results["keyword_search"] = measure(store.search_facts, workload.queries)
+    results["get_by_category"] = measure(
+        store.get_facts_by_category,
+        [CATEGORIES[i % len(CATEGORIES)] for i in range(len(workload.queries))]
+    )
+    return results
+
+
+def bench_procedural(workload: Workload, work_dir: Path) -> Dict[str, Dict[str, float]]:
+    store = ProceduralMemory(str(work_dir / "procedural.db"))
+    names = [f"procedure_{i}" for i in range(len(workload.texts))]
+    results = {"add": measure(
+        lambda i: store.learn_procedure(
+            names[i], workload.texts[i], workload.texts[i].split()[:5],
+            embedding=workload.embeddings[i]
+        ),
+        range(len(workload.texts))
+    )}
+    results["execute"] = measure(
+        lambda i: store.execute_procedure(names[i], i % 4 != 0),
+        range(0, len(names), max(1, len(names) // len(workload.queries)))
+    )
+    results["get"] = measure(store.get_procedure_by_name, names[:len(workload.queries)])
+    results["ranked_top_n"] = measure(
+        lambda _: store.get_best_procedures(min_success_rate=0.0),
+        range(len(workload.queries))
+    )
+    results["keyword_search"] = measure(store.find_procedures, workload.queries)
+    results["similarity_search"] = measure(
+        lambda i: store.find_procedures(workload.queries[i], task_embedding=workload.query_embeddings[i]),
+        range(len(workload.queries))
+    )
+    return results
+
+
+def bench_unified(workload: Workload, work_dir: Path) -> Dict[str, Dict[str, float]]:
+    system = UnifiedMemorySystem(str(work_dir / "unified"))
+
+    def add(i: int):
+        # Spread the items over the four stores
+        kind = i % 4
+        if kind == 0:
+            system.remember_episode(workload.event_types[i], workload.texts[i], ["user"],
+                                    embedding=workload.embeddings[i])
+        elif kind == 1:
+            system.learn_fact(workload.texts[i], workload.categories[i])
+        elif kind == 2:
+            system.learn_procedure(f"procedure_{i}", workload.texts[i], workload.texts[i].split()[:5])
+        else:
+            system.vector_store.add(workload.texts[i], embedding=workload.embeddings[i])
+
+    results = {"add": measure(add, range(len(workload.texts)))}
+    results["recall"] = measure(
+        lambda i: system.recall(workload.queries[i], workload.query_embeddings[i]),
+        range(len(workload.queries))
+    )
+    results["summary"] = measure(lambda _: system.get_memory_summary(), range(len(workload.queries)))
+    system.close()
+    return results
+
+
+BENCHMARKS: Dict[str, Callable[[Workload, Path], Dict[str, Dict[str, float]]]] = {
+    "SimpleMemoryStore": bench_simple_store,
+    "VectorMemoryStore": bench_vector_store,
+    "PersistentMemoryStore": bench_persistent_store,
+    "ShardedMemoryStore": bench_sharded_store,
+    "MultiTierMemorySystem": bench_multi_tier,
+    "EpisodicMemory": bench_episodic,
+    "SemanticMemory": bench_semantic,
+    "ProceduralMemory": bench_procedural,
+    "UnifiedMemorySystem": bench_unified,
+}
+
+
+# =============================================================================
+# CONCURRENCY STRESS
+# =============================================================================
+# Each factory builds a populated thread_safe store and returns
+# (read, write) callables taking (workload, i).
+
+def concurrent_simple_store(workload: Workload, work_dir: Path):
+    store = SimpleMemoryStore(thread_safe=True)
+    for text in workload.texts:
+        store.add(text)
+    return (lambda w, i: store.search(w.queries[i % len(w.queries)]),
+            lambda w, i: store.add(w.texts[i % len(w.texts)]))
+
+
+def concurrent_vector_store(workload: Workload, work_dir: Path):
+    store = VectorMemoryStore(embedding_dim=workload.embeddings.shape[1], thread_safe=True)
+    for text, embedding in zip(workload.texts, workload.embeddings):
+        store.add(text, embedding)
+    return (lambda w, i: store.search(w.query_embeddings[i % len(w.queries)], min_similarity=0.0),
+            lambda w, i: store.add(w.texts[i % len(w.texts)], w.embeddings[i % len(w.texts)]))
+
+
+def concurrent_conversation(workload: Workload, work_dir: Path):
+    conversation = ConversationMemory(thread_safe=True)
+    return (lambda w, i: conversation.get_context(),
+            lambda w, i: conversation.add_user_message(w.texts[i % len(w.texts)]))
+
+
+def concurrent_multi_tier(workload: Workload, work_dir: Path):
+    system = MultiTierMemorySystem(str(work_dir / "concurrent_multi_tier.db"), thread_safe=True)
+    for text in workload.texts[:system.max_working]:
+        system.add_to_working(text)
+    # Keyword retrieval only: it also hits the long-term SQLite store
+    return (lambda w, i: system.retrieve(w.queries[i % len(w.queries)]),
+            lambda w, i: system.add_to_working(w.texts[i % len(w.texts)]))
+
+
+CONCURRENCY_BENCHMARKS = {
+    "SimpleMemoryStore": concurrent_simple_store,
+    "VectorMemoryStore": concurrent_vector_store,
+    "ConversationMemory": concurrent_conversation,
+    "MultiTierMemorySystem": concurrent_multi_tier,
+}
+
+
+def run_concurrent(
+    read: Callable[[Workload, int], Any],
+    write: Callable[[Workload, int], Any],
+    workload: Workload,
+    threads: int,
+    ops_per_thread: int,
+    write_ratio: float = 0.1
+) -> Dict[str, float]:
+    """Run a mixed read/write workload on `threads` threads; throughput is wall-clock."""
+    def worker(thread_index: int) -> List[float]:
+        rng = np.random.default_rng(thread_index)
+        writes = rng.random(ops_per_thread) < write_ratio
+        latencies = []
+        for op in range(ops_per_thread):
+            i = thread_index * ops_per_thread + op
+            start = time.perf_counter()
+            (write if writes[op] else read)(workload, i)
+            latencies.append(time.perf_counter() - start)
+        return latencies
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        latencies = np.concatenate(list(pool.map(worker, range(threads))))
+    wall = time.perf_counter() - start
+
+    return {
+        "count": len(latencies),
+        "threads": threads,
+        "total_s": wall,
+        "ops_per_s": len(latencies) / wall,
+        "p50_ms": float(np.percentile(latencies, 50) * 1000),
+        "p99_ms": float(np.percentile(latencies, 99) * 1000),
+    }
+
+
+# =============================================================================
+# IMPORT TIME
+# =============================================================================
+# Operation name -> import statement, each timed in a fresh interpreter.
+
+IMPORT_BENCHMARKS = {
+    "import ai_memory": "import ai_memory",
+    "SimpleMemoryStore": "from ai_memory import SimpleMemoryStore",
+    "PersistentMemoryStore": "from ai_memory import PersistentMemoryStore",
+    "UnifiedMemorySystem": "from ai_memory import UnifiedMemorySystem",
+    "import ai_rag": "import ai_rag",
+    "SQLiteRAG": "from ai_rag import SQLiteRAG",
+    "SimpleChromaRAG": "from ai_rag import SimpleChromaRAG",
+}
+HEAVY_MODULES = ["numpy", "openai", "chromadb"]
+
+_IMPORT_PROBE = """
+import sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+import json
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def bench_imports(runs: int = 10) -> List[Dict[str, Any]]:
+    """
+    Time every IMPORT_BENCHMARKS statement `runs` times, each in a new
+    interpreter so nothing is already in sys.modules. Interpreter startup
+    is not included. Rows use store "import" and scale 0.
+    """
+    results = []
+    for operation, statement in IMPORT_BENCHMARKS.items():
+        print(f"  {operation} ...", file=sys.stderr, flush=True)
+        probe = _IMPORT_PROBE.format(statement=statement, heavy=HEAVY_MODULES)
+        samples = []
+        for _ in range(runs):
+            out = subprocess.run(
+                [sys.executable, "-c", probe],
+                cwd=Path(__file__).resolve().parent,
+                capture_output=True, text=True, check=True
+            )
+            samples.append(json.loads(out.stdout))
+
+        results.append({
+            "store": "import",
+            "operation": operation,
+            "scale": 0,
+            **summarize([sample["seconds"] for sample in samples]),
+            "loaded": samples[-1]["loaded"],
+        })
+    return results
+
+
+# =============================================================================
+# RUNNING AND COMPARING
+# =============================================================================
+
+def run_benchmarks(
+    scales: List[int],
+    stores: Optional[List[str]] = None,
+    query_count: int = 100,
+    dim: int = 128,
+    seed: int = 42,
+    thread_counts: Optional[List[int]] = None,
+    import_runs: int = 0
+) -> Dict[str, Any]:
+    """
+    Run the selected benchmarks at every scale and return JSON-ready results.
+    With `thread_counts`, also run the concurrency stress test
+    (operation ``concurrent_<n>t``) for the stores that support it.
+    With `import_runs`, also time the package imports (see bench_imports).
+    """
+    results = bench_imports(import_runs) if import_runs else []
+
+    for scale in scales:
+        workload = generate_workload(scale, query_count, dim, seed)
+
+        for store_name in [name for name in stores or BENCHMARKS if name in BENCHMARKS]:
+            with tempfile.TemporaryDirectory() as tmp:
+                print(f"  {store_name} @ {scale} ...", file=sys.stderr, flush=True)
+                operations = BENCHMARKS[store_name](workload, Path(tmp))
+
+            for operation, stats in operations.items():
+                results.append({"store": store_name, "operation": operation, "scale": scale, **stats})
+
+        for store_name in CONCURRENCY_BENCHMARKS if thread_counts else ():
+            if stores and store_name not in stores:
+                continue
+            for threads in thread_counts:
+                with tempfile.TemporaryDirectory() as tmp:
+                    print(f"  {store_name} @ {scale}, {threads} threads ...", file=sys.stderr, flush=True)
+                    read, write = CONCURRENCY_BENCHMARKS[store_name](workload, Path(tmp))
+                    stats = run_concurrent(read, write, workload, threads, query_count)
+                results.append({
+                    "store": store_name,
+                    "operation": f"concurrent_{threads}t",
+                    "scale": scale,
+                    **stats
+                })
+
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "seed": seed,
+            "dim": dim,
+            "query_count": query_count,
+            "thread_counts": thread_counts,
+            "import_runs": import_runs,
+        },
+        "results": results,
+    }
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Pair up matching (store, operation, scale) rows of two runs.
+    A speedup above 1.0 means the current run is faster.
+    """
+    base_rows = {(r["store"], r["operation"], r["scale"]): r for r in baseline["results"]}
+    comparison = []
+
+    for row in current["results"]:
+        base = base_rows.get((row["store"], row["operation"], row["scale"]))
+        if base is None:
+            continue
+        comparison.append({
+            "store": row["store"],
+            "operation": row["operation"],
+            "scale": row["scale"],
+            "speedup": row["ops_per_s"] / base["ops_per_s"] if base["ops_per_s"] else float("inf"),
+            "p99_ratio": row["p99_ms"] / base["p99_ms"] if base["p99_ms"] else float("inf"),
+        })
+
+    return comparison
+
+
+def print_results(run: Dict[str, Any], comparison: Optional[List[Dict[str, Any]]] = None):
+    """Print a human-readable table to stderr."""
+    speedups = {(c["store"], c["operation"], c["scale"]): c["speedup"] for c in comparison or []}
+
+    header = f"{'store':<24}{'operation':<22}{'scale':>9}{'ops/s':>12}{'p50 ms':>10}{'p99 ms':>10}"
+    if comparison is not None:
+        header += f"{'speedup':>10}"
+    print(header, file=sys.stderr)
+
+    for r in run["results"]:
+        line = (f"{r['store']:<24}{r['operation']:<22}{r['scale']:>9}"
+                f"{r['ops_per_s']:>12.1f}{r['p50_ms']:>10.3f}{r['p99_ms']:>10.3f}")
+        if comparison is not None:
+            speedup = speedups.get((r["store"], r["operation"], r["scale"]))
+            line += f"{speedup:>9.2f}x" if speedup is not None else f"{'-':>10}"
+        print(line, file=sys.stderr)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Benchmark the AI agent memory stores.")
+    parser.add_argument("--scales", type=int, nargs="*", default=[1000, 10000],
+                        help="number of synthetic items per store (e.g. 1000 10000 100000 1000000); "
+                             "give no values to skip the store benchmarks")
+    parser.add_argument("--stores", nargs="+", choices=sorted({*BENCHMARKS, *CONCURRENCY_BENCHMARKS}),
+                        help="only run these benchmarks (default: all)")
+    parser.add_argument("--queries", type=int, default=100,
+                        help="number of timed reads per read operation")
+    parser.add_argument("--dim", type=int, default=128, help="embedding dimension")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--threads", type=int, nargs="+",
+                        help="also run the concurrency stress test at these thread counts "
+                             "(--queries operations per thread)")
+    parser.add_argument("--imports", type=int, nargs="?", const=10, default=0, metavar="RUNS",
+                        help="also time the package imports, RUNS fresh interpreters each (default 10)")
+    parser.add_argument("--max-import-ms", type=float,
+                        help="exit with status 1 if any median import time exceeds this many ms "
+                             "(runs the import benchmark, --imports 10 unless given)")
+    parser.add_argument("--output", help="write results JSON to this file (default: stdout)")
+    parser.add_argument("--compare", help="baseline results JSON to compare against")
+    args = parser.parse_args(argv)
+    if args.max_import_ms is not None and not args.imports:
+        # A budget with nothing measured against it would always pass
+        args.imports = 10
+
+    run = run_benchmarks(args.scales, args.stores, args.queries, args.dim, args.seed, args.threads,
+                         args.imports)
+
+    comparison = None
+    if args.compare:
+        with open(args.compare) as f:
+            comparison = compare_results(json.load(f), run)
+        run["comparison"] = comparison
+
+    print_results(run, comparison)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(run, f, indent=2)
+    else:
+        print(json.dumps(run, indent=2))
+
+    if args.max_import_ms is not None:
+        slow = [r for r in run["results"] if r["store"] == "import" and r["p50_ms"] > args.max_import_ms]
+        for r in slow:
+            print(f"import budget exceeded: {r['operation']} took {r['p50_ms']:.1f} ms "
+                  f"(limit {args.max_import_ms:g} ms, loaded {r['loaded'] or 'nothing heavy'})",
+                  file=sys.stderr)
+        if slow:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()